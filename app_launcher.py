@@ -1,279 +1,276 @@
 #!/usr/bin/python3
 
 import gi
-import subprocess
-import os
-import configparser
 from gi.repository import Gtk, Gdk, GLib
 
 from command_loader import CommandLoader
 from application_manager import ApplicationManager
+from application_watcher import ApplicationWatcher
 from window_manager import WindowManager
+from result_list import ResultItem
+from status_sampler import StatusSampler
+from system_metrics import SystemMetrics
+from updates_service import UpdatesService, get_backend
+from connectivity_service import ConnectivityService
+from startup_profiler import profiler
+from icon_service import IconService
+from tracing import tracer
+from providers import ConnectivityProvider, HelpProvider, ThemeProvider
+from query_engine import QueryEngine
+from theme_manager import ThemeManager
 
 gi.require_version('Gtk', '4.0')
 
-def load_default_theme(self):
-    """
-    Carga y aplica el tema predeterminado desde el archivo de configuración.
-    """
-    config = configparser.ConfigParser()
-    if config.read('themes/config.ini'):
-        theme_name = config.get('Settings', 'theme', fallback=None)
-        if theme_name:
-            self.apply_theme(theme_name)
+# Filas de resultados cuyos iconos se precargan tras el primer fotograma
+FIRST_SCREEN_ROWS = 20
 
 class AppLauncher(Gtk.Window):
     """
-    Maneja la lógica principal de la aplicación.
+    Ventana del lanzador: una vista sobre el QueryEngine.
+
+    La búsqueda, los proveedores y el lanzamiento viven en el motor, que no
+    depende de GTK; la ventana le pasa el texto escrito, pinta los lotes de
+    resultados y añade lo que sólo tiene sentido con interfaz (barra de
+    estado, temas y ayuda).
 
     Métodos:
         __init__: Inicializa la aplicación y sus componentes.
-        load_applications: Carga las aplicaciones en el ListBox.
-        load_system_commands: Carga los comandos del sistema en el ListBox.
-        load_connectivity_commands: Carga los comandos de conectividad en el ListBox.
-        update_bluetooth_status: Actualiza el estado de la conexión Bluetooth.
-        update_wifi_status: Actualiza el estado de la conexión WiFi.
-        update_audio_status: Actualiza el estado de la salida de audio.
+        register_view_providers: Registra los proveedores que necesitan la ventana.
+        show_results: Muestra un lote de resultados en el modelo.
+        on_connectivity_changed: Refresca las filas de conectividad cuando cambia el estado cacheado.
         get_pending_updates: Obtiene el número de paquetes pendientes de actualización.
         update_battery_status: Actualiza el estado de la batería.
         update_cpu_load: Actualiza la carga de la CPU.
         update_memory_status: Actualiza el estado de la memoria.
-        update_status_labels: Actualiza las etiquetas de estado (batería, CPU y memoria).
-        on_filter_text_changed: Filtra las aplicaciones o comandos basados en el texto de entrada.
+        update_status_labels: Aplica una instantánea de estado a las etiquetas (batería, CPU, memoria y actualizaciones).
+        on_filter_text_changed: Lanza la consulta del texto de entrada en el proveedor correspondiente.
         on_filter_entry_key_press: Maneja el evento de pulsación de teclas en el campo de filtro.
         on_row_activated: Ejecuta la aplicación o comando seleccionado.
         on_key_press: Maneja el evento de pulsación de teclas en la ventana.
+        on_realize: Espera al primer fotograma pintado de la ventana.
+        on_first_frame: Registra el primer fotograma y programa la inicialización diferida.
+        start_deferred_services: Inicia los subsistemas no necesarios para el primer fotograma.
         on_is_active_notify: Maneja el evento de cambio de estado de la ventana.
-        launch_application: Lanza una aplicación.
-        apply_css: Aplica el estilo CSS a la ventana.
+        on_status_visibility_changed: Pausa o reanuda el muestreo de la barra de estado.
+        dismiss: Oculta la ventana en modo residente o la cierra en otro caso.
+        show_launcher: Muestra la ventana con el filtro vacío y el foco en el campo de texto.
+        on_applications_changed: Aplica los cambios de archivos .desktop y refresca la lista.
     """
 
-    def __init__(self):
+    def __init__(self, daemon=False, watch_theme=False):
         """
         Inicializa la aplicación y sus componentes.
+
+        Args:
+            daemon (bool): Si es True, la ventana se oculta en lugar de cerrarse para volver a mostrarla al instante.
+            watch_theme (bool): Si es True, el tema activo se recarga al guardar su archivo.
         """
         super().__init__(title="App Launcher")
+        self.daemon = daemon
+        self.set_hide_on_close(daemon)
 
-        self.command_loader = CommandLoader()
-        self.application_manager = ApplicationManager(self)
+        with profiler.phase("config"):
+            self.command_loader = CommandLoader()
+        with profiler.phase("catalog"):
+            self.application_manager = ApplicationManager()
         self.window_manager = WindowManager(self)
 
+        with profiler.phase("services"):
+            # Las sondas de la barra de estado leen /proc y /sys directamente y se ejecutan fuera del bucle principal
+            self.system_metrics = SystemMetrics()
+            self.updates_service = UpdatesService(get_backend(self.command_loader.updates_backend), ttl=self.command_loader.updates_ttl)
+            self.status_sampler = StatusSampler({
+                'battery': self.update_battery_status,
+                'cpu': self.update_cpu_load,
+                'memory': self.update_memory_status,
+                'updates': lambda: str(self.get_pending_updates()),
+            }, self.update_status_labels, GLib.idle_add)
+            # El recuento se refresca en segundo plano al caducar: mostrar el nuevo en cuanto llega
+            self.updates_service.add_listener(lambda count: self.status_sampler.request_sample('updates'))
+            self.connect("destroy", lambda window: self.status_sampler.stop())
+            # Sin muestreo mientras la ventana está oculta o sin foco
+            self.connect("notify::visible", self.on_status_visibility_changed)
+            self.connect("notify::is-active", self.on_status_visibility_changed)
+
+            # Estado de Bluetooth, WiFi y audio mantenido por eventos D-Bus en lugar de consultarlo en cada pulsación
+            self.connectivity_service = ConnectivityService()
+            self.connectivity_service.add_listener(self.on_connectivity_changed)
+            self.connect("destroy", lambda window: self.connectivity_service.stop())
+
+            # Aplicaciones, comandos, temas y ayuda se atienden por prefijo
+            self.engine = QueryEngine(GLib.idle_add, self.command_loader, self.application_manager,
+                                      self.connectivity_service, self.updates_service)
+            # Un proveedor de estilo por capa; elegir tema sustituye su contenido
+            self.theme_manager = ThemeManager(watch=watch_theme)
+            self.register_view_providers()
+            self.connect("destroy", lambda window: self.engine.shutdown())
+
         # Crear la ventana principal
-        self.window_manager.create_main_window()
+        with profiler.phase("widgets"):
+            self.icon_service = IconService()
+            self.window_manager.create_main_window()
+        with profiler.phase("css"):
+            self.theme_manager.apply_saved()
+
+        # Lo que no hace falta para escribir se inicia tras el primer fotograma
+        self.application_watcher = None
+        self.deferred_started = False
+        self.first_frame_handler = 0
+        if daemon:
+            # La ventana residente no se pinta hasta que se muestra
+            GLib.idle_add(self.start_deferred_services)
+        else:
+            self.connect("realize", self.on_realize)
+        if tracer.enabled:
+            # Cada pulsación se cierra con el siguiente fotograma pintado
+            self.connect("realize", lambda widget: widget.get_frame_clock().connect("after-paint", tracer.frame_painted))
 
-    def on_is_active_notify(self, widget, param_spec):
+    def on_realize(self, widget):
         """
-        Maneja el evento de cambio de estado de la ventana.
+        Espera al primer fotograma pintado de la ventana.
         """
-        if not self.is_active:
-            self.close()
+        frame_clock = self.get_frame_clock()
+        self.first_frame_handler = frame_clock.connect("after-paint", self.on_first_frame)
 
-    def load_icon(self, icon_name, size):
+    def on_first_frame(self, frame_clock):
         """
-        Carga un icono desde el tema con un tamaño especificado.
+        Registra el primer fotograma y programa la inicialización diferida.
 
         Args:
-            icon_name (str): Nombre del icono.
-            size (int): Tamaño del icono en píxeles.
-
-        Returns:
-            Gtk.IconPaintable: El icono cargado.
+            frame_clock (Gdk.FrameClock): Reloj de fotogramas de la ventana.
         """
-        theme = Gtk.IconTheme.get_for_display(Gdk.Display.get_default())
-        icon_info = theme.lookup_icon(icon_name, size, 0)
-        if icon_info is not None:
-            return icon_info.load_icon()
-        return None
+        frame_clock.disconnect(self.first_frame_handler)
+        self.first_frame_handler = 0
+        profiler.mark("first_frame")
+        GLib.idle_add(self.start_deferred_services)
 
-    def load_applications(self, applications):
+    def start_deferred_services(self):
         """
-        Carga las aplicaciones en el ListBox.
-
-        Args:
-            applications (list): Lista de aplicaciones a cargar.
+        Inicia los subsistemas que no son necesarios para el primer fotograma:
+        barra de estado, estado de conectividad, vigilancia de directorios y
+        ventana de ayuda.
         """
-        # Limpiar el ListBox
-        while (child := self.listbox.get_first_child()) is not None:
-            self.listbox.remove(child)
+        if self.deferred_started:
+            return False
+        self.deferred_started = True
 
-        for app_name, app_command, icon_name in applications:
-            row = Gtk.ListBoxRow()
-            hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-            row.set_child(hbox)
+        with profiler.phase("deferred"):
+            self.window_manager.create_status_bar()
+            self.on_status_visibility_changed(self, None)
+            self.status_sampler.start()
+            self.connectivity_service.start()
 
-            # Añadir el icono con tamaño fijo
-            if icon_name:
-                icon = Gtk.Image.new_from_icon_name(icon_name)
-                icon.set_pixel_size(32)  # Tamaño fijo del icono
-            else:
-                icon = Gtk.Image.new_from_icon_name("application-x-executable")
-                icon.set_pixel_size(32)  # Tamaño fijo del icono
-            hbox.append(icon)
+            # Vigilar los directorios de aplicaciones para mantener el índice al día
+            self.application_watcher = ApplicationWatcher(self.application_manager.watched_directories(), self.on_applications_changed)
 
-            # Añadir el nombre de la aplicación con una separación de 10px
-            label = Gtk.Label(label=app_name)
-            label.set_xalign(0.0)
-            hbox.append(label)
+            self.window_manager.build_help_window()
 
-            # Añadir el comando de la aplicación como atributo
-            row.app_command = app_command
+            # Iconos de la primera pantalla de la lista completa, la que se ve al abrir el lanzador
+            catalog = self.application_manager.catalog
+            self.icon_service.prewarm([catalog.icons[index] for index in catalog.order[:FIRST_SCREEN_ROWS]])
 
-            self.listbox.append(row)
+        profiler.dump()
+        return False
 
-        self.listbox.show()
-
-    def load_system_commands(self):
+    def on_is_active_notify(self, widget, param_spec):
         """
-        Carga los comandos del sistema en el ListBox.
+        Maneja el evento de cambio de estado de la ventana.
         """
-        system_commands = self.command_loader.get_system_commands()
-        self.load_applications([(cmd[0], lambda cmd=cmd[1]: self.launch_application(cmd), cmd[2]) for cmd in system_commands])
+        help_window = self.window_manager.help_window
+        if help_window is not None and help_window.get_visible():
+            # El foco ha pasado a la ventana de ayuda
+            return
+        if not self.is_active() and self.get_visible():
+            self.dismiss()
 
-    def load_connectivity_commands(self):
+    def on_status_visibility_changed(self, widget, param_spec):
         """
-        Carga los comandos de conectividad en el ListBox y actualiza el estado del Bluetooth, WiFi y Audio.
+        Pausa el muestreo de la barra de estado mientras la ventana está oculta
+        o sin foco, y lo reanuda (con un refresco inmediato) al mostrarla.
         """
-        connectivity_commands = self.command_loader.get_connectivity_commands()
-        
-        # Verificar actualizaciones pendientes
-        pending_updates = self.get_pending_updates()
-        if pending_updates > 0:
-            # Modificar el comando de actualización para mostrar el número de paquetes pendientes
-            update_command = ("Actualizar ({} paquetes)".format(pending_updates), self.launch_application(self.command_loader.update_command), "system-software-update")
-            connectivity_commands.append(update_command)
+        if self.get_visible() and self.is_active():
+            self.status_sampler.resume()
         else:
-            # Filtrar el comando de actualización si no hay paquetes pendientes
-            connectivity_commands = [cmd for cmd in connectivity_commands if "Actualizar" not in cmd[0]]
-        
-        self.load_applications([(cmd[0], lambda cmd=cmd[1]: self.launch_application(cmd), cmd[2]) for cmd in connectivity_commands])
-        self.update_bluetooth_status()
-        self.update_wifi_status()
-        self.update_audio_status()
+            self.status_sampler.pause()
 
-    def get_pending_updates(self):
+    def dismiss(self):
         """
-        Obtiene el número de paquetes pendientes de actualización.
-
-        Returns:
-            int: Número de paquetes pendientes de actualización.
+        Oculta la ventana en modo residente o la cierra en otro caso.
         """
-        try:
-            result = subprocess.run(['pacman', '-Qu', '|', 'wc', '-l'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if result.returncode == 0:
-                output = result.stdout.strip().split('\n')
-                # Restamos la primera línea que es un encabezado
-                pending_updates = len(output)
-                return pending_updates
-            return 0
-        except Exception as e:
-            print(f"Error obteniendo las actualizaciones pendientes: {e}")
-            return 0
+        if self.daemon:
+            self.set_visible(False)
+        else:
+            self.close()
 
-    def update_bluetooth_status(self):
+    def show_launcher(self):
         """
-        Actualiza el estado de la conexión Bluetooth en el ListBox.
+        Muestra la ventana con el filtro vacío y el foco en el campo de texto.
         """
-        for row in self.listbox:
-            hbox = row.get_child()
-            label = hbox.get_first_child().get_next_sibling()
-            if isinstance(label, Gtk.Label) and "Bluetooth" in label.get_text():
-                bluetooth_status = self.get_bluetooth_status()
-                label.set_text(f"Bluetooth ({bluetooth_status})")
-                break
+        self.filter_entry.set_text("")
+        self.present()
+        self.filter_entry.grab_focus()
 
-    def update_wifi_status(self):
+    def load_icon(self, icon_name, size):
         """
-        Actualiza el estado de la conexión WiFi en el ListBox.
+        Carga un icono desde el tema o desde disco con un tamaño especificado.
+
+        Args:
+            icon_name (str): Nombre del icono o ruta absoluta a una imagen.
+            size (int): Tamaño del icono en píxeles.
+
+        Returns:
+            Gdk.Paintable: El icono cargado, o None si se está decodificando en segundo plano.
         """
-        for row in self.listbox:
-            hbox = row.get_child()
-            label = hbox.get_first_child().get_next_sibling()
-            if isinstance(label, Gtk.Label) and "Wifi" in label.get_text():
-                wifi_status = self.get_wifi_status()
-                label.set_text(f"Wifi ({wifi_status})")
-                break
+        return self.icon_service.lookup(icon_name, size)
 
-    def update_audio_status(self):
+    def register_view_providers(self):
         """
-        Actualiza el estado de la salida de audio en el ListBox.
+        Registra en el motor los proveedores que necesitan la ventana: temas y ayuda.
         """
-        for row in self.listbox:
-            hbox = row.get_child()
-            label = hbox.get_first_child().get_next_sibling()
-            if isinstance(label, Gtk.Label) and "Audio" in label.get_text():
-                audio_status = self.get_audio_status()
-                label.set_text(f"Audio ({audio_status})")
-                break
+        self.engine.registry.register(ThemeProvider(self.theme_manager.list_themes, self.theme_manager.select))
+        self.engine.registry.register(HelpProvider(self.window_manager.show_help_window))
 
-    def get_bluetooth_status(self):
+    def show_results(self, results, replace):
         """
-        Obtiene el estado actual de la conexión Bluetooth y el nombre del dispositivo conectado.
+        Muestra un lote de resultados en el modelo.
 
-        Returns:
-            str: Nombre del dispositivo Bluetooth conectado o 'Desconectado'.
-        """
-        try:
-            result = subprocess.run(['bluetoothctl', 'info'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if "Connected: yes" in result.stdout:
-                lines = result.stdout.split('\n')
-                for line in lines:
-                    if line.strip().startswith("Name:"):
-                        return line.strip().split("Name:")[1].strip()
-            return "Desconectado"
-        except Exception as e:
-            print(f"Error obteniendo el estado de Bluetooth: {e}")
-            return "Desconocido"
+        Cada lote se aplica con una sola operación splice; el ListView sólo
+        reconstruye el enlace de las filas visibles.
 
-    def get_wifi_status(self):
+        Args:
+            results (list): Objetos Result del proveedor.
+            replace (bool): Si es True, el lote sustituye al contenido actual; si no, se añade al final.
+        """
+        with tracer.span("show_results"):
+            items = [ResultItem(result) for result in results]
+            n_items = self.result_store.get_n_items()
+            if replace:
+                self.result_store.splice(0, n_items, items)
+            else:
+                self.result_store.splice(n_items, 0, items)
+        tracer.count("rows_built", len(items))
+
+    def get_pending_updates(self):
         """
-        Obtiene el estado actual de la conexión WiFi y el nombre de la red conectada.
+        Obtiene el número de paquetes pendientes de actualización.
+
+        No bloquea: devuelve el último recuento conocido y, si ha caducado,
+        el UpdatesService lo refresca en segundo plano.
 
         Returns:
-            str: Nombre de la red WiFi conectada o 'Desconectado'.
+            int: Número de paquetes pendientes de actualización.
         """
-        try:
-            result = subprocess.run(['nmcli', '-t', '-f', 'active,ssid', 'dev', 'wifi'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if line.startswith("sí:"):
-                    return line.split(":")[1]
-            return "Desconectado"
-        except Exception as e:
-            print(f"Error obteniendo el estado de WiFi: {e}")
-            return "Desconocido"
+        return self.updates_service.get_count()
 
-    def get_audio_status(self):
+    def on_connectivity_changed(self, state):
         """
-        Obtiene el estado actual de la salida de audio.
+        Refresca las filas de conectividad cuando cambia el estado cacheado.
 
-        Returns:
-            str: Nombre de la salida de audio activa o 'Desconocido'.
+        Args:
+            state (ConnectivityState): Nuevo estado de conectividad.
         """
-        try:
-            # Obtener el nombre del sink por defecto
-            default_sink = subprocess.check_output(['pactl', 'get-default-sink'], text=True).strip()
-
-            # Listar todos los sinks y filtrar por el nombre del sink por defecto
-            sinks_output = subprocess.check_output(['pactl', 'list', 'sinks'], text=True)
-            
-            # Dividir la salida en bloques por cada sink
-            sinks = sinks_output.split('\n\n')
-            
-            # Buscar el bloque correspondiente al sink por defecto
-            for sink in sinks:
-                if default_sink in sink:
-                    # Buscar la línea de descripción en el bloque correspondiente
-                    for line in sink.split('\n'):
-                        if 'Description:' in line:
-                            description = line.split('Description:')[1].strip()
-                            return description
-            
-            return "Descripción no encontrada"
-        
-        except subprocess.CalledProcessError as e:
-            return f"Error al ejecutar el comando: {e}"
-        except Exception as e:
-            return f"Error: {e}"
+        if isinstance(self.engine.registry.active, ConnectivityProvider):
+            self.engine.registry.refresh()
 
     def update_battery_status(self):
         """
@@ -283,13 +280,9 @@ class AppLauncher(Gtk.Window):
             str: Porcentaje de batería.
         """
         try:
-            result = subprocess.run(['acpi', '-b'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                if "Battery" in output:
-                    # Extraer el porcentaje de batería
-                    percentage = output.split(", ")[1].split("%")[0] + "%"
-                    return percentage
+            battery = self.system_metrics.battery_status()
+            if battery is not None:
+                return f"{battery.capacity:.0f}%"
             return "N/D"
         except Exception as e:
             print(f"Error obteniendo el estado de la batería: {e}")
@@ -297,19 +290,14 @@ class AppLauncher(Gtk.Window):
 
     def update_cpu_load(self):
         """
-        Obtiene la carga actual de la CPU.
+        Obtiene la carga de la CPU en el último intervalo de muestreo.
 
         Returns:
             str: Carga de la CPU.
         """
         try:
-            result = subprocess.run(['grep', 'cpu ', '/proc/stat'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if result.returncode == 0:
-                cpu_times = result.stdout.strip().split()[1:5]
-                cpu_times = list(map(int, cpu_times))
-                total_time = sum(cpu_times)
-                idle_time = cpu_times[3]
-                load = 100 * (total_time - idle_time) / total_time
+            load = self.system_metrics.cpu_load().total
+            if load is not None:
                 return f"{load:.2f}%"
             return "N/D"
         except Exception as e:
@@ -324,54 +312,42 @@ class AppLauncher(Gtk.Window):
             str: Porcentaje de memoria ocupada.
         """
         try:
-            result = subprocess.run(['free', '-m'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                memory_line = lines[1].split()
-                used_memory = int(memory_line[2])
-                total_memory = int(memory_line[1])
-                memory_usage_percentage = (used_memory / total_memory) * 100
-                return f"{memory_usage_percentage:.2f}%"
+            memory = self.system_metrics.memory_status()
+            if memory is not None:
+                return f"{memory.used_percent:.2f}%"
             return "N/D"
         except Exception as e:
             print(f"Error obteniendo el estado de la memoria: {e}")
             return "N/D"
 
-    def update_status_labels(self):
+    def update_status_labels(self, snapshot):
         """
-        Actualiza las etiquetas de estado (batería, CPU y memoria).
-        """
-        battery_status = self.update_battery_status()
-        cpu_load = self.update_cpu_load()
-        memory_status = self.update_memory_status()
-        pending_updates = self.get_pending_updates()
+        Aplica una instantánea de estado a las etiquetas (batería, CPU, memoria y actualizaciones).
 
-        self.battery_label.set_text(battery_status)
-        self.cpu_label.set_text(cpu_load)
-        self.memory_label.set_text(memory_status)
-        self.updates_label.set_text(f"{pending_updates}")
+        Se ejecuta en el hilo principal; los valores ya vienen calculados por el StatusSampler.
 
-        return True  # Return True to keep the timeout active
+        Args:
+            snapshot (StatusSnapshot): Valores de la barra de estado.
+        """
+        self.battery_label.set_text(snapshot.battery)
+        self.cpu_label.set_text(snapshot.cpu)
+        self.memory_label.set_text(snapshot.memory)
+        self.updates_label.set_text(snapshot.updates)
+
+        return False  # Ejecutar una sola vez desde GLib.idle_add
 
     def on_filter_text_changed(self, entry):
         """
-        Filtra las aplicaciones o comandos basados en el texto de entrada.
+        Lanza la consulta del texto de entrada en el proveedor correspondiente.
+
+        La consulta anterior queda cancelada, aunque siga en curso.
 
         Args:
             entry (Gtk.Entry): Campo de texto de entrada.
         """
-        filter_text = entry.get_text().lower()
-        if filter_text.startswith(self.command_loader.sys_command_prefix):
-            self.load_system_commands()
-        elif filter_text.startswith(self.command_loader.con_command_prefix):
-            self.load_connectivity_commands()
-        elif filter_text == "help:":
-            self.window_manager.show_help_window()
-        elif filter_text.startswith("theme:"):
-            self.load_theme_files()
-        else:
-            filtered_applications = self.application_manager.filter_applications(filter_text)
-            self.load_applications(filtered_applications)
+        tracer.keystroke()
+        with tracer.span("filter_text_changed"):
+            self.engine.query(entry.get_text(), self.show_results)
 
     def on_filter_entry_key_press(self, controller, keyval, keycode, state):
         """
@@ -384,71 +360,38 @@ class AppLauncher(Gtk.Window):
             state (Gdk.ModifierType): El estado del modificador.
         """
         if keyval in [Gdk.KEY_Return, Gdk.KEY_KP_Enter]:
-            filter_text = self.filter_entry.get_text().lower()
-            if filter_text.startswith(self.command_loader.sys_command_prefix) or filter_text.startswith(self.command_loader.con_command_prefix):
-                if self.listbox.get_first_child() is not None and self.listbox.get_first_child().get_next_sibling() is None:
-                    self.on_row_activated(self.listbox, self.listbox.get_first_child())
-            else:
-                filtered_applications = self.application_manager.filter_applications(filter_text)
-                if len(filtered_applications) == 1:
-                    self.on_row_activated(self.listbox, self.listbox.get_first_child())
+            n_items = self.result_store.get_n_items()
+            active = self.engine.registry.active
+            if n_items == 1 or (n_items > 1 and active is not None and active.activate_first):
+                self.on_row_activated(self.list_view, 0)
         elif keyval == Gdk.KEY_F1 and (state & Gdk.ModifierType.CONTROL_MASK):
             self.window_manager.show_help_window()
 
-    def on_row_activated(self, listbox, row):
+    def on_row_activated(self, list_view, position):
         """
         Ejecuta la aplicación o comando seleccionado.
 
         Args:
-            listbox (Gtk.ListBox): El ListBox donde ocurrió el evento.
-            row (Gtk.ListBoxRow): La fila seleccionada.
-        """
-        index = row.get_index()
-        filter_text = self.filter_entry.get_text().lower()
-        if filter_text.startswith(self.command_loader.sys_command_prefix) or filter_text.startswith(self.command_loader.con_command_prefix):
-            hbox = row.get_child()
-            command_name = hbox.get_first_child().get_next_sibling()
-            if isinstance(command_name, Gtk.Label):
-                command_func = row.app_command
-                if command_func:
-                    print(f"{command_name.get_text()} ejecutado")
-                    command_func()
-        elif filter_text.startswith("theme:"):
-            hbox = row.get_child()
-            theme_name = hbox.get_first_child().get_next_sibling()
-            if isinstance(theme_name, Gtk.Label):
-                self.apply_theme(theme_name.get_text())
-        else:
-            filtered_applications = self.application_manager.filter_applications(filter_text)
-            app_name, app_command, _ = filtered_applications[index]
-            self.filter_entry.set_text(app_name)  # Mostrar el nombre en el Gtk.Entry
-            print(f"{app_name} lanzado")
-            app_command()
-            self.close()  # Cerrar la ventana
+            list_view (Gtk.ListView): El ListView donde ocurrió el evento.
+            position (int): La posición de la fila activada.
+        """
+        item = self.result_store.get_item(position)
+        if item is None:
+            return
+        result = item.result
+        print(f"{result.name} ejecutado")
+        result.action()
+        if result.dismiss:
+            self.dismiss()  # Cerrar u ocultar la ventana
 
-    def apply_theme(self, theme_name):
+    def on_applications_changed(self, paths):
         """
-        Aplica un nuevo tema CSS a la interfaz gráfica y guarda el tema seleccionado.
+        Aplica un lote de cambios de archivos .desktop al índice y refresca la lista una sola vez.
 
         Args:
-            theme_name (str): Nombre del archivo de tema sin la extensión.
-        """
-        css_file = os.path.join('themes', f"{theme_name}.css")
-        if os.path.exists(css_file):
-            css_provider = Gtk.CssProvider()
-            with open(css_file, "rb") as f:
-                css_data = f.read()
-            css_provider.load_from_data(css_data)
-
-            Gtk.StyleContext.add_provider_for_display(
-                Gdk.Display.get_default(),
-                css_provider,
-                Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-            )
-            print(f"Tema '{theme_name}' aplicado")
-            self.save_theme(theme_name)
-        else:
-            print(f"Archivo '{css_file}' no encontrado")
+            paths (list): Rutas de los archivos .desktop cambiados.
+        """
+        self.engine.apply_changes(paths)
 
     def on_key_press(self, controller, keyval, keycode, state):
         """
@@ -461,64 +404,7 @@ class AppLauncher(Gtk.Window):
             state (Gdk.ModifierType): El estado del modificador.
         """
         if keyval == Gdk.KEY_Escape:
-            self.close()  # Cerrar la ventana al pulsar Escape
-
-    def launch_application(self, exec_command):
-        """
-        Lanza una aplicación.
-
-        Args:
-            exec_command (str): El comando para ejecutar la aplicación.
-        """
-        print(f"Lanzando {exec_command}")
-        subprocess.Popen(exec_command.split())
-
-    def apply_css(self):
-        """
-        Aplica el estilo CSS a la ventana.
-        """
-        css_provider = Gtk.CssProvider()
-        css_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'themes', 'style.css')
-        with open(css_file, "rb") as f:
-            css_data = f.read()
-
-        css_provider.load_from_data(css_data)
-
-        Gtk.StyleContext.add_provider_for_display(
-            Gdk.Display.get_default(),
-            css_provider,
-            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
-    
-    def load_theme_files(self):
-        """
-        Carga los archivos de temas .css disponibles en el ListBox.
-        """
-        css_files = self.list_css_files()
-        theme_commands = [(css_file, lambda css_file=css_file: self.apply_theme(css_file), "preferences-desktop-theme") for css_file in css_files]
-        self.load_applications(theme_commands)
-        
-    def list_css_files(self):
-        """
-        Lista los archivos .css disponibles en el directorio themes.
-
-        Returns:
-            list: Lista de nombres de archivos .css sin la extensión.
-        """
-        css_files = [f[:-4] for f in os.listdir('themes') if f.endswith('.css')]
-        return css_files
-
-    def save_theme(self, theme_name):
-        """
-        Guarda el tema seleccionado en un archivo de configuración.
-
-        Args:
-            theme_name (str): Nombre del tema a guardar.
-        """
-        config = configparser.ConfigParser()
-        config['Settings'] = {'theme': theme_name}
-        with open('themes/config.ini', 'w') as configfile:
-            config.write(configfile)
+            self.dismiss()  # Cerrar u ocultar la ventana al pulsar Escape
 
 
 
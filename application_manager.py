@@ -1,8 +1,63 @@
 #!/usr/bin/python3
 
-import glob
 import os
-import configparser
+import time
+from functools import partial
+
+from catalog import Catalog, derived_fields
+from catalog_cache import CatalogCache
+from desktop_entry import parse_boolean, parse_desktop_entries, parse_list, preferred_locales
+from path_index import ExecutableIndex
+from process_launcher import ProcessLauncher, expand_field_codes
+from search_index import SearchIndex, DEFAULT_LIMIT
+from text_normalize import collation_key, normalize
+from usage_store import UsageStore
+
+# Claves del grupo [Desktop Entry] que se guardan en el catálogo
+DESKTOP_KEYS = (
+    "Type", "Name", "GenericName", "Exec", "Icon", "TryExec",
+    "Keywords", "Categories", "NoDisplay", "Hidden", "OnlyShowIn", "NotShowIn",
+)
+# Segundos tras los que se recalculan las bonificaciones por uso para aplicar su decaimiento
+USAGE_REFRESH_INTERVAL = 3600
+
+
+def application_dirs(environ=None):
+    """
+    Devuelve los directorios de aplicaciones según la especificación XDG Base Directory.
+
+    Args:
+        environ (dict): Variables de entorno, o None para os.environ.
+
+    Returns:
+        list: Directorios applications/ de $XDG_DATA_HOME y $XDG_DATA_DIRS, de mayor a menor precedencia.
+    """
+    environ = os.environ if environ is None else environ
+    data_home = environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    data_dirs = (environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share').split(':')
+
+    directories = []
+    for data_dir in [data_home] + data_dirs:
+        if data_dir and os.path.isabs(data_dir):
+            directory = os.path.join(os.path.normpath(data_dir), 'applications')
+            if directory not in directories:
+                directories.append(directory)
+    return directories
+
+
+def current_desktops(environ=None):
+    """
+    Devuelve los entornos de escritorio activos según $XDG_CURRENT_DESKTOP.
+
+    Args:
+        environ (dict): Variables de entorno, o None para os.environ.
+
+    Returns:
+        set: Nombres de los entornos de escritorio.
+    """
+    environ = os.environ if environ is None else environ
+    return {desktop for desktop in environ.get('XDG_CURRENT_DESKTOP', '').split(':') if desktop}
+
 
 class ApplicationManager:
     """
@@ -11,56 +66,441 @@ class ApplicationManager:
     Métodos:
         __init__: Inicializa y carga todas las aplicaciones.
         load_applications: Carga las aplicaciones desde los archivos .desktop.
+        build_catalog: Construye el catálogo a partir de los registros de la caché.
+        apply_changes: Aplica al índice los cambios de archivos .desktop concretos.
+        refresh_application: Vuelve a resolver una aplicación tras cambiar alguno de sus archivos.
+        watched_directories: Devuelve los directorios que hay que vigilar.
+        resolve_entries: Resuelve los identificadores y aplica las reglas de visibilidad.
+        desktop_id: Calcula el identificador de un archivo .desktop.
+        is_visible: Indica si una entrada debe mostrarse.
+        find_executable: Busca en PATH el ejecutable de un TryExec.
+        rows: Devuelve las filas de la lista de resultados para unos índices.
+        launch: Lanza la aplicación de un índice del catálogo.
+        launch_argv: Devuelve los argumentos con los que se lanzaría una aplicación.
+        record_launch: Registra el lanzamiento de una aplicación en el historial.
+        refresh_usage: Recalcula las bonificaciones por uso con las puntuaciones actuales.
+        launch_command: Lanza una línea de comandos.
+        parse_desktop_files: Analiza un lote de archivos .desktop.
+        parse_desktop_file: Analiza un archivo .desktop.
+        get_search_index: Devuelve el índice de búsqueda de las aplicaciones.
         filter_applications: Filtra las aplicaciones basadas en el texto de búsqueda.
     """
     
-    def __init__(self, launcher):
+    def __init__(self, catalog_cache=None, usage_store=None):
         """
         Inicializa y carga todas las aplicaciones.
 
         Args:
-            launcher (AppLauncher): Instancia de AppLauncher para lanzar aplicaciones.
+            catalog_cache (CatalogCache): Caché del catálogo. Si es None se usa la caché por defecto.
+            usage_store (UsageStore): Historial de lanzamientos. Si es None se usa el historial por defecto.
         """
-        self.launcher = launcher
-        self.all_applications = self.load_applications()
+        self.catalog_cache = catalog_cache or CatalogCache()
+        if usage_store is None:
+            usage_store = UsageStore()
+            usage_store.load()
+        self.usage_store = usage_store
+        self.application_dirs = application_dirs()
+        self.locales = preferred_locales()
+        self.desktops = current_desktops()
+        self.executable_index = ExecutableIndex()
+        # Si el índice de PATH ya se ha comprobado en la carga o el cambio en curso
+        self.path_checked = False
+        self.process_launcher = ProcessLauncher()
+        self.search_index = None
+        self.usage_refreshed_at = None
+        # Identificador -> rutas de los archivos válidos con ese identificador en cualquier directorio
+        self.sources = {}
+        self.catalog = self.load_applications()
 
     def load_applications(self):
         """
-        Carga las aplicaciones desde los archivos .desktop.
+        Carga las aplicaciones desde los archivos .desktop, usando la caché del catálogo.
+
+        Returns:
+            Catalog: Catálogo de las aplicaciones visibles.
+        """
+        records = self.catalog_cache.load(self.application_dirs, self.parse_desktop_files, self.locales)
+        return self.build_catalog(records)
+
+    def build_catalog(self, records):
+        """
+        Construye el catálogo a partir de los registros de la caché.
+
+        Las aplicaciones se ordenan por nombre según el locale del usuario,
+        de modo que el orden no depende del orden de los directorios.
+
+        Args:
+            records (list): Lista de tuplas (ruta, registro) de la caché.
+
+        Returns:
+            Catalog: Catálogo de las aplicaciones visibles.
+        """
+        entries = sorted(self.resolve_entries(records).items(), key=lambda item: collation_key(item[1][1]['Name']))
+        catalog = Catalog()
+        for desktop_id, (path, record) in entries:
+            catalog.append(desktop_id, path, record)
+        # El índice de búsqueda se reconstruye en la primera consulta
+        self.search_index = None
+        return catalog
+
+    def apply_changes(self, paths):
+        """
+        Aplica al catálogo y al índice los cambios de archivos .desktop concretos.
+
+        Sólo se vuelven a analizar los archivos cambiados y sólo se tocan las
+        aplicaciones con sus identificadores; el resto del catálogo y del
+        índice de búsqueda no se reconstruye. La caché se escribe en segundo plano.
+
+        Args:
+            paths (list): Rutas de archivos .desktop añadidos, modificados, eliminados o renombrados.
+        """
+        # Un cambio puede acompañar a la instalación de su ejecutable
+        self.path_checked = False
+        changed = []
+        for path in paths:
+            self.catalog_cache.update_file(path, self.parse_desktop_files)
+            desktop_id, _ = self.desktop_id(path)
+            if desktop_id is None:
+                continue
+            sources = self.sources.setdefault(desktop_id, [])
+            if path not in sources:
+                sources.append(path)
+            if desktop_id not in changed:
+                changed.append(desktop_id)
+
+        for desktop_id in changed:
+            self.refresh_application(desktop_id)
+        self.catalog_cache.save()
+
+    def refresh_application(self, desktop_id):
+        """
+        Vuelve a resolver una aplicación tras cambiar alguno de sus archivos y actualiza el catálogo y el índice.
+
+        Un cambio puede ocultar o descubrir el archivo con el mismo
+        identificador de otro directorio, así que se vuelve a elegir entre
+        todos los archivos con ese identificador. La aplicación conserva su
+        índice si sigue existiendo.
+
+        Args:
+            desktop_id (str): Identificador de la aplicación.
+        """
+        best = None
+        sources = self.sources.get(desktop_id, [])
+        for path in list(sources):
+            record = self.catalog_cache.record(path)
+            if record is None:
+                # Archivo eliminado o mal formado
+                sources.remove(path)
+                continue
+            precedence = self.desktop_id(path)[1]
+            if best is None or precedence < best[0]:
+                best = (precedence, path, record)
+        if not sources:
+            self.sources.pop(desktop_id, None)
+
+        catalog = self.catalog
+        index = catalog.index_of(desktop_id)
+        if best is None or not self.is_visible(best[2]):
+            if index is not None:
+                catalog.remove(index)
+                if self.search_index is not None:
+                    self.search_index.remove(index)
+            return
+
+        _, path, record = best
+        if index is None:
+            index = catalog.append(desktop_id, path, record)
+        else:
+            catalog.replace(index, path, record)
+        self._place(index)
+        if self.search_index is not None:
+            self.search_index.update(index, catalog.normalized[index])
+            self.search_index.set_usage(index, self.usage_store.score(desktop_id))
+
+    def _place(self, index):
+        """
+        Mueve una aplicación a su posición en el orden alfabético del catálogo.
+
+        Args:
+            index (int): Índice de la aplicación.
+        """
+        names, order = self.catalog.names, self.catalog.order
+        order.remove(index)
+        key = collation_key(names[index])
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if collation_key(names[order[middle]]) <= key:
+                low = middle + 1
+            else:
+                high = middle
+        order.insert(low, index)
+
+    def watched_directories(self):
+        """
+        Devuelve los directorios que hay que vigilar: las raíces y sus subdirectorios conocidos.
 
         Returns:
-            list: Lista de tuplas con el nombre de la aplicación, el comando y el icono.
+            list: Rutas de directorios.
         """
-        applications = []
-        desktop_files = glob.glob('/usr/share/applications/*.desktop') + \
-                        glob.glob(os.path.expanduser('~/.local/share/applications/*.desktop'))
+        directories = list(self.application_dirs)
+        directories.extend(d for d in self.catalog_cache.directories if d not in directories)
+        return directories
 
-        for desktop_file in desktop_files:
-            config = configparser.ConfigParser(interpolation=None)
-            try:
-                config.read(desktop_file)
-                if 'Desktop Entry' in config and 'Name' in config['Desktop Entry'] and 'Exec' in config['Desktop Entry']:
-                    app_name = config['Desktop Entry']['Name']
-                    exec_command = config['Desktop Entry']['Exec']
-                    icon_name = config['Desktop Entry'].get('Icon', None)
-                    app_command = lambda cmd=exec_command: self.launcher.launch_application(cmd)
-                    applications.append((app_name, app_command, icon_name))
-            except configparser.Error as e:
-                print(f"Error leyendo {desktop_file}: {e}")
+    def resolve_entries(self, records):
+        """
+        Resuelve los identificadores de los archivos y aplica las reglas de visibilidad.
+
+        De cada identificador sólo cuenta el archivo del directorio de mayor
+        precedencia, aunque esté oculto (Hidden=true elimina la entrada de
+        los directorios inferiores). La visibilidad se evalúa en cada carga,
+        no se guarda en la caché, porque depende de PATH y del escritorio.
+
+        Args:
+            records (list): Lista de tuplas (ruta, registro) de la caché.
 
-        return applications
+        Returns:
+            dict: Identificador -> tupla (ruta, registro) de las entradas visibles.
+        """
+        # PATH sólo se lista si alguna entrada visible tiene TryExec
+        self.path_checked = False
+
+        resolved = {}
+        self.sources = {}
+        for path, record in records:
+            desktop_id, precedence = self.desktop_id(path)
+            if desktop_id is None:
+                continue
+            self.sources.setdefault(desktop_id, []).append(path)
+            current = resolved.get(desktop_id)
+            if current is None or precedence < current[0]:
+                resolved[desktop_id] = (precedence, path, record)
+
+        return {
+            desktop_id: (path, record)
+            for desktop_id, (_, path, record) in resolved.items()
+            if self.is_visible(record)
+        }
+
+    def desktop_id(self, path):
+        """
+        Calcula el identificador de un archivo .desktop (ruta relativa con '/' sustituido por '-').
+
+        Args:
+            path (str): Ruta del archivo.
+
+        Returns:
+            tuple: (identificador, precedencia del directorio raíz), o (None, None) si no está en ninguna raíz.
+        """
+        for precedence, directory in enumerate(self.application_dirs):
+            if path.startswith(directory + os.sep):
+                return path[len(directory) + 1:].replace(os.sep, '-'), precedence
+        return None, None
+
+    def is_visible(self, record):
+        """
+        Indica si una entrada debe mostrarse según la especificación Desktop Entry.
+
+        Args:
+            record (dict): Claves leídas del grupo [Desktop Entry].
+
+        Returns:
+            bool: True si la entrada es una aplicación que debe aparecer en el lanzador.
+        """
+        if record.get('Type', 'Application') != 'Application':
+            return False
+        if 'Name' not in record or 'Exec' not in record:
+            return False
+        if parse_boolean(record.get('Hidden')) or parse_boolean(record.get('NoDisplay')):
+            return False
+
+        only_show_in = parse_list(record.get('OnlyShowIn'))
+        if only_show_in and self.desktops.isdisjoint(only_show_in):
+            return False
+        if not self.desktops.isdisjoint(parse_list(record.get('NotShowIn'))):
+            return False
+
+        try_exec = record.get('TryExec')
+        if try_exec and self.find_executable(try_exec) is None:
+            return False
+        return True
+
+    def find_executable(self, name):
+        """
+        Busca en PATH el ejecutable de un TryExec.
+
+        El índice de PATH se comprueba la primera vez que hace falta en cada
+        carga o cambio, no en cada arranque: la mayoría de las entradas no
+        tienen TryExec y listar PATH en frío cuesta decenas de milisegundos.
+
+        Args:
+            name (str): Nombre del ejecutable o ruta absoluta.
+
+        Returns:
+            str: Ruta del ejecutable, o None si no está instalado.
+        """
+        if os.sep not in name and not self.path_checked:
+            self.executable_index.refresh()
+            self.path_checked = True
+        return self.executable_index.find(name)
+
+    def rows(self, indexes):
+        """
+        Devuelve las filas de la lista de resultados para unos índices del catálogo.
+
+        La acción de cada fila se crea en este momento y sólo para las filas
+        pedidas; el catálogo no guarda ninguna función por aplicación.
+
+        Args:
+            indexes (iterable): Índices del catálogo.
+
+        Returns:
+            list: Lista de tuplas con el nombre de la aplicación, la función de lanzamiento y el icono.
+        """
+        names, icons = self.catalog.names, self.catalog.icons
+        return [(names[index], partial(self.launch, index), icons[index]) for index in indexes]
+
+    def launch(self, index, files=()):
+        """
+        Lanza la aplicación de un índice del catálogo, expandiendo los códigos de campo de Exec.
+
+        Args:
+            index (int): Índice de la aplicación.
+            files (list): Archivos o URLs con los que se abre la aplicación.
+
+        Returns:
+            int: PID del proceso, o None si no se ha podido lanzar.
+        """
+        argv = self.launch_argv(index, files)
+        if argv is None:
+            print(f"No se puede lanzar {self.catalog.names[index]}: línea Exec no válida")
+            return None
+        pid = self.process_launcher.launch(argv, self.catalog.names[index])
+        if pid is not None:
+            self.record_launch(index)
+        return pid
+
+    def launch_argv(self, index, files=()):
+        """
+        Devuelve los argumentos con los que se lanzaría una aplicación, sin lanzarla.
+
+        Args:
+            index (int): Índice de la aplicación.
+            files (list): Archivos o URLs con los que se abre la aplicación.
+
+        Returns:
+            list: Argumentos con los códigos de campo expandidos, o None si la línea Exec no es válida.
+        """
+        catalog = self.catalog
+        template = catalog.argv_templates[index]
+        if template is None:
+            return None
+        return expand_field_codes(template, catalog.names[index], catalog.icons[index], catalog.paths[index], files)
+
+    def record_launch(self, index):
+        """
+        Registra el lanzamiento de una aplicación en el historial y actualiza las bonificaciones del índice.
+
+        Args:
+            index (int): Índice de la aplicación.
+        """
+        self.usage_store.record(self.catalog.desktop_ids[index])
+        # Las demás puntuaciones también han decaído desde el último cálculo
+        self.refresh_usage()
+
+    def refresh_usage(self):
+        """
+        Recalcula las bonificaciones por uso del índice con las puntuaciones actuales.
+
+        Las bonificaciones se calculan al construir el índice; un demonio
+        residente las recalcula tras cada lanzamiento y, como mucho, cada
+        USAGE_REFRESH_INTERVAL segundos para que el uso antiguo pierda peso.
+        """
+        if self.search_index is None:
+            return
+        catalog = self.catalog
+        usage = {}
+        for desktop_id, usage_score in self.usage_store.scores().items():
+            index = catalog.index_of(desktop_id)
+            if index is not None:
+                usage[index] = usage_score
+        self.search_index.reset_usage(usage)
+        self.usage_refreshed_at = time.monotonic()
+
+    def launch_command(self, exec_command):
+        """
+        Lanza una línea de comandos.
+
+        Los argumentos se separan con las reglas del shell (comillas y
+        escapes), pero el comando no pasa por un shell.
+
+        Args:
+            exec_command (str): El comando a ejecutar.
+
+        Returns:
+            int: PID del proceso, o None si no se ha podido lanzar.
+        """
+        return self.process_launcher.launch_command(exec_command)
+
+    def parse_desktop_files(self, desktop_files):
+        """
+        Analiza un lote de archivos .desktop, en paralelo si son muchos.
+
+        Args:
+            desktop_files (list): Rutas de los archivos .desktop.
+
+        Returns:
+            list: Diccionario con las claves de DESKTOP_KEYS y los campos derivados
+                (ver catalog.derived_fields), o None (archivo mal formado), por cada archivo.
+        """
+        records = []
+        for desktop_file, (values, error) in zip(desktop_files, parse_desktop_entries(desktop_files, self.locales, DESKTOP_KEYS)):
+            if error is not None:
+                print(f"Error leyendo {desktop_file}: {error}")
+            elif values is not None:
+                values.update(derived_fields(desktop_file, values))
+            records.append(values)
+        return records
+
+    def parse_desktop_file(self, desktop_file):
+        """
+        Analiza un archivo .desktop.
+
+        Args:
+            desktop_file (str): Ruta del archivo .desktop.
+
+        Returns:
+            dict: Claves leídas del grupo [Desktop Entry], o None si el archivo está mal formado.
+        """
+        return self.parse_desktop_files([desktop_file])[0]
+
+    def get_search_index(self):
+        """
+        Devuelve el índice de búsqueda, construyéndolo si el catálogo ha cambiado.
+
+        Returns:
+            SearchIndex: Índice sobre los nombres de las aplicaciones.
+        """
+        if self.search_index is None:
+            scores = self.usage_store.scores()
+            usage = {index: scores[desktop_id] for index, desktop_id in enumerate(self.catalog.desktop_ids) if desktop_id in scores}
+            self.search_index = SearchIndex(self.catalog.names, self.catalog.normalized, usage)
+            self.usage_refreshed_at = time.monotonic()
+        elif time.monotonic() - self.usage_refreshed_at >= USAGE_REFRESH_INTERVAL:
+            self.refresh_usage()
+        return self.search_index
 
-    def filter_applications(self, filter_text):
+    def filter_applications(self, filter_text, limit=DEFAULT_LIMIT):
         """
-        Filtra las aplicaciones basadas en el texto de búsqueda.
+        Filtra las aplicaciones basadas en el texto de búsqueda, ordenadas por relevancia y uso.
 
         Args:
             filter_text (str): Texto para filtrar las aplicaciones.
+            limit (int): Número máximo de resultados, o None para no limitar.
 
         Returns:
-            list: Lista de aplicaciones filtradas.
+            list: Filas de las aplicaciones filtradas (ver rows).
         """
-        return [
-            app for app in self.all_applications
-            if filter_text in app[0].lower()
-        ]
+        if not filter_text:
+            return self.rows(self.catalog.order)
+        return self.rows(self.get_search_index().search(normalize(filter_text), limit))
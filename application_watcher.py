@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+
+import os
+import time
+from gi.repository import Gio, GLib
+
+# Tiempo sin eventos tras el cual se aplica el lote pendiente (ms)
+QUIET_PERIOD_MS = 200
+# Tiempo máximo que puede esperar un lote aunque sigan llegando eventos (ms)
+MAX_BATCH_DELAY_MS = 2000
+
+# Eventos que afectan al contenido o a la existencia de un archivo .desktop
+RELEVANT_EVENTS = (
+    Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+    Gio.FileMonitorEvent.CREATED,
+    Gio.FileMonitorEvent.DELETED,
+    Gio.FileMonitorEvent.MOVED_IN,
+    Gio.FileMonitorEvent.MOVED_OUT,
+    Gio.FileMonitorEvent.RENAMED,
+)
+# Eventos tras los que puede aparecer un directorio nuevo
+DIRECTORY_EVENTS = (
+    Gio.FileMonitorEvent.CREATED,
+    Gio.FileMonitorEvent.MOVED_IN,
+    Gio.FileMonitorEvent.RENAMED,
+)
+
+class ApplicationWatcher:
+    """
+    Vigila los directorios de aplicaciones (inotify a través de Gio.FileMonitor)
+    y agrupa ráfagas de eventos en un único lote de cambios.
+
+    Una transacción del gestor de paquetes que toca cientos de archivos
+    produce una sola llamada a on_changed con todas las rutas afectadas.
+    inotify no vigila subdirectorios: los que se crean (o se mueven dentro)
+    después del arranque se vigilan al aparecer, y sus archivos .desktop,
+    que pueden haberse escrito antes de tener monitor, entran en el lote.
+
+    Métodos:
+        __init__: Crea un monitor por cada directorio.
+        watch: Crea el monitor de un directorio.
+        watch_tree: Vigila un directorio nuevo y sus subdirectorios.
+        unwatch: Deja de vigilar un directorio eliminado y sus subdirectorios.
+        on_monitor_changed: Acumula la ruta de cada evento relevante.
+        flush: Entrega el lote pendiente cuando los eventos se han calmado.
+        cancel: Detiene la vigilancia de los directorios.
+    """
+
+    def __init__(self, directories, on_changed, timeout_add=GLib.timeout_add, clock=time.monotonic):
+        """
+        Crea un monitor por cada directorio.
+
+        Args:
+            directories (list): Directorios de archivos .desktop a vigilar.
+            on_changed (callable): Función que recibe la lista de rutas cambiadas.
+            timeout_add (callable): Función que programa una llamada periódica (GLib.timeout_add por defecto).
+            clock (callable): Reloj en segundos (time.monotonic por defecto).
+        """
+        self.on_changed = on_changed
+        self.timeout_add = timeout_add
+        self.clock = clock
+        self.pending = set()
+        self.batch_started = 0.0
+        self.last_event = 0.0
+        self.flush_source = 0
+        # Directorio -> monitor; las raíces se vigilan siempre, aunque se eliminen
+        self.roots = set(directories)
+        self.monitors = {}
+
+        for directory in directories:
+            self.watch(directory)
+
+    def watch(self, directory):
+        """
+        Crea el monitor de un directorio, si no lo tiene ya.
+
+        Args:
+            directory (str): Directorio a vigilar.
+        """
+        if directory in self.monitors:
+            return
+        try:
+            monitor = Gio.File.new_for_path(directory).monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+        except GLib.Error as e:
+            print(f"Error vigilando {directory}: {e.message}")
+            return
+        monitor.connect("changed", self.on_monitor_changed)
+        self.monitors[directory] = monitor
+
+    def watch_tree(self, directory):
+        """
+        Vigila un directorio aparecido después del arranque y sus subdirectorios,
+        y añade al lote los archivos .desktop que ya contienen.
+
+        Args:
+            directory (str): Directorio creado o movido dentro de uno vigilado.
+        """
+        for root, _, files in os.walk(directory):
+            self.watch(root)
+            self.pending.update(os.path.join(root, name) for name in files if name.endswith('.desktop'))
+
+    def unwatch(self, directory):
+        """
+        Deja de vigilar un directorio eliminado (o movido fuera) y sus subdirectorios.
+
+        Args:
+            directory (str): Directorio que ya no existe en su ruta.
+        """
+        prefix = directory + os.sep
+        for path in [path for path in self.monitors if path == directory or path.startswith(prefix)]:
+            if path not in self.roots:
+                self.monitors.pop(path).cancel()
+
+    def on_monitor_changed(self, monitor, file, other_file, event_type):
+        """
+        Acumula la ruta de cada evento relevante y programa la entrega del lote.
+
+        Args:
+            monitor (Gio.FileMonitor): El monitor que emite el evento.
+            file (Gio.File): El archivo afectado.
+            other_file (Gio.File): El archivo de destino en los renombrados, o None.
+            event_type (Gio.FileMonitorEvent): El tipo de evento.
+        """
+        if event_type not in RELEVANT_EVENTS:
+            return
+
+        for changed_file in (file, other_file):
+            path = changed_file.get_path() if changed_file is not None else None
+            if not path:
+                continue
+            if path.endswith('.desktop'):
+                self.pending.add(path)
+            elif event_type in DIRECTORY_EVENTS and os.path.isdir(path):
+                # Directorio nuevo, o el destino de un renombrado
+                self.watch_tree(path)
+            elif path in self.monitors:
+                # Un monitor sobre una ruta vacía no vería el directorio si se vuelve a crear
+                self.unwatch(path)
+
+        if not self.pending:
+            return
+
+        now = self.clock()
+        self.last_event = now
+        if not self.flush_source:
+            self.batch_started = now
+            self.flush_source = self.timeout_add(QUIET_PERIOD_MS, self.flush)
+
+    def flush(self):
+        """
+        Entrega el lote pendiente cuando no llegan eventos desde hace
+        QUIET_PERIOD_MS o cuando el lote lleva MAX_BATCH_DELAY_MS esperando.
+
+        Returns:
+            bool: True para seguir esperando, False cuando el lote se ha entregado.
+        """
+        now = self.clock()
+        quiet = (now - self.last_event) * 1000 >= QUIET_PERIOD_MS
+        overdue = (now - self.batch_started) * 1000 >= MAX_BATCH_DELAY_MS
+        if not quiet and not overdue:
+            return True
+
+        self.flush_source = 0
+        paths, self.pending = sorted(self.pending), set()
+        self.on_changed(paths)
+        return False
+
+    def cancel(self):
+        """
+        Detiene la vigilancia de los directorios y descarta el lote pendiente.
+        """
+        for monitor in self.monitors.values():
+            monitor.cancel()
+        self.monitors = {}
+        if self.flush_source:
+            GLib.source_remove(self.flush_source)
+            self.flush_source = 0
+        self.pending = set()
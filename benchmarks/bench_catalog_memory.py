@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+Mide con tracemalloc la memoria por aplicación del catálogo en columnas
+frente a la representación anterior (tuplas con una lambda por aplicación).
+
+Uso:
+    python benchmarks/bench_catalog_memory.py [--sizes 1000 10000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog
+
+ICONS = ["utilities-terminal", "web-browser", "text-editor", "multimedia-player", "system-settings", None]
+CATEGORIES = ["Utility;", "Network;WebBrowser;", "Development;IDE;", "AudioVideo;Player;", "Settings;System;"]
+
+
+def synthetic_records(count, seed=0):
+    """
+    Genera registros como los que devuelve el lector de archivos .desktop.
+
+    Las cadenas se construyen una a una, como al leerlas de disco, para que
+    los valores repetidos no lleguen ya compartidos.
+
+    Args:
+        count (int): Número de registros.
+        seed (int): Semilla para que los resultados sean reproducibles.
+
+    Returns:
+        list: Lista de tuplas (identificador, ruta, registro).
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        icon = rng.choice(ICONS)
+        record = {
+            'Name': f"Aplicación {i}",
+            'GenericName': "".join(["Editor ", "de texto"]),
+            'Exec': f"/usr/bin/app-{i} %U",
+            'Keywords': "".join(["texto;", "editor;", "código;"]),
+            'Categories': "".join(rng.choice(CATEGORIES)),
+        }
+        if icon is not None:
+            record['Icon'] = "".join(icon)
+        records.append((f"app-{i}.desktop", f"/usr/share/applications/app-{i}.desktop", record))
+    return records
+
+
+def build_tuples(records):
+    """
+    Representación anterior: (nombre, lambda, icono); los campos nuevos irían en tuplas aparte.
+    """
+    launcher = object()
+    return [
+        (record['Name'], lambda cmd=record['Exec'], launcher=launcher: (launcher, cmd), record.get('Icon'),
+         record.get('GenericName'), record.get('Keywords'), record.get('Categories'), desktop_id, path)
+        for desktop_id, path, record in records
+    ]
+
+
+def build_catalog(records):
+    catalog = Catalog()
+    for desktop_id, path, record in records:
+        catalog.append(desktop_id, path, record)
+    return catalog
+
+
+def measure(builder, size):
+    """
+    Devuelve los bytes por entrada que retiene la estructura construida.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = synthetic_records(size)
+    structure = builder(records)
+    # Sólo cuenta lo que queda vivo (cadenas incluidas) tras descartar los registros leídos
+    del records
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return (after - before) / size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        tuples = measure(build_tuples, size)
+        catalog = measure(build_catalog, size)
+        print(f"{size:>6} entradas: tuplas + lambda {tuples:7.1f} B/entrada | catálogo en columnas {catalog:7.1f} B/entrada"
+              f" ({100 * (1 - catalog / tuples):.0f}% menos)")
+
+
+if __name__ == "__main__":
+    main()
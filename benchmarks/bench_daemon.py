@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+"""
+Compara la latencia de apertura en frío y en caliente (modo residente).
+
+- En frío: arrancar "main.py" en un proceso nuevo hasta su primer fotograma pintado
+  (desde el lanzamiento del intérprete, con el instante que registra --profile-startup).
+- En caliente: volver a mostrar la ventana oculta con show_launcher() hasta el primer fotograma.
+- Activación remota: tiempo que tarda "main.py" en entregar la activación a un demonio en marcha.
+
+Necesita una pantalla (o un backend sin pantalla como GDK_BACKEND=broadway).
+
+Uso:
+    python benchmarks/bench_daemon.py [--rounds 10]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import gi
+gi.require_version('Gtk', '4.0')
+from gi.repository import GLib
+
+from app_launcher import AppLauncher
+from corpus import percentile
+
+
+def wait_for_paint(window):
+    """
+    Itera el bucle principal hasta que la ventana pinta un fotograma.
+
+    Args:
+        window (Gtk.Window): Ventana a esperar.
+    """
+    context = GLib.MainContext.default()
+    while window.get_frame_clock() is None:
+        context.iteration(True)
+
+    painted = []
+    clock = window.get_frame_clock()
+    handler = clock.connect("after-paint", lambda clock: painted.append(True))
+    window.queue_draw()
+    while not painted:
+        context.iteration(True)
+    clock.disconnect(handler)
+
+
+def report(label, samples):
+    print(f"{label:<22} p50 {percentile(samples, 0.5):8.2f} ms  p95 {percentile(samples, 0.95):8.2f} ms  máx {max(samples):8.2f} ms")
+
+
+def wait_for_profile(path, process, timeout=30):
+    """
+    Espera a que un proceso escriba su perfil de arranque (tras el primer fotograma).
+
+    Args:
+        path (str): Fichero de --profile-startup.
+        process (subprocess.Popen): Proceso que lo escribe.
+        timeout (float): Segundos máximos de espera.
+
+    Returns:
+        dict: El perfil de arranque.
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"main.py terminó con código {process.returncode} antes del primer fotograma")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            # Aún no existe o se está escribiendo
+            time.sleep(0.02)
+    raise RuntimeError("main.py no ha pintado el primer fotograma a tiempo")
+
+
+def measure_cold_start(rounds):
+    """
+    Arranca "main.py" en un proceso nuevo en cada ronda y mide hasta su primer fotograma.
+
+    Args:
+        rounds (int): Número de arranques.
+
+    Returns:
+        list: Duraciones en milisegundos.
+    """
+    main_py = os.path.join(ROOT, "main.py")
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for round_number in range(rounds):
+            profile_path = os.path.join(tmp, f"arranque-{round_number}.json")
+            start = time.perf_counter()
+            process = subprocess.Popen([sys.executable, main_py, "--profile-startup", profile_path], cwd=ROOT)
+            try:
+                profile = wait_for_profile(profile_path, process)
+            finally:
+                process.terminate()
+                process.wait()
+            # perf_counter es el reloj monotónico del sistema: el origen del hijo es comparable
+            first_frame = profile['origin_s'] + profile['marks']['first_frame'] / 1000
+            samples.append((first_frame - start) * 1000)
+    return samples
+
+
+def measure_remote_activation(rounds):
+    """
+    Arranca un demonio y mide cuánto tarda una invocación en activarlo.
+
+    Args:
+        rounds (int): Número de activaciones.
+
+    Returns:
+        list: Duraciones en milisegundos.
+    """
+    main_py = os.path.join(ROOT, "main.py")
+    daemon = subprocess.Popen([sys.executable, main_py, "--daemon"], cwd=ROOT)
+    try:
+        time.sleep(3)  # Dejar que el demonio registre su nombre en el bus
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, main_py], cwd=ROOT, check=True)
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--skip-remote", action="store_true", help="No medir la activación remota entre procesos.")
+    args = parser.parse_args()
+
+    cold = measure_cold_start(args.rounds)
+
+    warm = []
+    window = AppLauncher(daemon=True)
+    window.present()
+    wait_for_paint(window)
+    for _ in range(args.rounds * 3):
+        window.dismiss()
+        start = time.perf_counter()
+        window.show_launcher()
+        wait_for_paint(window)
+        warm.append((time.perf_counter() - start) * 1000)
+    window.destroy()
+
+    report("Apertura en frío", cold)
+    report("Apertura en caliente", warm)
+    if not args.skip_remote:
+        report("Activación remota", measure_remote_activation(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
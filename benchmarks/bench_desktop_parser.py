@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Compara el lector de archivos .desktop con el análisis anterior basado en configparser.
+
+Genera un corpus sintético (con traducciones, acciones y algunos archivos
+mal formados) y mide el análisis completo del corpus con cada método.
+
+Uso:
+    python benchmarks/bench_desktop_parser.py [--files 5000] [--repeat 3]
+"""
+
+import argparse
+import configparser
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import write_corpus
+from desktop_entry import parse_desktop_entries, parse_desktop_entry
+
+
+def parse_with_configparser(path):
+    """
+    Análisis anterior: un ConfigParser completo por archivo.
+    """
+    config = configparser.ConfigParser(interpolation=None)
+    try:
+        config.read(path)
+        if 'Desktop Entry' in config and 'Name' in config['Desktop Entry'] and 'Exec' in config['Desktop Entry']:
+            entry = config['Desktop Entry']
+            return (entry['Name'], entry['Exec'], entry.get('Icon', None))
+    except (configparser.Error, UnicodeDecodeError):
+        pass
+    return None
+
+
+def measure(label, function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<32} {best:9.1f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    locales = ("es_ES", "es")
+    with tempfile.TemporaryDirectory() as root:
+        paths = write_corpus(root, args.files, override_every=0)['paths']
+        print(f"{len(paths)} archivos .desktop (página de caché caliente, mejor de {args.repeat})")
+
+        baseline = measure("configparser", lambda: [parse_with_configparser(p) for p in paths], args.repeat)
+        streaming = measure("lector en serie", lambda: [parse_desktop_entry(p, locales) for p in paths], args.repeat)
+        threads = measure("lector + hilos", lambda: parse_desktop_entries(paths, locales), args.repeat)
+        processes = measure(
+            "lector + procesos",
+            lambda: parse_desktop_entries(paths, locales, executor_class=ProcessPoolExecutor),
+            args.repeat,
+        )
+
+        errors = sum(1 for _, error in parse_desktop_entries(paths, locales, executor_class=ThreadPoolExecutor) if error)
+        print(f"mal formados detectados: {errors}")
+        print(f"aceleración en serie {baseline / streaming:.1f}x, hilos {baseline / threads:.1f}x,"
+              f" procesos {baseline / processes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Mide la latencia de completado del modo de comandos sobre un PATH sintético.
+
+Uso:
+    python benchmarks/bench_run_completion.py [--binaries 5000] [--dirs 4]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import percentile
+from path_index import ExecutableIndex
+from providers import RunProvider
+
+
+def write_path(root, binaries, dirs, seed=0):
+    """
+    Crea directorios con ejecutables vacíos de nombres aleatorios.
+
+    Returns:
+        tuple: (PATH sintético, nombres creados).
+    """
+    rng = random.Random(seed)
+    directories = [os.path.join(root, f"bin{i}") for i in range(dirs)]
+    names = []
+    for directory in directories:
+        os.makedirs(directory)
+    for i in range(binaries):
+        name = "".join(rng.choice(string.ascii_lowercase + "-") for _ in range(rng.randint(3, 14))).strip("-") or f"x{i}"
+        name = f"{name}{i}" if rng.random() < 0.3 else name
+        path = os.path.join(rng.choice(directories), name)
+        with open(path, 'w'):
+            pass
+        os.chmod(path, 0o755)
+        names.append(name)
+    return os.pathsep.join(directories), names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--binaries", type=int, default=5000)
+    parser.add_argument("--dirs", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        path, names = write_path(root, args.binaries, args.dirs)
+        index = ExecutableIndex(path)
+
+        start = time.perf_counter()
+        index.refresh()
+        index.names()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        provider = RunProvider(("run:",), index, lambda command: None)
+        queries = [name[:length] for name in random.Random(1).sample(names, 300) for length in range(1, len(name) + 1)]
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            for _ in provider.query(query):
+                pass
+            samples.append((time.perf_counter() - start) * 1000)
+
+        print(f"{len(index.names())} ejecutables en {args.dirs} directorios: índice {build_ms:.1f} ms")
+        print(f"completado p50 {percentile(samples, 0.5):.3f} ms p95 {percentile(samples, 0.95):.3f} ms"
+              f" p99 {percentile(samples, 0.99):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
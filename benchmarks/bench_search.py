@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""
+Mide la latencia por pulsación del motor de búsqueda sobre catálogos sintéticos.
+
+Uso:
+    python benchmarks/bench_search.py [--sizes 1000 10000 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import keystroke_queries, percentile, synthetic_names
+from search_index import SearchIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 20000])
+    parser.add_argument("--sequences", type=int, default=200)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        names = synthetic_names(size)
+        start = time.perf_counter()
+        index = SearchIndex(names)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        samples = []
+        for query in keystroke_queries(names, args.sequences):
+            start = time.perf_counter()
+            index.search(query)
+            samples.append((time.perf_counter() - start) * 1000)
+
+        print(f"{size:>6} entradas: índice {build_ms:7.1f} ms | consulta p50 {percentile(samples, 0.5):.3f} ms"
+              f" p95 {percentile(samples, 0.95):.3f} ms p99 {percentile(samples, 0.99):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""
+Utilidades comunes de los benchmarks: corpus sintético de archivos .desktop
+en un árbol XDG temporal, secuencias de pulsaciones y estadísticas.
+"""
+
+import os
+import random
+
+WORDS = [
+    "Visual", "Studio", "Code", "Firefox", "Web", "Browser", "Terminal", "Files",
+    "Settings", "Image", "Viewer", "Editor", "Text", "Music", "Player", "Video",
+    "Office", "Writer", "Calc", "Impress", "Draw", "Mail", "Calendar", "Notes",
+    "System", "Monitor", "Disk", "Usage", "Network", "Manager", "Bluetooth",
+    "Audio", "Mixer", "Screen", "Recorder", "Remote", "Desktop", "Chat", "Store",
+    "Configuración", "Música", "Cámara", "Gráficos", "Información", "Menú",
+]
+LOCALES = ["ar", "de", "es", "es_MX", "fr", "it", "ja", "ko", "nl", "pl", "pt_BR", "ru", "sv", "tr", "zh_CN"]
+THEMED_ICONS = [
+    "utilities-terminal", "web-browser", "accessories-text-editor", "multimedia-audio-player",
+    "preferences-system", "system-file-manager", "applications-graphics", "office-calendar",
+]
+CATEGORIES = ["Utility;", "Network;WebBrowser;", "Development;IDE;", "AudioVideo;Player;", "Settings;System;", "Office;"]
+
+
+def synthetic_names(count, seed=0):
+    """
+    Genera nombres de aplicación sintéticos de entre una y cuatro palabras.
+
+    Args:
+        count (int): Número de nombres.
+        seed (int): Semilla para que los resultados sean reproducibles.
+
+    Returns:
+        list: Lista de nombres.
+    """
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + f" {i}" for i in range(count)]
+
+
+def keystroke_queries(names, sequences, seed=0):
+    """
+    Genera las consultas que produce escribir nombres y acrónimos letra a letra.
+
+    Args:
+        names (list): Nombres del catálogo.
+        sequences (int): Número de secuencias de escritura.
+        seed (int): Semilla para que los resultados sean reproducibles.
+
+    Returns:
+        list: Consultas en minúsculas, una por pulsación.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(sequences):
+        name = rng.choice(names).lower()
+        target = "".join(word[0] for word in name.split()[:-1]) if rng.random() < 0.3 else name[:12]
+        queries.extend(target[:length] for length in range(1, len(target) + 1))
+    return queries
+
+
+def desktop_entry_text(index, rng, malformed=False):
+    """
+    Construye el contenido de un archivo .desktop realista.
+
+    Args:
+        index (int): Número de la aplicación (forma parte del nombre y del ejecutable).
+        rng (random.Random): Generador aleatorio.
+        malformed (bool): Si es True, el archivo incluye una línea sin separador.
+
+    Returns:
+        tuple: (texto del archivo, nombre de la aplicación).
+    """
+    name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + f" {index}"
+    lines = ["# Archivo generado", "[Desktop Entry]", "Type=Application", f"Name={name}"]
+    for locale in rng.sample(LOCALES, rng.randint(0, len(LOCALES))):
+        lines.append(f"Name[{locale}]={name} ({locale})")
+        lines.append(f"Comment[{locale}]=Descripción traducida de la aplicación {index}")
+    lines.append(f"GenericName={rng.choice(WORDS)} {rng.choice(WORDS)}")
+    lines.append(f"Exec=app-{index} %U")
+
+    roll = rng.random()
+    if roll < 0.8:
+        lines.append(f"Icon={rng.choice(THEMED_ICONS)}")
+    elif roll < 0.9:
+        lines.append(f"Icon=/opt/app-{index}/icon.png")
+    lines.append(f"Categories={rng.choice(CATEGORIES)}")
+    lines.append("Keywords=uno;dos;tres;")
+    if rng.random() < 0.05:
+        lines.append("NoDisplay=true")
+
+    for action in range(rng.randint(0, 4)):
+        lines += ["", f"[Desktop Action accion{action}]", f"Name=Acción {action}", f"Exec=app-{index} --accion {action}"]
+    if malformed:
+        lines.insert(2, "línea sin separador")
+    return "\n".join(lines) + "\n", name
+
+
+def write_corpus(root, count, seed=0, malformed_every=100, subdir_every=20, override_every=50):
+    """
+    Escribe un árbol XDG temporal con archivos .desktop sintéticos.
+
+    El árbol incluye archivos en subdirectorios (identificadores con '-'),
+    archivos de usuario que sustituyen u ocultan a los del sistema y
+    algunos archivos mal formados.
+
+    Args:
+        root (str): Directorio raíz del árbol (p. ej. un tempfile.TemporaryDirectory).
+        count (int): Número de archivos del sistema.
+        seed (int): Semilla para que el corpus sea reproducible.
+        malformed_every (int): Uno de cada N archivos está mal formado (0 para ninguno).
+        subdir_every (int): Uno de cada N archivos va en un subdirectorio (0 para ninguno).
+        override_every (int): Una de cada N aplicaciones se sustituye desde el directorio del usuario (0 para ninguna).
+
+    Returns:
+        dict: Variables de entorno XDG que apuntan al árbol, más 'paths' (rutas
+        de los archivos del sistema) y 'names' (nombres de las aplicaciones).
+    """
+    rng = random.Random(seed)
+    data_home = os.path.join(root, "home", ".local", "share")
+    data_dir = os.path.join(root, "usr", "share")
+    user_apps = os.path.join(data_home, "applications")
+    system_apps = os.path.join(data_dir, "applications")
+    os.makedirs(user_apps)
+    os.makedirs(os.path.join(system_apps, "vendor"))
+
+    paths = []
+    names = []
+    for i in range(count):
+        malformed = bool(malformed_every) and i % malformed_every == malformed_every - 1
+        text, name = desktop_entry_text(i, rng, malformed)
+        directory = os.path.join(system_apps, "vendor") if subdir_every and i % subdir_every == 0 else system_apps
+        path = os.path.join(directory, f"app-{i}.desktop")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        paths.append(path)
+        names.append(name)
+
+        if override_every and i % override_every == 1:
+            with open(os.path.join(user_apps, f"app-{i}.desktop"), 'w', encoding='utf-8') as f:
+                f.write("[Desktop Entry]\nType=Application\nHidden=true\n" if rng.random() < 0.5 else text)
+
+    return {
+        'XDG_DATA_HOME': data_home,
+        'XDG_DATA_DIRS': data_dir,
+        'XDG_CACHE_HOME': os.path.join(root, "cache"),
+        'XDG_STATE_HOME': os.path.join(root, "state"),
+        'paths': paths,
+        'names': names,
+    }
+
+
+def percentile(samples, fraction):
+    """
+    Devuelve el percentil de una lista de muestras (método del rango más cercano).
+    """
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(samples):
+    """
+    Resume una lista de duraciones en milisegundos.
+
+    Args:
+        samples (list): Duraciones en milisegundos.
+
+    Returns:
+        dict: Número de muestras, media y percentiles 50, 95 y 99.
+    """
+    return {
+        'samples': len(samples),
+        'mean_ms': round(sum(samples) / len(samples), 4),
+        'p50_ms': round(percentile(samples, 0.50), 4),
+        'p95_ms': round(percentile(samples, 0.95), 4),
+        'p99_ms': round(percentile(samples, 0.99), 4),
+    }
@@ -0,0 +1,255 @@
+#!/usr/bin/python3
+"""
+Ejecuta los benchmarks de las rutas críticas sobre un corpus sintético y
+emite los resultados en JSON (p50/p95/p99 en milisegundos).
+
+Con --baseline compara contra un resultado guardado y termina con código 1
+si algún caso empeora más del umbral.
+
+Casos:
+    catalog_cold_load     ApplicationManager sin caché del catálogo
+    catalog_warm_load     ApplicationManager con la caché del catálogo
+    catalog_apply_change  apply_changes de un único archivo modificado
+    search_index_build    Construcción del índice de búsqueda
+    filter_applications   filter_applications por pulsación
+    query_session         QuerySession.update por pulsación (ruta de la interfaz)
+    command_loader        CommandLoader y proveedor de comandos del sistema
+    query_engine          QueryEngine.search por pulsación (la misma ruta que `main.py query`)
+    widget_rebuild        AppLauncher.show_results (sólo con --gtk; usar GDK_BACKEND=broadway sin pantalla)
+
+Uso:
+    python benchmarks/run_benchmarks.py [--files 2000] [--output actual.json]
+    python benchmarks/run_benchmarks.py --baseline base.json [--threshold 0.25]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import keystroke_queries, summarize, write_corpus
+
+# Diferencia mínima (ms) para considerar una regresión; por debajo es ruido de medida
+MIN_DELTA_MS = 0.05
+
+
+def timed(function):
+    """
+    Ejecuta una función y devuelve (resultado, duración en milisegundos).
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def bench_catalog(corpus, queries, rounds):
+    """
+    Mide la carga del catálogo, el índice y la búsqueda.
+
+    Returns:
+        dict: Resultados por caso.
+    """
+    from application_manager import ApplicationManager
+    from catalog_cache import default_cache_path
+    from query_session import QuerySession
+    from search_index import SearchIndex
+
+    results = {}
+    cache_path = default_cache_path()
+
+    cold = []
+    for _ in range(rounds):
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        manager, elapsed = timed(ApplicationManager)
+        cold.append(elapsed)
+        # La caché se escribe en segundo plano: la siguiente ronda en frío no debe encontrarla
+        manager.catalog_cache.flush()
+    results['catalog_cold_load'] = summarize(cold)
+
+    warm = []
+    for _ in range(rounds):
+        manager, elapsed = timed(ApplicationManager)
+        warm.append(elapsed)
+    results['catalog_warm_load'] = summarize(warm)
+
+    changes = []
+    changed_path = corpus['paths'][0]
+    for _ in range(rounds):
+        os.utime(changed_path)
+        _, elapsed = timed(lambda: manager.apply_changes([changed_path]))
+        changes.append(elapsed)
+        manager.catalog_cache.flush()
+    results['catalog_apply_change'] = summarize(changes)
+
+    catalog = manager.catalog
+    builds = [timed(lambda: SearchIndex(catalog.names, catalog.normalized))[1] for _ in range(rounds)]
+    results['search_index_build'] = summarize(builds)
+
+    manager.get_search_index()
+    results['filter_applications'] = summarize([timed(lambda: manager.filter_applications(query))[1] for query in queries])
+
+    session = QuerySession(manager)
+    results['query_session'] = summarize([timed(lambda: session.update(query))[1] for query in queries])
+    return results
+
+
+def bench_command_loader(rounds):
+    """
+    Mide la carga de la configuración y la consulta del proveedor de comandos del sistema.
+
+    Returns:
+        dict: Resultados del caso, o el motivo por el que se omite.
+    """
+    try:
+        from command_loader import CommandLoader
+    except ImportError as e:
+        return {'skipped': str(e)}
+    from providers import CommandProvider
+
+    samples = []
+    for _ in range(rounds * 20):
+        def run():
+            loader = CommandLoader()
+            provider = CommandProvider(loader.sys_command_prefix or "sys:", loader.get_system_commands, lambda command: None)
+            for _ in provider.query(""):
+                pass
+        samples.append(timed(run)[1])
+    return summarize(samples)
+
+
+def bench_engine(queries):
+    """
+    Mide la consulta completa del motor (proveedor, sesión y resultados) por pulsación.
+
+    Returns:
+        dict: Resultados del caso, o el motivo por el que se omite.
+    """
+    try:
+        from query_engine import QueryEngine
+    except ImportError as e:
+        return {'skipped': str(e)}
+
+    engine = QueryEngine()
+    samples = [timed(lambda: engine.search(query))[1] for query in queries]
+    engine.shutdown()
+    return summarize(samples)
+
+
+def bench_widgets(queries):
+    """
+    Mide la reconstrucción del modelo de resultados de la ventana por pulsación.
+
+    Returns:
+        dict: Resultados del caso, o el motivo por el que se omite.
+    """
+    try:
+        import gi
+        gi.require_version('Gtk', '4.0')
+        from gi.repository import GLib
+        from app_launcher import AppLauncher
+    except (ImportError, ValueError) as e:
+        return {'skipped': str(e)}
+
+    window = AppLauncher(daemon=True)
+    context = GLib.MainContext.default()
+    samples = []
+    for query in queries:
+        def run():
+            window.engine.query(query, window.show_results)
+            while context.pending():
+                context.iteration(False)
+        samples.append(timed(run)[1])
+    window.destroy()
+    return summarize(samples)
+
+
+def compare(results, baseline, threshold, metric):
+    """
+    Compara los resultados con una referencia.
+
+    Args:
+        results (dict): Resultados actuales por caso.
+        baseline (dict): Resultados de referencia por caso.
+        threshold (float): Empeoramiento relativo tolerado (0.25 = 25 %).
+        metric (str): Métrica que se compara (p. ej. 'p95_ms').
+
+    Returns:
+        list: Descripción de cada regresión.
+    """
+    regressions = []
+    for case, current in results.items():
+        reference = baseline.get(case)
+        if not reference or metric not in current or metric not in reference:
+            continue
+        limit = reference[metric] * (1 + threshold)
+        if current[metric] > limit and current[metric] - reference[metric] > MIN_DELTA_MS:
+            regressions.append(f"{case}: {metric} {current[metric]:.3f} ms > {reference[metric]:.3f} ms (+{threshold:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=2000, help="Archivos .desktop del corpus.")
+    parser.add_argument("--sequences", type=int, default=100, help="Secuencias de escritura para las búsquedas.")
+    parser.add_argument("--rounds", type=int, default=5, help="Repeticiones de los casos de carga.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--gtk", action="store_true", help="Incluir el caso de la ventana (necesita GTK).")
+    parser.add_argument("--output", help="Fichero donde guardar el JSON (por defecto, la salida estándar).")
+    parser.add_argument("--baseline", help="JSON de referencia con el que comparar.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Empeoramiento relativo tolerado.")
+    parser.add_argument("--metric", default="p95_ms", choices=("p50_ms", "p95_ms", "p99_ms", "mean_ms"))
+    args = parser.parse_args()
+
+    # Los avisos del lanzador (archivos mal formados del corpus) van a stderr para no mezclarse con el JSON
+    with tempfile.TemporaryDirectory() as root, contextlib.redirect_stdout(sys.stderr):
+        corpus = write_corpus(root, args.files, args.seed)
+        os.environ.update({key: corpus[key] for key in ('XDG_DATA_HOME', 'XDG_DATA_DIRS', 'XDG_CACHE_HOME', 'XDG_STATE_HOME')})
+        # Sin TryExec ni filtros por escritorio que dependan de la máquina
+        os.environ.pop('XDG_CURRENT_DESKTOP', None)
+        queries = keystroke_queries(corpus['names'], args.sequences, args.seed)
+
+        results = bench_catalog(corpus, queries, args.rounds)
+        results['command_loader'] = bench_command_loader(args.rounds)
+        results['query_engine'] = bench_engine(queries)
+        if args.gtk:
+            results['widget_rebuild'] = bench_widgets(queries)
+
+    report = {
+        'meta': {
+            'files': args.files,
+            'sequences': args.sequences,
+            'keystrokes': len(queries),
+            'rounds': args.rounds,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+        },
+        'results': results,
+    }
+    data = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data + '\n')
+    else:
+        print(data)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold, args.metric)
+        for regression in regressions:
+            print(f"REGRESIÓN {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"Sin regresiones respecto a {args.baseline} ({args.metric}, umbral {args.threshold:.0%})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+
+import sys
+
+from process_launcher import parse_exec
+from text_normalize import normalize_name
+
+
+def derived_fields(path, record):
+    """
+    Calcula los campos que el catálogo deriva del registro de un archivo.
+
+    Al analizar un archivo se guardan en el propio registro, y por tanto en
+    la caché, para no repetir la normalización del nombre ni la división de
+    Exec en cada arranque. Sus claves están en minúsculas, así que no
+    coinciden con ninguna clave de un archivo .desktop.
+
+    Args:
+        path (str): Ruta del archivo .desktop (para los mensajes de error).
+        record (dict): Claves leídas del grupo [Desktop Entry].
+
+    Returns:
+        dict: 'normalized' (clave e inicios de palabra del nombre) y 'argv' (plantilla de Exec o None).
+    """
+    fields = {'normalized': normalize_name(record['Name']) if 'Name' in record else None, 'argv': None}
+    if record.get('Exec'):
+        try:
+            fields['argv'] = parse_exec(record['Exec'])
+        except ValueError as e:
+            print(f"Línea Exec no válida en {path}: {e}")
+    return fields
+
+
+def _intern(value):
+    """
+    Internaliza una cadena para que los valores repetidos (iconos, categorías...) se compartan.
+    """
+    return sys.intern(value) if value else None
+
+
+# Columnas del catálogo, en el orden en que las devuelve Catalog._fields
+COLUMNS = ('names', 'execs', 'icons', 'generic_names', 'keywords', 'categories', 'desktop_ids', 'paths', 'normalized',
+           'argv_templates')
+
+
+class Catalog:
+    """
+    Catálogo de aplicaciones en columnas.
+
+    Cada campo es una lista paralela y una aplicación es un índice en todas
+    ellas, sin objetos ni closures por entrada. Las cadenas se internalizan
+    para compartir los valores repetidos entre aplicaciones. La forma
+    normalizada de cada nombre y la plantilla de Exec se toman del registro
+    (ver derived_fields) o, si no están, se calculan aquí. Los registros no
+    se modifican: pertenecen a la caché, que puede estar serializándolos.
+
+    El índice de una aplicación no cambia mientras existe: una aplicación
+    modificada se sustituye en su sitio y una eliminada deja un hueco (todas
+    sus columnas a None), de modo que el índice de búsqueda y las filas ya
+    mostradas siguen siendo válidos. El orden de presentación es la lista
+    order, que sólo contiene aplicaciones existentes.
+
+    Campos:
+        names (list): Nombre traducido.
+        execs (list): Línea Exec.
+        icons (list): Nombre o ruta del icono, o None.
+        generic_names (list): GenericName traducido, o None.
+        keywords (list): Keywords traducidas (lista separada por ';'), o None.
+        categories (list): Categories (lista separada por ';'), o None.
+        desktop_ids (list): Identificador del archivo .desktop.
+        paths (list): Ruta del archivo .desktop.
+        normalized (list): Tupla (clave normalizada, inicios de palabra) de cada nombre.
+        argv_templates (list): Línea Exec ya dividida en argumentos, o None si no es válida.
+        order (list): Índices de las aplicaciones existentes en orden de presentación.
+
+    Métodos:
+        __init__: Inicializa el catálogo vacío.
+        append: Añade una aplicación a partir de su registro.
+        replace: Sustituye en su sitio una aplicación por su nuevo registro.
+        remove: Elimina una aplicación dejando su índice libre.
+        row: Devuelve el nombre y el icono de una aplicación.
+        index_of: Devuelve el índice de una aplicación por su identificador.
+    """
+    __slots__ = COLUMNS + ('order', 'positions')
+
+    def __init__(self):
+        """
+        Inicializa el catálogo vacío.
+        """
+        self.names = []
+        self.execs = []
+        self.icons = []
+        self.generic_names = []
+        self.keywords = []
+        self.categories = []
+        self.desktop_ids = []
+        self.paths = []
+        self.normalized = []
+        self.argv_templates = []
+        self.order = []
+        # Identificador -> índice; se construye en la primera búsqueda por identificador
+        self.positions = None
+
+    def __len__(self):
+        return len(self.order)
+
+    def append(self, desktop_id, path, record):
+        """
+        Añade una aplicación a partir de su registro.
+
+        Args:
+            desktop_id (str): Identificador del archivo .desktop.
+            path (str): Ruta del archivo .desktop.
+            record (dict): Claves leídas del grupo [Desktop Entry].
+
+        Returns:
+            int: Índice de la aplicación en el catálogo (al final del orden de presentación).
+        """
+        index = len(self.names)
+        for column, value in zip(COLUMNS, self._fields(desktop_id, path, record)):
+            getattr(self, column).append(value)
+        self.order.append(index)
+        if self.positions is not None:
+            self.positions[self.desktop_ids[index]] = index
+        return index
+
+    def replace(self, index, path, record):
+        """
+        Sustituye en su sitio una aplicación por su nuevo registro, conservando su índice.
+
+        Args:
+            index (int): Índice de la aplicación.
+            path (str): Ruta del archivo .desktop que ahora define la aplicación.
+            record (dict): Claves leídas del grupo [Desktop Entry].
+        """
+        for column, value in zip(COLUMNS, self._fields(self.desktop_ids[index], path, record)):
+            getattr(self, column)[index] = value
+
+    def remove(self, index):
+        """
+        Elimina una aplicación dejando su índice libre (todas sus columnas a None).
+
+        Args:
+            index (int): Índice de la aplicación.
+        """
+        if self.positions is not None:
+            self.positions.pop(self.desktop_ids[index], None)
+        for column in COLUMNS:
+            getattr(self, column)[index] = None
+        self.order.remove(index)
+
+    def row(self, index):
+        """
+        Devuelve los datos que muestra la fila de una aplicación.
+
+        Args:
+            index (int): Índice de la aplicación.
+
+        Returns:
+            tuple: (nombre, icono).
+        """
+        return self.names[index], self.icons[index]
+
+    def index_of(self, desktop_id):
+        """
+        Devuelve el índice de una aplicación por su identificador de escritorio.
+
+        Args:
+            desktop_id (str): Identificador del archivo .desktop.
+
+        Returns:
+            int: Índice de la aplicación, o None si no está en el catálogo.
+        """
+        if self.positions is None:
+            self.positions = {desktop_id: index for index, desktop_id in enumerate(self.desktop_ids) if desktop_id is not None}
+        return self.positions.get(desktop_id)
+
+    @staticmethod
+    def _fields(desktop_id, path, record):
+        """
+        Calcula los valores de todas las columnas de una aplicación, en el orden de COLUMNS.
+        """
+        # Un Name vacío es válido (la entrada se lista sin nombre): no se convierte en None como los demás campos
+        name = sys.intern(record['Name'])
+        if 'argv' not in record:
+            record = dict(record, **derived_fields(path, record))
+        normalized, argv = record['normalized'], record['argv']
+        return (
+            name,
+            _intern(record['Exec']),
+            _intern(record.get('Icon')),
+            _intern(record.get('GenericName')),
+            _intern(record.get('Keywords')),
+            _intern(record.get('Categories')),
+            _intern(desktop_id),
+            path,
+            normalize_name(name) if normalized is None else normalized,
+            None if argv is None else tuple(argv),
+        )
@@ -0,0 +1,367 @@
+#!/usr/bin/python3
+
+import json
+import os
+import threading
+
+# Versión del formato de la caché. Incrementarla invalida las cachés antiguas.
+CACHE_VERSION = 5
+
+
+def default_cache_path():
+    """
+    Devuelve la ruta por defecto del fichero de caché del catálogo.
+
+    Returns:
+        str: Ruta bajo $XDG_CACHE_HOME/lychapp (o ~/.cache/lychapp).
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(cache_home, 'lychapp', 'catalog.json')
+
+
+class CatalogCache:
+    """
+    Caché persistente en disco de las entradas .desktop ya analizadas.
+
+    Guarda, por cada directorio, su mtime y sus subdirectorios y, por cada
+    fichero, su mtime, su tamaño y el registro analizado (las claves leídas
+    del grupo [Desktop Entry]). Los subdirectorios se recorren como
+    directorios propios, ya que su mtime es independiente. En un arranque
+    en caliente sólo se vuelve a listar un directorio cuando cambia su
+    mtime; los ficheros de los demás se comprueban con un stat cada uno,
+    porque editar un fichero en su sitio no cambia el mtime del directorio.
+    Sólo se vuelven a analizar los ficheros cuyo mtime o tamaño haya
+    cambiado; los pendientes de todos los directorios se analizan en un
+    solo lote. Los registros guardan los valores traducidos (Name[es]...),
+    así que la caché sólo vale para las variantes de locale con las que se
+    construyó; con otras se descarta entera.
+
+    Métodos:
+        __init__: Inicializa la caché con la ruta del fichero.
+        load: Devuelve los registros de los directorios, usando la caché cuando es válida.
+        update_file: Actualiza en la caché el registro de un único fichero.
+        record: Devuelve el registro cacheado de un fichero.
+        save: Escribe la caché en disco si ha cambiado.
+        flush: Espera a que termine la escritura en segundo plano.
+    """
+
+    def __init__(self, cache_path=None):
+        """
+        Inicializa la caché con la ruta del fichero.
+
+        Args:
+            cache_path (str): Ruta del fichero de caché. Si es None se usa la ruta por defecto.
+        """
+        self.cache_path = cache_path or default_cache_path()
+        self.directories = {}
+        self.locales = ()
+        self.dirty = False
+        # Escritura en segundo plano: última copia pendiente de escribir y hilo que la escribe
+        self.lock = threading.Lock()
+        self.pending_snapshot = None
+        self.writer = None
+
+    def load(self, directories, parse_entries, locales=()):
+        """
+        Devuelve los registros de los directorios, usando la caché cuando es válida.
+
+        Args:
+            directories (list): Directorios raíz con ficheros .desktop, en orden.
+            parse_entries (callable): Función que recibe una lista de rutas y
+                devuelve, en el mismo orden, el registro (diccionario de claves)
+                de cada fichero o None si está mal formado.
+            locales (tuple): Variantes de locale con las que analiza parse_entries
+                (ver desktop_entry.preferred_locales).
+
+        Returns:
+            list: Lista de tuplas (ruta, registro) en el orden de los directorios.
+        """
+        self.locales = tuple(locales)
+        cached_directories = self._read()
+        self.directories = {}
+        self.dirty = False
+        # Ficheros nuevos o modificados de todos los directorios: (ficheros del directorio, nombre, ruta, stat)
+        pending = []
+
+        for root in directories:
+            stack = [root]
+            while stack:
+                directory = stack.pop()
+                if directory in self.directories:
+                    continue
+                try:
+                    stat = os.stat(directory)
+                except OSError:
+                    if directory in cached_directories:
+                        self.dirty = True
+                    continue
+
+                previous = cached_directories.get(directory)
+                if previous is not None and previous['mtime'] == stat.st_mtime_ns:
+                    directory_entry = previous
+                    if self._check_files(directory, directory_entry['files'], pending):
+                        self.dirty = True
+                else:
+                    directory_entry = self._scan_directory(directory, stat, previous, pending)
+                    self.dirty = True
+                self.directories[directory] = directory_entry
+                stack.extend(os.path.join(directory, name) for name in reversed(directory_entry['subdirs']))
+
+        if pending:
+            records = parse_entries([path for _, _, path, _ in pending])
+            for (files, file_name, _, file_stat), record in zip(pending, records):
+                files[file_name] = self._file_entry(file_stat, record)
+
+        if set(cached_directories) - set(self.directories):
+            self.dirty = True
+        self.save()
+
+        return self.records()
+
+    def records(self):
+        """
+        Devuelve los registros válidos conocidos por la caché.
+
+        Returns:
+            list: Lista de tuplas (ruta, registro) en el orden de los directorios.
+        """
+        records = []
+        for directory, directory_entry in self.directories.items():
+            for file_name, file_entry in directory_entry['files'].items():
+                if file_entry['record'] is not None:
+                    records.append((os.path.join(directory, file_name), file_entry['record']))
+        return records
+
+    def update_file(self, path, parse_entries):
+        """
+        Actualiza en la caché el registro de un único fichero.
+
+        Args:
+            path (str): Ruta del fichero .desktop añadido, modificado o eliminado.
+            parse_entries (callable): Función de análisis de ficheros (ver load).
+
+        Returns:
+            dict: El nuevo registro, o None si el fichero ya no existe o no es válido.
+        """
+        directory, file_name = os.path.split(path)
+        directory_entry = self.directories.get(directory)
+        if directory_entry is None:
+            if not os.path.isdir(directory):
+                return None
+            # Directorio creado después del arranque; con mtime 0 se listará entero en la próxima carga
+            directory_entry = self.directories[directory] = {'mtime': 0, 'files': {}, 'subdirs': []}
+
+        # El mtime del directorio no se actualiza: otros cambios del directorio
+        # (subdirectorios nuevos, ficheros no notificados) deben verse en la próxima carga
+        self.dirty = True
+        try:
+            stat = os.stat(path)
+        except OSError:
+            directory_entry['files'].pop(file_name, None)
+            return None
+
+        record = parse_entries([path])[0]
+        directory_entry['files'][file_name] = self._file_entry(stat, record)
+        return record
+
+    def record(self, path):
+        """
+        Devuelve el registro cacheado de un fichero.
+
+        Args:
+            path (str): Ruta del fichero .desktop.
+
+        Returns:
+            dict: El registro, o None si el fichero no está en la caché o no es válido.
+        """
+        directory, file_name = os.path.split(path)
+        file_entry = self.directories.get(directory, {'files': {}})['files'].get(file_name)
+        return None if file_entry is None else file_entry['record']
+
+    def save(self, background=True):
+        """
+        Escribe la caché en disco si ha cambiado, de forma atómica.
+
+        En segundo plano, el hilo que llama sólo copia los diccionarios de
+        directorios y de ficheros (las entradas de fichero y los registros
+        nunca se modifican, se sustituyen), y la serialización y la escritura
+        se hacen en un hilo aparte. Si llegan varias escrituras mientras se
+        escribe una, sólo se escribe la última.
+
+        Args:
+            background (bool): Si es False, escribe en el hilo que llama y espera a terminar.
+        """
+        if not self.dirty:
+            return
+
+        snapshot = {
+            directory: dict(directory_entry, files=dict(directory_entry['files']))
+            for directory, directory_entry in self.directories.items()
+        }
+        self.dirty = False
+        if not background:
+            self._write(snapshot)
+            return
+
+        with self.lock:
+            self.pending_snapshot = snapshot
+            if self.writer is not None:
+                # El hilo en marcha recogerá este contenido al terminar su escritura
+                return
+            # No es un hilo demonio: al salir se espera a que la caché quede escrita
+            self.writer = threading.Thread(target=self._write_pending, name="catalog-cache-writer")
+            self.writer.start()
+
+    def flush(self):
+        """
+        Espera a que termine la escritura en segundo plano, si hay una en curso.
+        """
+        with self.lock:
+            writer = self.writer
+        if writer is not None:
+            writer.join()
+
+    def _write_pending(self):
+        """
+        Escribe la última copia pendiente hasta que no quede ninguna (hilo de escritura).
+        """
+        while True:
+            with self.lock:
+                snapshot = self.pending_snapshot
+                self.pending_snapshot = None
+                if snapshot is None:
+                    self.writer = None
+                    return
+            self._write(snapshot)
+
+    def _write(self, directories):
+        """
+        Escribe una copia de los directorios en el fichero de caché, de forma atómica.
+
+        Se serializa a una cadena antes de abrir el fichero: cuesta una
+        fracción de escribir el JSON directamente al fichero.
+        """
+        data = json.dumps({'version': CACHE_VERSION, 'locales': self.locales, 'directories': directories},
+                          ensure_ascii=False, separators=(',', ':'))
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error guardando la caché del catálogo: {e}")
+
+    def _read(self):
+        """
+        Lee la caché de disco. Una caché corrupta, de otra versión o de otro locale se descarta.
+
+        Returns:
+            dict: Directorios cacheados, o un diccionario vacío.
+        """
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION or data.get('locales') != list(self.locales):
+                return {}
+            directories = data['directories']
+            for directory_entry in directories.values():
+                if not isinstance(directory_entry['mtime'], int) or not isinstance(directory_entry['files'], dict):
+                    return {}
+                if not isinstance(directory_entry['subdirs'], list):
+                    return {}
+            return directories
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Caché del catálogo descartada: {e}")
+            return {}
+
+    def _check_files(self, directory, files, pending):
+        """
+        Comprueba con un stat los ficheros cacheados de un directorio que no ha cambiado.
+
+        Los ficheros modificados se añaden a pending y los que ya no existen
+        se eliminan de la entrada.
+
+        Args:
+            directory (str): Directorio de los ficheros.
+            files (dict): Entradas cacheadas de los ficheros, que se actualizan en su sitio.
+            pending (list): Lista donde se añaden los ficheros pendientes de análisis.
+
+        Returns:
+            bool: True si algún fichero ha cambiado.
+        """
+        changed = False
+        for file_name, cached in list(files.items()):
+            path = os.path.join(directory, file_name)
+            try:
+                file_stat = os.stat(path)
+            except OSError:
+                del files[file_name]
+                changed = True
+                continue
+            if cached['mtime'] != file_stat.st_mtime_ns or cached['size'] != file_stat.st_size:
+                pending.append((files, file_name, path, file_stat))
+                changed = True
+        return changed
+
+    def _scan_directory(self, directory, stat, previous, pending):
+        """
+        Lista un directorio y reutiliza los ficheros que no han cambiado.
+
+        Los ficheros nuevos o modificados no se analizan aquí: se añaden a
+        pending para analizarlos todos juntos.
+
+        Args:
+            directory (str): Directorio a listar.
+            stat (os.stat_result): Resultado de stat del directorio.
+            previous (dict): Entrada cacheada anterior del directorio, o None.
+            pending (list): Lista donde se añaden los ficheros pendientes de análisis.
+
+        Returns:
+            dict: Nueva entrada del directorio para la caché.
+        """
+        previous_files = previous['files'] if previous is not None else {}
+        files = {}
+        subdirs = []
+        dir_entries = []
+        try:
+            with os.scandir(directory) as it:
+                for dir_entry in it:
+                    if dir_entry.name.endswith('.desktop'):
+                        dir_entries.append(dir_entry)
+                    elif dir_entry.is_dir(follow_symlinks=False):
+                        subdirs.append(dir_entry.name)
+        except OSError as e:
+            print(f"Error listando {directory}: {e}")
+        dir_entries.sort(key=lambda e: e.name)
+
+        for dir_entry in dir_entries:
+            try:
+                file_stat = dir_entry.stat()
+            except OSError:
+                continue
+            cached = previous_files.get(dir_entry.name)
+            if cached is not None and cached['mtime'] == file_stat.st_mtime_ns and cached['size'] == file_stat.st_size:
+                files[dir_entry.name] = cached
+                continue
+            # Se reserva la posición para conservar el orden de los ficheros
+            files[dir_entry.name] = None
+            pending.append((files, dir_entry.name, dir_entry.path, file_stat))
+
+        return {'mtime': stat.st_mtime_ns, 'files': files, 'subdirs': sorted(subdirs)}
+
+    @staticmethod
+    def _file_entry(stat, record):
+        """
+        Construye la entrada de caché de un fichero.
+
+        Args:
+            stat (os.stat_result): Resultado de stat del fichero.
+            record (dict): Registro analizado, o None si no es válido.
+
+        Returns:
+            dict: Entrada con mtime, tamaño y registro.
+        """
+        return {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'record': record}
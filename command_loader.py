@@ -3,6 +3,34 @@
 import os
 from dotenv import load_dotenv
 
+# Vigencia por defecto (segundos) del recuento de actualizaciones pendientes
+DEFAULT_UPDATES_TTL = 3600
+
+
+def env_int(name, default):
+    """
+    Lee un entero no negativo de una variable de entorno.
+
+    Args:
+        name (str): Nombre de la variable.
+        default (int): Valor si la variable no existe, está vacía o no es válida.
+
+    Returns:
+        int: El valor de la variable, o default.
+    """
+    value = (os.getenv(name) or "").strip()
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        print(f"Valor no válido en {name}: '{value}'; se usa {default}")
+        return default
+    return number
+
+
 class CommandLoader:
     """
     Carga y gestiona los comandos desde el archivo .env.
@@ -20,6 +48,7 @@ class CommandLoader:
         load_dotenv()
         self.sys_command_prefix = os.getenv("SYS_COMMAND")
         self.con_command_prefix = os.getenv("CON_COMMAND")
+        self.run_command_prefix = os.getenv("RUN_COMMAND", "run:")
 
         self.sys_shutdown_cmd = os.getenv("SYS_SHUTDOWN_CMD")
         self.sys_reboot_cmd = os.getenv("SYS_REBOOT_CMD")
@@ -30,6 +59,10 @@ class CommandLoader:
         self.con_audio_cmd = os.getenv("CON_AUDIO_CMD")
         self.con_update_cmd = os.getenv("CON_UPDATE_CMD")
 
+        # Recuento de actualizaciones pendientes: vigencia en segundos y backend (checkupdates, pacman, apt, dnf)
+        self.updates_ttl = env_int("UPDATES_TTL", DEFAULT_UPDATES_TTL)
+        self.updates_backend = os.getenv("UPDATES_BACKEND")
+
     def get_system_commands(self):
         """
         Devuelve una lista de comandos del sistema.
@@ -0,0 +1,344 @@
+#!/usr/bin/python3
+
+import os
+import subprocess
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from gi.repository import Gio, GLib
+
+# Estado de conectividad cacheado: dispositivo Bluetooth, red WiFi y salida de audio
+ConnectivityState = namedtuple('ConnectivityState', ['bluetooth', 'wifi', 'audio'])
+
+DISCONNECTED = "Desconectado"
+UNKNOWN = "Desconocido"
+
+BLUEZ_NAME = 'org.bluez'
+NM_NAME = 'org.freedesktop.NetworkManager'
+NM_PATH = '/org/freedesktop/NetworkManager'
+PROPERTIES_INTERFACE = 'org.freedesktop.DBus.Properties'
+OBJECT_MANAGER_INTERFACE = 'org.freedesktop.DBus.ObjectManager'
+
+# Milisegundos que se agrupan las señales antes de releer el estado
+SIGNAL_DEBOUNCE_MS = 100
+# Milisegundos máximos de espera de una llamada D-Bus
+DBUS_TIMEOUT_MS = 2000
+
+
+def is_audio_event(line):
+    """
+    Indica si una línea de "pactl subscribe" puede cambiar la salida de audio por defecto.
+
+    Cuentan los cambios del servidor (sink por defecto) y de los propios
+    sinks; se ignoran los flujos (sink-input), las fuentes y los clientes.
+
+    Args:
+        line (str): Línea de eventos, p. ej. "Event 'change' on sink #53".
+
+    Returns:
+        bool: True si hay que releer la salida de audio.
+    """
+    return " on server" in line or " on sink #" in line
+
+
+def sink_description(default_sink, sinks_output):
+    """
+    Busca la descripción del sink por defecto en la salida de "pactl list sinks".
+
+    Args:
+        default_sink (str): Nombre del sink por defecto ("pactl get-default-sink").
+        sinks_output (str): Salida de "pactl list sinks" con LC_ALL=C.
+
+    Returns:
+        str: Descripción del sink, o None si no aparece.
+    """
+    for sink in sinks_output.split('\n\n'):
+        if default_sink in sink:
+            for line in sink.split('\n'):
+                if 'Description:' in line:
+                    return line.split('Description:')[1].strip()
+    return None
+
+
+class ConnectivityService:
+    """
+    Mantiene en caché el estado de Bluetooth, WiFi y audio a partir de eventos.
+
+    Se suscribe una sola vez a las señales D-Bus de BlueZ y NetworkManager en
+    el bus del sistema y a los eventos de PulseAudio/PipeWire con un único
+    proceso "pactl subscribe" (PipeWire no publica los sinks por D-Bus). Al
+    llegar un evento se relee sólo la fuente afectada en un hilo de trabajo y
+    el nuevo estado se publica en el hilo principal. Las consultas de estado
+    sólo leen la caché.
+
+    El bus se puede sustituir por una dirección concreta para probar el
+    servicio contra un dbus-daemon privado con servicios simulados.
+
+    Métodos:
+        __init__: Inicializa el servicio.
+        start: Se suscribe a los eventos y lee el estado inicial.
+        stop: Cancela las suscripciones.
+        add_listener: Registra una función que recibe cada nuevo estado.
+        refresh_bluetooth: Lee el dispositivo Bluetooth conectado.
+        refresh_wifi: Lee la red WiFi activa.
+        refresh_audio: Lee la salida de audio por defecto.
+    """
+
+    def __init__(self, system_bus_address=None, pulse_server=None, dispatch=GLib.idle_add):
+        """
+        Inicializa el servicio.
+
+        Args:
+            system_bus_address (str): Dirección del bus usado para BlueZ y NetworkManager, o None para el bus del sistema.
+            pulse_server (str): Servidor de PulseAudio/PipeWire para pactl, o None para el de la sesión.
+            dispatch (callable): Función que ejecuta una llamada en el hilo principal (GLib.idle_add por defecto).
+        """
+        self.system_bus_address = system_bus_address
+        self.pulse_server = pulse_server
+        self.dispatch = dispatch
+        self.state = ConnectivityState(UNKNOWN, UNKNOWN, UNKNOWN)
+        self.listeners = []
+        self.system_bus = None
+        self.subscriptions = []
+        self.audio_monitor = None
+        self.audio_process = None
+        self.pending = set()
+        self.flush_source = 0
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lychapp-connectivity")
+
+    def start(self):
+        """
+        Se suscribe a los eventos y lee el estado inicial.
+        """
+        try:
+            if self.system_bus_address:
+                self.system_bus = Gio.DBusConnection.new_for_address_sync(
+                    self.system_bus_address,
+                    Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT | Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+                    None, None)
+            else:
+                self.system_bus = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+        except GLib.Error as e:
+            print(f"Error conectando con el bus del sistema: {e.message}")
+            self.system_bus = None
+
+        if self.system_bus is not None:
+            subscriptions = [
+                (BLUEZ_NAME, PROPERTIES_INTERFACE, 'PropertiesChanged', None, 'bluetooth'),
+                (BLUEZ_NAME, OBJECT_MANAGER_INTERFACE, 'InterfacesRemoved', None, 'bluetooth'),
+                (NM_NAME, PROPERTIES_INTERFACE, 'PropertiesChanged', NM_PATH, 'wifi'),
+                ('org.freedesktop.DBus', 'org.freedesktop.DBus', 'NameOwnerChanged', None, None),
+            ]
+            for sender, interface, member, path, source in subscriptions:
+                self.subscriptions.append(self.system_bus.signal_subscribe(
+                    sender, interface, member, path, None, Gio.DBusSignalFlags.NONE,
+                    self.on_dbus_signal, source))
+
+        self.audio_monitor = threading.Thread(target=self.monitor_audio, name="lychapp-audio-monitor", daemon=True)
+        self.audio_monitor.start()
+
+        self.schedule_refresh('bluetooth', 'wifi', 'audio')
+
+    def stop(self):
+        """
+        Cancela las suscripciones y el proceso de eventos de audio.
+        """
+        if self.system_bus is not None:
+            for subscription in self.subscriptions:
+                self.system_bus.signal_unsubscribe(subscription)
+        self.subscriptions = []
+        if self.flush_source:
+            GLib.source_remove(self.flush_source)
+            self.flush_source = 0
+        if self.audio_process is not None:
+            self.audio_process.terminate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def add_listener(self, listener):
+        """
+        Registra una función que recibe cada nuevo estado en el hilo principal.
+
+        Args:
+            listener (callable): Función que recibe un ConnectivityState.
+        """
+        self.listeners.append(listener)
+
+    def on_dbus_signal(self, connection, sender, path, interface, member, parameters, source):
+        """
+        Programa la relectura de la fuente afectada por una señal D-Bus.
+        """
+        if member == 'NameOwnerChanged':
+            # BlueZ o NetworkManager se han (re)iniciado o detenido
+            name = parameters.unpack()[0]
+            source = {BLUEZ_NAME: 'bluetooth', NM_NAME: 'wifi'}.get(name)
+            if source is None:
+                return
+        self.schedule_refresh(source)
+
+    def schedule_refresh(self, *sources):
+        """
+        Agrupa las fuentes a releer y programa una única relectura.
+
+        Args:
+            sources (str): Fuentes afectadas ('bluetooth', 'wifi' o 'audio').
+        """
+        self.pending.update(sources)
+        if not self.flush_source:
+            self.flush_source = GLib.timeout_add(SIGNAL_DEBOUNCE_MS, self.flush_pending)
+        return False
+
+    def flush_pending(self):
+        """
+        Lanza en el hilo de trabajo la relectura de las fuentes pendientes.
+        """
+        self.flush_source = 0
+        sources, self.pending = self.pending, set()
+        try:
+            self.executor.submit(self.refresh_sources, sources)
+        except RuntimeError:
+            # El servicio se ha detenido
+            pass
+        return False
+
+    def refresh_sources(self, sources):
+        """
+        Relee las fuentes indicadas (en el hilo de trabajo) y publica el estado.
+
+        Args:
+            sources (set): Fuentes a releer.
+        """
+        values = {}
+        if 'bluetooth' in sources:
+            values['bluetooth'] = self.refresh_bluetooth()
+        if 'wifi' in sources:
+            values['wifi'] = self.refresh_wifi()
+        if 'audio' in sources:
+            values['audio'] = self.refresh_audio()
+        self.dispatch(self.publish, values)
+
+    def publish(self, values):
+        """
+        Aplica los valores releídos al estado y avisa a los oyentes (en el hilo principal).
+
+        Args:
+            values (dict): Nuevos valores por campo de ConnectivityState.
+        """
+        state = self.state._replace(**values)
+        if state != self.state:
+            self.state = state
+            for listener in self.listeners:
+                listener(state)
+        return False
+
+    def refresh_bluetooth(self):
+        """
+        Lee el dispositivo Bluetooth conectado a través de BlueZ.
+
+        Returns:
+            str: Nombre del dispositivo conectado, 'Desconectado' o 'Desconocido'.
+        """
+        if self.system_bus is None:
+            return UNKNOWN
+        try:
+            result = self.system_bus.call_sync(
+                BLUEZ_NAME, '/', OBJECT_MANAGER_INTERFACE, 'GetManagedObjects', None,
+                GLib.VariantType.new('(a{oa{sa{sv}}})'), Gio.DBusCallFlags.NONE, DBUS_TIMEOUT_MS, None)
+        except GLib.Error as e:
+            print(f"Error obteniendo el estado de Bluetooth: {e.message}")
+            return UNKNOWN
+
+        for interfaces in result.unpack()[0].values():
+            device = interfaces.get('org.bluez.Device1')
+            if device and device.get('Connected'):
+                return device.get('Alias') or device.get('Name') or device.get('Address', UNKNOWN)
+        return DISCONNECTED
+
+    def refresh_wifi(self):
+        """
+        Lee la red WiFi activa a través de NetworkManager.
+
+        Returns:
+            str: Nombre de la red WiFi conectada, 'Desconectado' o 'Desconocido'.
+        """
+        if self.system_bus is None:
+            return UNKNOWN
+        try:
+            active_connections = self._get_property(NM_PATH, NM_NAME, 'ActiveConnections')
+            for connection_path in active_connections:
+                properties = self.system_bus.call_sync(
+                    NM_NAME, connection_path, PROPERTIES_INTERFACE, 'GetAll',
+                    GLib.Variant('(s)', ('org.freedesktop.NetworkManager.Connection.Active',)),
+                    GLib.VariantType.new('(a{sv})'), Gio.DBusCallFlags.NONE, DBUS_TIMEOUT_MS, None).unpack()[0]
+                if properties.get('Type') == '802-11-wireless':
+                    return properties.get('Id', UNKNOWN)
+        except GLib.Error as e:
+            print(f"Error obteniendo el estado de WiFi: {e.message}")
+            return UNKNOWN
+        return DISCONNECTED
+
+    def refresh_audio(self):
+        """
+        Lee la descripción de la salida de audio por defecto.
+
+        Returns:
+            str: Nombre de la salida de audio activa o un mensaje de error.
+        """
+        try:
+            env = self._pactl_env()
+            # Obtener el nombre del sink por defecto
+            default_sink = subprocess.check_output(['pactl', 'get-default-sink'], text=True, env=env, timeout=5).strip()
+
+            # Listar todos los sinks y buscar el bloque del sink por defecto
+            sinks_output = subprocess.check_output(['pactl', 'list', 'sinks'], text=True, env=env, timeout=5)
+            return sink_description(default_sink, sinks_output) or "Descripción no encontrada"
+        except FileNotFoundError:
+            return UNKNOWN
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            return f"Error al ejecutar el comando: {e}"
+        except Exception as e:
+            return f"Error: {e}"
+
+    def monitor_audio(self, lines=None):
+        """
+        Sigue los eventos de PulseAudio/PipeWire con un único "pactl subscribe" (en un hilo propio).
+
+        Args:
+            lines (iterable): Líneas de eventos ya leídas, o None para lanzar "pactl subscribe".
+        """
+        if lines is None:
+            try:
+                self.audio_process = subprocess.Popen(['pactl', 'subscribe'], stdout=subprocess.PIPE,
+                                                      stderr=subprocess.DEVNULL, text=True, env=self._pactl_env())
+            except OSError as e:
+                print(f"Error siguiendo los eventos de audio: {e}")
+                return
+            lines = self.audio_process.stdout
+
+        for line in lines:
+            if is_audio_event(line):
+                self.dispatch(self.schedule_refresh, 'audio')
+
+    def _get_property(self, path, interface, name):
+        """
+        Lee una propiedad D-Bus de NetworkManager.
+
+        Returns:
+            object: Valor de la propiedad.
+        """
+        result = self.system_bus.call_sync(
+            NM_NAME, path, PROPERTIES_INTERFACE, 'Get', GLib.Variant('(ss)', (interface, name)),
+            GLib.VariantType.new('(v)'), Gio.DBusCallFlags.NONE, DBUS_TIMEOUT_MS, None)
+        return result.unpack()[0]
+
+    def _pactl_env(self):
+        """
+        Entorno para pactl: salida sin traducir y, si se indica, el servidor de audio.
+
+        Returns:
+            dict: Variables de entorno.
+        """
+        env = dict(os.environ, LC_ALL='C')
+        if self.pulse_server:
+            env['PULSE_SERVER'] = self.pulse_server
+        return env
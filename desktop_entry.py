@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Grupo principal de un archivo .desktop
+MAIN_GROUP = "[Desktop Entry]"
+# Claves que se leen por defecto
+DEFAULT_KEYS = ("Name", "Exec", "Icon")
+# Número de archivos a partir del cual el análisis se reparte en un pool
+PARALLEL_THRESHOLD = 256
+# Archivos que procesa cada tarea del pool
+CHUNK_SIZE = 64
+
+# Secuencias de escape de los valores (especificación Desktop Entry, "Possible value types")
+ESCAPES = {'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}
+
+
+def preferred_locales(environ=None):
+    """
+    Devuelve las variantes de locale aceptables, de más a menos específica.
+
+    Sigue el orden de la especificación: lang_COUNTRY@MODIFIER,
+    lang_COUNTRY, lang@MODIFIER y lang.
+
+    Args:
+        environ (dict): Variables de entorno, o None para os.environ.
+
+    Returns:
+        tuple: Variantes de locale, p. ej. ('es_ES', 'es') para LANG=es_ES.UTF-8.
+    """
+    environ = os.environ if environ is None else environ
+    value = environ.get('LC_ALL') or environ.get('LC_MESSAGES') or environ.get('LANG') or ''
+    if value in ('', 'C', 'POSIX') or value.startswith('C.'):
+        return ()
+
+    value, _, modifier = value.partition('@')
+    value = value.partition('.')[0]
+    lang, _, country = value.partition('_')
+
+    locales = []
+    if country and modifier:
+        locales.append(f"{lang}_{country}@{modifier}")
+    if country:
+        locales.append(f"{lang}_{country}")
+    if modifier:
+        locales.append(f"{lang}@{modifier}")
+    locales.append(lang)
+    return tuple(locales)
+
+
+def unescape(value):
+    """
+    Resuelve las secuencias de escape de un valor.
+
+    Args:
+        value (str): Valor tal y como aparece en el archivo.
+
+    Returns:
+        str: Valor con los escapes resueltos. Las secuencias desconocidas
+        (como \\; en las listas) se conservan.
+    """
+    if '\\' not in value:
+        return value
+
+    chars = []
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char == '\\' and i + 1 < len(value) and value[i + 1] in ESCAPES:
+            chars.append(ESCAPES[value[i + 1]])
+            i += 2
+            continue
+        chars.append(char)
+        i += 1
+    return ''.join(chars)
+
+
+def parse_desktop_entry(path, locales=(), keys=DEFAULT_KEYS):
+    """
+    Lee las claves pedidas del grupo [Desktop Entry] de un archivo .desktop.
+
+    Lee el archivo línea a línea y se detiene al llegar al siguiente grupo,
+    de modo que las secciones [Desktop Action ...] no se llegan a procesar.
+    De cada clave traducible se queda con la variante de locale más
+    específica disponible. Nunca lanza excepciones: los archivos ilegibles o
+    mal formados se notifican en el segundo elemento del resultado.
+
+    Args:
+        path (str): Ruta del archivo .desktop.
+        locales (tuple): Variantes de locale aceptables, de más a menos específica.
+        keys (tuple): Claves a leer.
+
+    Returns:
+        tuple: (diccionario clave -> valor, None) o (None, descripción del error).
+    """
+    wanted = set(keys)
+    values = {}
+    # Rango de la variante elegida por clave: menor es mejor, len(locales) es la clave sin traducir
+    ranks = {}
+    unlocalized_rank = len(locales)
+    in_main_group = False
+
+    try:
+        with open(path, 'rb') as f:
+            for line_number, raw_line in enumerate(f, 1):
+                try:
+                    line = raw_line.decode('utf-8').strip()
+                except UnicodeDecodeError:
+                    return None, f"línea {line_number}: no es UTF-8"
+
+                if not line or line.startswith('#'):
+                    continue
+
+                if line.startswith('['):
+                    if in_main_group:
+                        # Fin del grupo principal: el resto del archivo no interesa
+                        break
+                    if line == MAIN_GROUP:
+                        in_main_group = True
+                        continue
+                    return None, f"línea {line_number}: el primer grupo no es {MAIN_GROUP}"
+
+                if not in_main_group:
+                    return None, f"línea {line_number}: clave fuera de grupo"
+
+                key, separator, value = line.partition('=')
+                if not separator:
+                    return None, f"línea {line_number}: falta '='"
+                key = key.rstrip()
+
+                locale = None
+                if key.endswith(']'):
+                    key, _, locale = key[:-1].partition('[')
+
+                if key not in wanted:
+                    continue
+
+                if locale is None:
+                    rank = unlocalized_rank
+                elif locale in locales:
+                    rank = locales.index(locale)
+                else:
+                    continue
+
+                if rank < ranks.get(key, unlocalized_rank + 1):
+                    ranks[key] = rank
+                    values[key] = unescape(value.lstrip())
+    except OSError as e:
+        return None, str(e)
+
+    if not in_main_group:
+        return None, f"no contiene el grupo {MAIN_GROUP}"
+    return values, None
+
+
+def parse_desktop_entries(paths, locales=(), keys=DEFAULT_KEYS, workers=None, executor_class=ThreadPoolExecutor):
+    """
+    Analiza muchos archivos .desktop, repartiéndolos en un pool si son bastantes.
+
+    En un escaneo en frío la mayor parte del tiempo se va en leer los
+    archivos de disco, así que por defecto se usa un pool de hilos. Se puede
+    pasar ProcessPoolExecutor cuando el análisis domina.
+
+    Args:
+        paths (list): Rutas de los archivos.
+        locales (tuple): Variantes de locale aceptables.
+        keys (tuple): Claves a leer.
+        workers (int): Número de trabajadores, o None para el valor por defecto del pool.
+        executor_class (type): Clase del pool (ThreadPoolExecutor o ProcessPoolExecutor).
+
+    Returns:
+        list: Resultados de parse_desktop_entry en el mismo orden que paths.
+    """
+    if len(paths) < PARALLEL_THRESHOLD:
+        return [parse_desktop_entry(path, locales, keys) for path in paths]
+
+    chunks = [paths[i:i + CHUNK_SIZE] for i in range(0, len(paths), CHUNK_SIZE)]
+    with executor_class(max_workers=workers) as executor:
+        results = executor.map(_parse_chunk, chunks, [locales] * len(chunks), [keys] * len(chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+
+def _parse_chunk(paths, locales, keys):
+    """
+    Analiza un bloque de archivos (tarea del pool; a nivel de módulo para poder usarse entre procesos).
+    """
+    return [parse_desktop_entry(path, locales, keys) for path in paths]
+
+
+def parse_boolean(value):
+    """
+    Interpreta un valor booleano de la especificación.
+
+    Args:
+        value (str): Valor leído, o None si la clave no existe.
+
+    Returns:
+        bool: True sólo si el valor es "true".
+    """
+    return value == 'true'
+
+
+def parse_list(value):
+    """
+    Divide un valor de tipo lista (separado por ';', con '\\;' como escape).
+
+    Args:
+        value (str): Valor leído, o None si la clave no existe.
+
+    Returns:
+        list: Elementos no vacíos de la lista.
+    """
+    if not value:
+        return []
+    if '\\;' not in value:
+        return [item for item in value.split(';') if item]
+
+    items = []
+    current = []
+    i = 0
+    while i < len(value):
+        if value.startswith('\\;', i):
+            current.append(';')
+            i += 2
+            continue
+        if value[i] == ';':
+            items.append(''.join(current))
+            current = []
+        else:
+            current.append(value[i])
+        i += 1
+    items.append(''.join(current))
+    return [item for item in items if item]
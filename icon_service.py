@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+gi.require_version('Gtk', '4.0')
+gi.require_version('GdkPixbuf', '2.0')
+from gi.repository import Gdk, GdkPixbuf, GLib, Gtk
+
+# Tamaño de los iconos de la lista de resultados
+ICON_SIZE = 32
+# Icono usado cuando una entrada no declara ninguno o no se puede cargar
+DEFAULT_ICON = "application-x-executable"
+# Memoria máxima estimada de las texturas en caché
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# Iconos que se resuelven en cada iteración ociosa del precalentamiento
+PREWARM_BATCH = 8
+
+
+class IconService:
+    """
+    Resuelve y cachea los iconos de la lista de resultados.
+
+    Los nombres de icono se resuelven una sola vez contra el tema. Los iconos
+    que son rutas absolutas (PNG/SVG grandes en Icon=) se decodifican al
+    tamaño de la fila en un pool de hilos, nunca en el hilo principal. Los
+    resultados se guardan en una caché LRU acotada por memoria, de modo que
+    las filas enlazan paintables ya cargados en lugar de volver a leerlos.
+
+    Métodos:
+        __init__: Inicializa el servicio para una pantalla.
+        lookup: Devuelve el paintable de un icono, o None si se está cargando.
+        prewarm: Carga en los ratos ociosos los iconos que probablemente se verán.
+        clear: Vacía la caché.
+    """
+
+    def __init__(self, display=None, size=ICON_SIZE, max_bytes=DEFAULT_MAX_BYTES, workers=2):
+        """
+        Inicializa el servicio para una pantalla.
+
+        Args:
+            display (Gdk.Display): Pantalla cuyo tema de iconos se usa, o None para la predeterminada.
+            size (int): Tamaño por defecto de los iconos en píxeles.
+            max_bytes (int): Memoria máxima estimada de la caché.
+            workers (int): Hilos de decodificación.
+        """
+        self.size = size
+        self.max_bytes = max_bytes
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        self.waiting = {}
+        self.prewarm_queue = []
+        self.prewarm_source = 0
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lychapp-icons")
+
+        self.theme = Gtk.IconTheme.get_for_display(display or Gdk.Display.get_default())
+        self.theme.connect("changed", lambda theme: self.clear())
+
+    def lookup(self, icon, size=None, callback=None):
+        """
+        Devuelve el paintable de un icono, o None si se está decodificando.
+
+        Args:
+            icon (str): Nombre del icono o ruta absoluta a una imagen.
+            size (int): Tamaño en píxeles, o None para el tamaño por defecto.
+            callback (callable): Función que recibe el paintable cuando termina la decodificación.
+
+        Returns:
+            Gdk.Paintable: El icono, o None si todavía no está disponible.
+        """
+        size = size or self.size
+        key = (icon or DEFAULT_ICON, size)
+
+        paintable = self.cache.get(key)
+        if paintable is not None:
+            self.cache.move_to_end(key)
+            return paintable
+
+        if not os.path.isabs(key[0]):
+            paintable = self._lookup_themed(key[0], size)
+            self._store(key, paintable)
+            return paintable
+
+        # Imagen en disco: decodificar al tamaño pedido en el pool
+        callbacks = self.waiting.get(key)
+        if callbacks is None:
+            callbacks = self.waiting[key] = []
+            self.executor.submit(self._decode, key)
+        if callback is not None:
+            callbacks.append(callback)
+        return None
+
+    def prewarm(self, icons):
+        """
+        Carga en los ratos ociosos del bucle principal los iconos que probablemente se verán.
+
+        Args:
+            icons (iterable): Nombres o rutas de iconos, en orden de prioridad.
+        """
+        self.prewarm_queue.extend(icons)
+        if self.prewarm_queue and not self.prewarm_source:
+            self.prewarm_source = GLib.idle_add(self._prewarm_step, priority=GLib.PRIORITY_LOW)
+
+    def clear(self):
+        """
+        Vacía la caché (p. ej. al cambiar el tema de iconos).
+        """
+        self.cache.clear()
+        self.cache_bytes = 0
+
+    def _prewarm_step(self):
+        """
+        Resuelve un lote de iconos de la cola de precalentamiento.
+        """
+        batch, self.prewarm_queue = self.prewarm_queue[:PREWARM_BATCH], self.prewarm_queue[PREWARM_BATCH:]
+        for icon in batch:
+            self.lookup(icon)
+        if self.prewarm_queue:
+            return True
+        self.prewarm_source = 0
+        return False
+
+    def _lookup_themed(self, icon_name, size):
+        """
+        Resuelve un nombre de icono contra el tema.
+
+        Args:
+            icon_name (str): Nombre del icono (se admite con extensión).
+            size (int): Tamaño en píxeles.
+
+        Returns:
+            Gtk.IconPaintable: El icono del tema, o el icono por defecto si no existe.
+        """
+        for suffix in ('.png', '.svg', '.xpm'):
+            if icon_name.endswith(suffix):
+                icon_name = icon_name[:-len(suffix)]
+                break
+        if not self.theme.has_icon(icon_name):
+            icon_name = DEFAULT_ICON
+        return self.theme.lookup_icon(icon_name, None, size, 1, Gtk.TextDirection.NONE, 0)
+
+    def _decode(self, key):
+        """
+        Decodifica una imagen de disco al tamaño pedido (en un hilo del pool).
+
+        Args:
+            key (tuple): (ruta, tamaño).
+        """
+        path, size = key
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(path, size, size, True)
+            texture = Gdk.Texture.new_for_pixbuf(pixbuf)
+        except GLib.Error as e:
+            print(f"Error cargando el icono {path}: {e.message}")
+            texture = None
+        GLib.idle_add(self._deliver, key, texture)
+
+    def _deliver(self, key, texture):
+        """
+        Guarda una imagen decodificada y avisa a quienes la esperaban (en el hilo principal).
+
+        Args:
+            key (tuple): (ruta, tamaño).
+            texture (Gdk.Texture): La imagen decodificada, o None si ha fallado.
+        """
+        paintable = texture if texture is not None else self._lookup_themed(DEFAULT_ICON, key[1])
+        self._store(key, paintable)
+        for callback in self.waiting.pop(key, []):
+            callback(paintable)
+        return False
+
+    def _store(self, key, paintable):
+        """
+        Guarda un paintable en la caché, expulsando los menos usados si se supera la memoria.
+
+        Args:
+            key (tuple): (icono, tamaño).
+            paintable (Gdk.Paintable): El icono cargado.
+        """
+        if key in self.cache:
+            return
+        self.cache[key] = paintable
+        self.cache_bytes += self._estimate_bytes(paintable, key[1])
+        while self.cache_bytes > self.max_bytes and len(self.cache) > 1:
+            old_key, old_paintable = self.cache.popitem(last=False)
+            self.cache_bytes -= self._estimate_bytes(old_paintable, old_key[1])
+
+    @staticmethod
+    def _estimate_bytes(paintable, size):
+        """
+        Estima la memoria de un icono como RGBA de su tamaño.
+        """
+        width = paintable.get_intrinsic_width() or size
+        height = paintable.get_intrinsic_height() or size
+        return width * height * 4
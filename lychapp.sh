@@ -1,3 +1,3 @@
 #!/bin/bash
 cd $HOME/.config/Lychapp
-python main.py
+python main.py "$@"
@@ -1,18 +1,148 @@
 #!/usr/bin/python3
 
-import gi
-gi.require_version('Gtk', '4.0')
-from app_launcher import AppLauncher
+import time
+START = time.perf_counter()
+
+import argparse
+import contextlib
+import json
+import signal
+import sys
+
+from startup_profiler import profiler
+from tracing import tracer
+
+APPLICATION_ID = "com.warcrinux.AppLauncher"
+
+
+def parse_arguments(argv):
+    """
+    Analiza los argumentos propios de Lychapp; el resto se pasa a Gtk.Application.
+
+    Args:
+        argv (list): Argumentos de la línea de comandos.
+
+    Returns:
+        tuple: Los argumentos reconocidos y la lista de argumentos restantes.
+    """
+    parser = argparse.ArgumentParser(prog="lychapp", description="Lanzador de aplicaciones y comandos.",
+                                     epilog="Consulta sin ventana: lychapp query TEXTO [--json] [--limit N] [--launch]")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Mantener el lanzador residente y oculto; las siguientes invocaciones sólo lo muestran.")
+    parser.add_argument("--profile-startup", nargs="?", const="-", metavar="FILE",
+                        help="Medir cada fase del arranque hasta el primer fotograma y escribirla en JSON (salida estándar por defecto).")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Registrar la latencia de cada pulsación hasta el fotograma y, al salir, guardar la traza "
+                             "en formato de Chrome/Perfetto y mostrar un histograma.")
+    parser.add_argument("--watch-theme", action="store_true",
+                        help="Recargar el tema activo cada vez que se guarda su archivo .css (para editar temas).")
+    return parser.parse_known_args(argv[1:])
+
+
+def run_query(argv):
+    """
+    Orden `query`: ejecuta una consulta con el mismo motor que la ventana, sin GTK, e imprime los resultados ordenados.
+
+    Args:
+        argv (list): Argumentos tras "query".
+
+    Returns:
+        int: Código de salida (1 si no hay resultados).
+    """
+    parser = argparse.ArgumentParser(prog="lychapp query", description="Consulta el lanzador sin abrir la ventana.")
+    parser.add_argument("text", help="Texto de búsqueda, con prefijo o sin él (p. ej. \"fire\", \"sys:\", \">htop\").")
+    parser.add_argument("--json", action="store_true", help="Escribir los resultados en JSON con sus argumentos de lanzamiento.")
+    parser.add_argument("--limit", type=int, help="Número máximo de resultados (por defecto, los mismos que muestra la ventana).")
+    parser.add_argument("--launch", action="store_true", help="Activar el primer resultado, como Enter en la ventana.")
+    args = parser.parse_args(argv)
+    if args.limit is not None and args.limit < 1:
+        parser.error("--limit debe ser un número positivo")
+
+    from query_engine import QueryEngine
+
+    # Los avisos del motor (archivos .desktop mal formados...) no deben mezclarse con los resultados
+    with contextlib.redirect_stdout(sys.stderr):
+        engine = QueryEngine(limit=args.limit)
+        provider, results = engine.search(args.text)
+    results = results[:args.limit]
+
+    if args.json:
+        print(json.dumps([
+            {
+                'rank': rank,
+                'name': result.name,
+                'icon': result.icon,
+                'key': result.key,
+                'provider': type(provider).__name__,
+                'argv': provider.plan(result),
+            }
+            for rank, result in enumerate(results)
+        ], ensure_ascii=False, indent=2))
+    else:
+        # Un resultado por línea, para usarlo con dmenu, rofi o fzf
+        for result in results:
+            print(result.name)
+
+    if args.launch and results:
+        with contextlib.redirect_stdout(sys.stderr):
+            results[0].action()
+    return 0 if results else 1
 
-from gi.repository import Gtk
 
 if __name__ == "__main__":
-    app = Gtk.Application(application_id="com.warcrinux.AppLauncher")
+    if sys.argv[1:2] == ["query"]:
+        sys.exit(run_query(sys.argv[2:]))
+
+    args, gtk_args = parse_arguments(sys.argv)
+
+    import gi
+    gi.require_version('Gtk', '4.0')
+    from gi.repository import Gtk
+
+    if args.profile_startup:
+        profiler.enable(args.profile_startup, origin=START)
+        profiler.record("imports_gtk", START, time.perf_counter())
+    if args.trace:
+        tracer.enable(args.trace, origin=START)
+
+    app = Gtk.Application(application_id=APPLICATION_ID)
+    launcher = None
+
+    def trace_summary():
+        """
+        Resúmenes que acompañan a la traza (latencia de lanzamiento de procesos).
+        """
+        if launcher is None:
+            return None
+        return {'launch_latency': launcher.application_manager.process_launcher.latency_stats()}
+
+    if args.trace:
+        from gi.repository import GLib
+        # En modo residente el proceso no termina: SIGUSR1 escribe la traza hasta el momento
+        # y SIGTERM sale ordenadamente, escribiéndola
+        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGUSR1, lambda: tracer.write(trace_summary()) or GLib.SOURCE_CONTINUE)
+        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGTERM, lambda: app.quit() or GLib.SOURCE_REMOVE)
 
     def on_activate(app):
-        win = AppLauncher()
-        win.set_application(app)
-        win.present()
+        global launcher
+        if launcher is not None:
+            # Activación remota desde otra invocación: la ventana ya existe
+            launcher.show_launcher()
+            return
+
+        # Sólo la instancia principal carga la interfaz; una invocación que
+        # activa a un demonio ya en marcha termina sin importar nada más
+        with profiler.phase("imports_app"):
+            from app_launcher import AppLauncher
+
+        launcher = AppLauncher(daemon=args.daemon, watch_theme=args.watch_theme)
+        launcher.set_application(app)
+        if args.daemon:
+            # La ventana se construye oculta y la aplicación no termina al ocultarla
+            app.hold()
+        else:
+            launcher.present()
 
     app.connect("activate", on_activate)
-    app.run(None)
+    app.run([sys.argv[0]] + gtk_args)
+    tracer.dump(trace_summary())
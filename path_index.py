@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+
+import bisect
+import os
+import time
+
+
+class ExecutableIndex:
+    """
+    Índice en memoria de los ejecutables de los directorios de PATH.
+
+    Cada directorio se lista una sola vez y su contenido se conserva hasta
+    que cambia su mtime, de modo que comprobar muchos TryExec (o completar
+    nombres de comandos) cuesta un stat por directorio en lugar de una
+    búsqueda en PATH por entrada.
+
+    Métodos:
+        __init__: Inicializa el índice para un PATH.
+        refresh: Vuelve a listar los directorios de PATH que han cambiado.
+        find: Devuelve la ruta de un ejecutable, o None si no está instalado.
+        names: Devuelve los nombres de todos los ejecutables, ordenados.
+        complete: Devuelve los ejecutables cuyo nombre empieza por un prefijo.
+    """
+
+    def __init__(self, path=None):
+        """
+        Inicializa el índice para un PATH.
+
+        Args:
+            path (str): Lista de directorios separada por ':', o None para usar $PATH.
+        """
+        self.path = path
+        self.path_dirs = []
+        # Directorio -> (mtime, conjunto de nombres ejecutables)
+        self.directories = {}
+        self.sorted_names = None
+        self.refreshed_at = None
+
+    def refresh(self, max_age=0):
+        """
+        Vuelve a listar los directorios de PATH cuyo mtime ha cambiado.
+
+        Args:
+            max_age (float): Segundos durante los que se da por buena la última
+                comprobación; permite llamarlo en cada pulsación sin hacer un
+                stat por directorio cada vez.
+
+        Returns:
+            bool: True si el contenido del índice ha cambiado.
+        """
+        now = time.monotonic()
+        if self.refreshed_at is not None and now - self.refreshed_at < max_age:
+            return False
+        self.refreshed_at = now
+
+        path = self.path if self.path is not None else os.environ.get('PATH', os.defpath)
+        path_dirs = []
+        for directory in path.split(os.pathsep):
+            directory = directory or '.'
+            if directory not in path_dirs:
+                path_dirs.append(directory)
+
+        changed = path_dirs != self.path_dirs
+        directories = {}
+        for directory in path_dirs:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                changed = changed or directory in self.directories
+                continue
+            cached = self.directories.get(directory)
+            if cached is not None and cached[0] == mtime:
+                directories[directory] = cached
+            else:
+                directories[directory] = (mtime, self._list_executables(directory))
+                changed = True
+
+        self.path_dirs = path_dirs
+        self.directories = directories
+        if changed:
+            self.sorted_names = None
+        return changed
+
+    def find(self, name):
+        """
+        Devuelve la ruta de un ejecutable, como shutil.which pero sobre el índice.
+
+        Args:
+            name (str): Nombre del ejecutable o ruta absoluta.
+
+        Returns:
+            str: Ruta del ejecutable, o None si no está instalado.
+        """
+        if os.sep in name:
+            return name if os.path.isfile(name) and os.access(name, os.X_OK) else None
+
+        for directory in self.path_dirs:
+            cached = self.directories.get(directory)
+            if cached is not None and name in cached[1]:
+                return os.path.join(directory, name)
+        return None
+
+    def names(self):
+        """
+        Devuelve los nombres de todos los ejecutables del índice, ordenados y sin duplicados.
+
+        Returns:
+            list: Nombres de ejecutables.
+        """
+        if self.sorted_names is None:
+            names = set()
+            for _, directory_names in self.directories.values():
+                names.update(directory_names)
+            self.sorted_names = sorted(names)
+        return self.sorted_names
+
+    def complete(self, prefix, limit=None):
+        """
+        Devuelve los ejecutables cuyo nombre empieza por un prefijo, por búsqueda binaria.
+
+        Args:
+            prefix (str): Prefijo del nombre.
+            limit (int): Número máximo de nombres, o None para no limitar.
+
+        Returns:
+            list: Nombres ordenados.
+        """
+        names = self.names()
+        start = bisect.bisect_left(names, prefix)
+        end = bisect.bisect_left(names, prefix + '\U0010ffff', start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return names[start:end]
+
+    @staticmethod
+    def _list_executables(directory):
+        """
+        Lista los ficheros ejecutables de un directorio.
+
+        Args:
+            directory (str): Directorio a listar.
+
+        Returns:
+            frozenset: Nombres de los ejecutables.
+        """
+        names = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file() and os.access(entry.path, os.X_OK):
+                            names.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Error listando {directory}: {e}")
+        return frozenset(names)
@@ -0,0 +1,302 @@
+#!/usr/bin/python3
+
+import os
+import select
+import shlex
+import subprocess
+import threading
+import time
+from collections import deque
+
+from tracing import tracer
+
+# Caracteres que se pueden escapar con '\' dentro de un argumento entre comillas
+QUOTED_ESCAPES = set('"`$\\')
+# Latencias de lanzamiento que se conservan
+LATENCY_SAMPLES = 100
+# Intervalo de comprobación de los hijos cuando no hay pidfd (ms)
+POLL_INTERVAL_MS = 1000
+
+
+def parse_exec(exec_line):
+    """
+    Divide una línea Exec en argumentos según las reglas de comillas de la especificación.
+
+    Los argumentos entre comillas dobles admiten los escapes \\", \\`, \\$ y
+    \\\\. Los códigos de campo se conservan para expandirlos al lanzar.
+
+    Args:
+        exec_line (str): Valor de la clave Exec (con los escapes generales ya resueltos).
+
+    Returns:
+        tuple: Plantilla de argumentos.
+
+    Raises:
+        ValueError: Si hay comillas sin cerrar o la línea está vacía.
+    """
+    args = []
+    current = []
+    in_argument = False
+    quoted = False
+    i = 0
+    while i < len(exec_line):
+        char = exec_line[i]
+        if quoted:
+            if char == '\\' and i + 1 < len(exec_line) and exec_line[i + 1] in QUOTED_ESCAPES:
+                current.append(exec_line[i + 1])
+                i += 2
+                continue
+            if char == '"':
+                quoted = False
+            else:
+                current.append(char)
+        elif char == '"':
+            quoted = True
+            in_argument = True
+        elif char in ' \t\n':
+            if in_argument:
+                args.append(''.join(current))
+                current = []
+                in_argument = False
+        else:
+            current.append(char)
+            in_argument = True
+        i += 1
+
+    if quoted:
+        raise ValueError("comillas sin cerrar")
+    if in_argument:
+        args.append(''.join(current))
+    if not args:
+        raise ValueError("línea Exec vacía")
+    return tuple(args)
+
+
+def expand_field_codes(template, name=None, icon=None, desktop_file=None, files=()):
+    """
+    Expande los códigos de campo de una plantilla de argumentos.
+
+    %f/%u toman el primer archivo y %F/%U todos (como argumento
+    independiente); sin archivos desaparecen. %i se sustituye por
+    "--icon <icono>", %c por el nombre y %k por la ruta del archivo .desktop.
+    Los códigos obsoletos y desconocidos se eliminan.
+
+    Args:
+        template (tuple): Plantilla devuelta por parse_exec.
+        name (str): Nombre traducido de la aplicación.
+        icon (str): Valor de la clave Icon.
+        desktop_file (str): Ruta del archivo .desktop.
+        files (list): Archivos o URLs con los que se abre la aplicación.
+
+    Returns:
+        list: Argumentos listos para ejecutar.
+    """
+    argv = []
+    for arg in template:
+        if '%' not in arg:
+            argv.append(arg)
+            continue
+
+        if arg in ('%F', '%U'):
+            argv.extend(files)
+            continue
+        if arg == '%i':
+            if icon:
+                argv.extend(('--icon', icon))
+            continue
+
+        chars = []
+        i = 0
+        while i < len(arg):
+            char = arg[i]
+            if char != '%' or i + 1 >= len(arg):
+                chars.append(char)
+                i += 1
+                continue
+            code = arg[i + 1]
+            if code == '%':
+                chars.append('%')
+            elif code in 'fu':
+                chars.append(files[0] if files else '')
+            elif code == 'c':
+                chars.append(name or '')
+            elif code == 'k':
+                chars.append(desktop_file or '')
+            # %F, %U y %i sólo son válidos como argumento completo; los obsoletos y desconocidos se descartan
+            i += 2
+        expanded = ''.join(chars)
+        if expanded:
+            argv.append(expanded)
+    return argv
+
+
+class ProcessLauncher:
+    """
+    Lanza procesos desligados del lanzador y recoge sus estados de salida.
+
+    Cada hijo se inicia en una sesión nueva, sin heredar descriptores, para
+    que sobreviva al lanzador y no reciba sus señales de terminal. Un hilo
+    espera a los hijos (con pidfd cuando el sistema lo permite) para que no
+    queden procesos zombi mientras el lanzador sigue residente. Se guarda la
+    latencia de cada lanzamiento.
+
+    Métodos:
+        __init__: Inicializa el lanzador.
+        launch: Lanza una lista de argumentos.
+        launch_command: Lanza una línea de comandos con las reglas del shell.
+        latency_stats: Devuelve estadísticas de la latencia de lanzamiento.
+        running: Devuelve el número de hijos que aún no han terminado.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el lanzador. El hilo de recogida se crea con el primer lanzamiento.
+        """
+        self.lock = threading.Lock()
+        # pid -> (Popen, pidfd o None)
+        self.children = {}
+        self.pending = []
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.reaper = None
+        self.wake_read, self.wake_write = None, None
+        self.use_pidfd = hasattr(os, 'pidfd_open')
+
+    def launch(self, argv, label=None):
+        """
+        Lanza una lista de argumentos sin bloquear.
+
+        Args:
+            argv (list): Programa y argumentos.
+            label (str): Nombre que se muestra en los mensajes, o None para usar argv.
+
+        Returns:
+            int: PID del proceso, o None si no se ha podido lanzar.
+        """
+        label = label or ' '.join(argv)
+        start = time.perf_counter()
+        try:
+            process = subprocess.Popen(argv, stdin=subprocess.DEVNULL, start_new_session=True, close_fds=True)
+        except (OSError, ValueError) as e:
+            print(f"Error lanzando {label}: {e}")
+            return None
+        end = time.perf_counter()
+        latency_ms = (end - start) * 1000
+        self.latencies.append(latency_ms)
+        tracer.record("spawn", start, end)
+        tracer.count("subprocesses_spawned")
+        print(f"Lanzando {label} (pid {process.pid}, {latency_ms:.1f} ms)")
+
+        self._watch(process)
+        return process.pid
+
+    def launch_command(self, command_line):
+        """
+        Lanza una línea de comandos separando los argumentos con las reglas del shell (sin shell).
+
+        Args:
+            command_line (str): La línea de comandos, o None si el comando no está configurado.
+
+        Returns:
+            int: PID del proceso, o None si no se ha podido lanzar.
+        """
+        # shlex.split(None) leería la entrada estándar
+        if not command_line:
+            print("No hay ningún comando que lanzar")
+            return None
+        try:
+            argv = shlex.split(command_line)
+        except ValueError as e:
+            print(f"Error lanzando {command_line}: {e}")
+            return None
+        if not argv:
+            return None
+        return self.launch(argv, command_line)
+
+    def latency_stats(self):
+        """
+        Devuelve estadísticas de la latencia de los últimos lanzamientos.
+
+        Returns:
+            dict: Número de muestras, última, mediana y máxima en milisegundos.
+        """
+        samples = sorted(self.latencies)
+        if not samples:
+            return {'count': 0, 'last_ms': None, 'p50_ms': None, 'max_ms': None}
+        return {
+            'count': len(samples),
+            'last_ms': round(self.latencies[-1], 3),
+            'p50_ms': round(samples[len(samples) // 2], 3),
+            'max_ms': round(samples[-1], 3),
+        }
+
+    def running(self):
+        """
+        Devuelve el número de hijos que aún no se han recogido.
+        """
+        with self.lock:
+            return len(self.children) + len(self.pending)
+
+    def _watch(self, process):
+        """
+        Entrega un hijo al hilo de recogida, creándolo si hace falta.
+        """
+        with self.lock:
+            self.pending.append(process)
+            if self.reaper is None:
+                self.wake_read, self.wake_write = os.pipe()
+                self.reaper = threading.Thread(target=self._reap_loop, name="lychapp-reaper", daemon=True)
+                self.reaper.start()
+        os.write(self.wake_write, b'\0')
+
+    def _reap_loop(self):
+        """
+        Espera a que terminen los hijos y los recoge (en el hilo de recogida).
+        """
+        poller = select.poll()
+        poller.register(self.wake_read, select.POLLIN)
+        fds = {}
+        while True:
+            timeout = None if self.use_pidfd else POLL_INTERVAL_MS
+            for fd, _ in poller.poll(timeout):
+                if fd == self.wake_read:
+                    os.read(self.wake_read, 512)
+                elif fd in fds:
+                    self._reap(fds.pop(fd))
+                    poller.unregister(fd)
+
+            with self.lock:
+                pending, self.pending = self.pending, []
+                for process in pending:
+                    pidfd = self._pidfd_open(process.pid)
+                    self.children[process.pid] = (process, pidfd)
+                    if pidfd is not None:
+                        fds[pidfd] = process.pid
+                        poller.register(pidfd, select.POLLIN)
+
+            if not self.use_pidfd:
+                for pid in [pid for pid, (process, _) in self.children.items() if process.poll() is not None]:
+                    self._reap(pid)
+
+    def _reap(self, pid):
+        """
+        Recoge el estado de salida de un hijo terminado.
+        """
+        with self.lock:
+            process, pidfd = self.children.pop(pid, (None, None))
+        if process is not None:
+            process.wait()
+        if pidfd is not None:
+            os.close(pidfd)
+
+    def _pidfd_open(self, pid):
+        """
+        Abre un pidfd para un hijo, o devuelve None si el sistema no lo permite.
+        """
+        if not self.use_pidfd:
+            return None
+        try:
+            return os.pidfd_open(pid)
+        except OSError:
+            # Núcleo sin pidfd: pasar a comprobar los hijos periódicamente
+            self.use_pidfd = False
+            return None
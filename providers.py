@@ -0,0 +1,458 @@
+#!/usr/bin/python3
+
+import shlex
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from text_normalize import normalize
+from tracing import tracer
+
+
+class Result:
+    """
+    Resultado de un proveedor: una fila de la lista y la acción que ejecuta.
+
+    Atributos:
+        name (str): Texto que se muestra en la fila.
+        icon (str): Nombre o ruta del icono, o None.
+        action (callable): Función sin argumentos que se ejecuta al activar la fila.
+        dismiss (bool): Si es True, la ventana se oculta tras ejecutar la acción.
+        key (str): Identificador estable del resultado (id de escritorio, línea de comandos, tema...), o None.
+    """
+    __slots__ = ('name', 'icon', 'action', 'dismiss', 'key')
+
+    def __init__(self, name, icon, action, dismiss=False, key=None):
+        self.name = name
+        self.icon = icon
+        self.action = action
+        self.dismiss = dismiss
+        self.key = key
+
+
+def command_argv(command_line):
+    """
+    Divide una línea de comandos con las reglas del shell.
+
+    Args:
+        command_line (str): La línea de comandos, o None.
+
+    Returns:
+        list: Argumentos, o None si la línea está vacía o tiene comillas sin cerrar.
+    """
+    # shlex.split(None) leería la entrada estándar
+    if not command_line:
+        return None
+    try:
+        return shlex.split(command_line) or None
+    except ValueError:
+        return None
+
+
+class Provider:
+    """
+    Fuente de resultados para las consultas que empiezan por alguno de sus prefijos.
+
+    query() es un generador: cada lote que produce se muestra en cuanto
+    está listo, de modo que un proveedor lento puede ir entregando
+    resultados poco a poco. Los proveedores asíncronos se ejecutan en un
+    hilo del registro; los síncronos, directamente en el hilo principal.
+
+    Atributos:
+        prefixes (tuple): Prefijos que seleccionan el proveedor (sin distinguir mayúsculas).
+        asynchronous (bool): Si es True, query() se ejecuta fuera del hilo principal.
+        activate_first (bool): Si es True, Enter activa la primera fila aunque haya varias.
+
+    Métodos:
+        query: Genera los lotes de resultados de una consulta.
+        plan: Devuelve los argumentos que ejecutaría un resultado.
+    """
+    prefixes = ()
+    asynchronous = False
+    activate_first = False
+
+    def query(self, text):
+        """
+        Genera los lotes de resultados de una consulta.
+
+        Args:
+            text (str): Texto de la consulta sin el prefijo.
+
+        Yields:
+            list: Lotes de objetos Result.
+        """
+        return iter(())
+
+    def plan(self, result):
+        """
+        Devuelve los argumentos del proceso que lanzaría un resultado, sin lanzarlo.
+
+        Args:
+            result (Result): Resultado de este proveedor.
+
+        Returns:
+            list: Argumentos, o None si la acción no lanza ningún proceso.
+        """
+        return None
+
+
+class ProviderRegistry:
+    """
+    Selecciona el proveedor de cada consulta por su prefijo y entrega sus resultados.
+
+    Cada consulta recibe un número de generación. Al empezar una consulta
+    nueva la anterior queda cancelada: su generador deja de avanzar en el
+    siguiente lote y los lotes que ya estuvieran de camino se descartan,
+    así que un resultado antiguo nunca sustituye a uno reciente.
+
+    Métodos:
+        __init__: Inicializa el registro.
+        register: Añade un proveedor.
+        provider_for: Devuelve el proveedor y el texto de una consulta.
+        query: Lanza una consulta y cancela la anterior.
+        refresh: Repite la última consulta.
+        cancel: Cancela la consulta en curso.
+        shutdown: Detiene los hilos de los proveedores asíncronos.
+    """
+
+    def __init__(self, dispatch, workers=2):
+        """
+        Inicializa el registro.
+
+        Args:
+            dispatch (callable): Función que ejecuta una llamada en el hilo principal (p. ej. GLib.idle_add).
+            workers (int): Hilos para los proveedores asíncronos.
+        """
+        self.dispatch = dispatch
+        self.providers = []
+        self.default = None
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lychapp-providers")
+        self.last_text = None
+        self.last_callback = None
+        self.active = None
+
+    def register(self, provider, default=False):
+        """
+        Añade un proveedor.
+
+        Args:
+            provider (Provider): El proveedor.
+            default (bool): Si es True, atiende las consultas que no empiezan por ningún prefijo.
+        """
+        self.providers.append(provider)
+        if default:
+            self.default = provider
+
+    def provider_for(self, text):
+        """
+        Devuelve el proveedor que atiende una consulta y el texto sin su prefijo.
+
+        Args:
+            text (str): Texto completo del campo de búsqueda.
+
+        Returns:
+            tuple: (proveedor o None, texto sin el prefijo).
+        """
+        lowered = text.lower()
+        best = None
+        best_prefix = ''
+        for provider in self.providers:
+            for prefix in provider.prefixes:
+                if prefix and lowered.startswith(prefix.lower()) and len(prefix) > len(best_prefix):
+                    best, best_prefix = provider, prefix
+        if best is None:
+            return self.default, text
+        return best, text[len(best_prefix):]
+
+    def query(self, text, on_results):
+        """
+        Lanza una consulta y cancela la anterior.
+
+        Args:
+            text (str): Texto completo del campo de búsqueda.
+            on_results (callable): Función que recibe (lote de resultados, reemplazar) en el hilo principal;
+                reemplazar es True en el primer lote de la consulta.
+
+        Returns:
+            Provider: El proveedor que atiende la consulta, o None.
+        """
+        with self.lock:
+            self.generation += 1
+            ticket = self.generation
+        self.last_text = text
+        self.last_callback = on_results
+
+        provider, provider_text = self.provider_for(text)
+        self.active = provider
+        if provider is None:
+            on_results([], True)
+        elif provider.asynchronous:
+            self.executor.submit(self._run, ticket, provider, provider_text, on_results, True)
+        else:
+            self._run(ticket, provider, provider_text, on_results, False)
+        return provider
+
+    def refresh(self):
+        """
+        Repite la última consulta (p. ej. cuando cambian los datos de su proveedor).
+        """
+        if self.last_callback is not None:
+            self.query(self.last_text, self.last_callback)
+
+    def cancel(self):
+        """
+        Cancela la consulta en curso.
+        """
+        with self.lock:
+            self.generation += 1
+
+    def shutdown(self):
+        """
+        Cancela la consulta en curso y detiene los hilos de los proveedores asíncronos.
+        """
+        self.cancel()
+        self.executor.shutdown(wait=False)
+
+    def _run(self, ticket, provider, text, on_results, threaded):
+        """
+        Recorre los lotes de un proveedor mientras su consulta siga vigente.
+        """
+        replace = True
+        try:
+            with tracer.span(type(provider).__name__):
+                for batch in provider.query(text):
+                    if ticket != self.generation:
+                        return
+                    tracer.count("results_returned", len(batch))
+                    self._deliver(ticket, batch, replace, on_results, threaded)
+                    replace = False
+        except Exception as e:
+            print(f"Error en el proveedor {type(provider).__name__}: {e}")
+        if replace:
+            # La consulta no ha producido resultados: vaciar la lista
+            self._deliver(ticket, [], True, on_results, threaded)
+
+    def _deliver(self, ticket, batch, replace, on_results, threaded):
+        """
+        Entrega un lote en el hilo principal si su consulta sigue vigente.
+        """
+        if not threaded:
+            on_results(batch, replace)
+            return
+
+        def deliver():
+            if ticket == self.generation:
+                on_results(batch, replace)
+            return False
+
+        self.dispatch(deliver)
+
+
+class ApplicationProvider(Provider):
+    """
+    Busca en el catálogo de aplicaciones a través de la sesión de búsqueda.
+
+    Es síncrono: la sesión responde en milisegundos y mostrar los resultados
+    en el mismo ciclo evita parpadeos al escribir. Cada lanzamiento cambia la
+    bonificación por uso, así que descarta las consultas guardadas en la sesión.
+    """
+
+    def __init__(self, application_manager, query_session):
+        """
+        Args:
+            application_manager (ApplicationManager): Catálogo y lanzamiento de aplicaciones.
+            query_session (QuerySession): Sesión de búsqueda con caché.
+        """
+        self.application_manager = application_manager
+        self.query_session = query_session
+
+    def query(self, text):
+        catalog = self.application_manager.catalog
+        with tracer.span("query_session"):
+            indexes = self.query_session.update(text)
+        desktop_ids = catalog.desktop_ids
+        yield [
+            Result(catalog.names[index], catalog.icons[index], partial(self.launch, index), dismiss=True, key=desktop_ids[index])
+            for index in indexes
+        ]
+
+    def plan(self, result):
+        index = self.application_manager.catalog.index_of(result.key)
+        return None if index is None else self.application_manager.launch_argv(index)
+
+    def launch(self, index):
+        """
+        Lanza una aplicación del catálogo y descarta la caché de la sesión, cuya ordenación ha cambiado.
+
+        Args:
+            index (int): Índice de la aplicación.
+        """
+        if self.application_manager.launch(index) is not None:
+            self.query_session.reset()
+
+
+class CommandProvider(Provider):
+    """
+    Muestra una lista fija de comandos (p. ej. los del sistema) filtrada por el texto tras el prefijo.
+
+    Los comandos sin configurar (variable vacía o ausente en .env) no se muestran.
+    """
+
+    def __init__(self, prefix, get_commands, launch):
+        """
+        Args:
+            prefix (str): Prefijo que selecciona el proveedor.
+            get_commands (callable): Devuelve la lista de tuplas (nombre, comando, icono).
+            launch (callable): Función que lanza una línea de comandos.
+        """
+        self.prefixes = (prefix,)
+        self.get_commands = get_commands
+        self.launch = launch
+
+    def query(self, text):
+        query = normalize(text.strip())
+        yield [
+            Result(name, icon, partial(self.launch, command), key=command)
+            for name, command, icon in self.get_commands()
+            if command and query in normalize(name)
+        ]
+
+    def plan(self, result):
+        return command_argv(result.key) if result.key else None
+
+
+class ConnectivityProvider(CommandProvider):
+    """
+    Comandos de conectividad con el estado actual de Bluetooth, WiFi y audio y
+    las actualizaciones pendientes.
+    """
+
+    def __init__(self, prefix, command_loader, connectivity_service, updates_service, launch):
+        """
+        Args:
+            prefix (str): Prefijo que selecciona el proveedor.
+            command_loader (CommandLoader): Comandos configurados.
+            connectivity_service (ConnectivityService): Estado de conectividad cacheado.
+            updates_service (UpdatesService): Recuento de actualizaciones pendientes.
+            launch (callable): Función que lanza una línea de comandos.
+        """
+        super().__init__(prefix, self.get_connectivity_commands, launch)
+        self.command_loader = command_loader
+        self.connectivity_service = connectivity_service
+        self.updates_service = updates_service
+
+    def get_connectivity_commands(self):
+        """
+        Devuelve los comandos de conectividad con su estado en el nombre.
+
+        Returns:
+            list: Lista de tuplas con el nombre del comando, el comando y el icono.
+        """
+        state = self.connectivity_service.state
+        statuses = {"Bluetooth": state.bluetooth, "Wifi": state.wifi, "Audio": state.audio}
+        commands = [
+            (f"{name} ({statuses[name]})" if name in statuses else name, command, icon)
+            for name, command, icon in self.command_loader.get_connectivity_commands()
+        ]
+
+        # Mostrar el comando de actualización sólo si hay paquetes pendientes (no bloquea)
+        pending_updates = self.updates_service.get_count()
+        if pending_updates > 0:
+            commands.append((f"Actualizar ({pending_updates} paquetes)", self.command_loader.con_update_cmd, "system-software-update"))
+        return commands
+
+
+class RunProvider(Provider):
+    """
+    Ejecuta líneas de comandos y completa los nombres de los ejecutables de PATH.
+
+    La primera fila ejecuta exactamente lo escrito; mientras sólo se escribe
+    el nombre del programa, le siguen los ejecutables que empiezan por él.
+    El índice de PATH se comprueba como mucho una vez por intervalo.
+    """
+    activate_first = True
+
+    def __init__(self, prefixes, executable_index, launch, limit=50, refresh_interval=2.0):
+        """
+        Args:
+            prefixes (tuple): Prefijos que seleccionan el proveedor (p. ej. "run:" y ">").
+            executable_index (ExecutableIndex): Índice de los ejecutables de PATH.
+            launch (callable): Función que lanza una línea de comandos.
+            limit (int): Número máximo de nombres completados.
+            refresh_interval (float): Segundos entre comprobaciones de los directorios de PATH.
+        """
+        self.prefixes = tuple(prefixes)
+        self.executable_index = executable_index
+        self.launch = launch
+        self.limit = limit
+        self.refresh_interval = refresh_interval
+
+    def query(self, text):
+        command = text.strip()
+        if not command:
+            yield []
+            return
+
+        results = [Result(f"Ejecutar: {command}", "utilities-terminal", partial(self.launch, command), dismiss=True, key=command)]
+        try:
+            words = shlex.split(command)
+        except ValueError:
+            # Comillas sin cerrar: todavía se está escribiendo un argumento
+            words = None
+        if words is not None and len(words) == 1 and not command.endswith(' '):
+            self.executable_index.refresh(self.refresh_interval)
+            results.extend(
+                Result(name, "utilities-terminal", partial(self.launch, name), dismiss=True, key=name)
+                for name in self.executable_index.complete(words[0], self.limit)
+                if name != command
+            )
+        yield results
+
+    def plan(self, result):
+        return command_argv(result.key)
+
+
+class ThemeProvider(Provider):
+    """
+    Lista los temas disponibles. Es asíncrono porque lee el directorio de temas.
+    """
+    prefixes = ("theme:",)
+    asynchronous = True
+
+    def __init__(self, list_themes, apply_theme):
+        """
+        Args:
+            list_themes (callable): Devuelve los nombres de los temas.
+            apply_theme (callable): Aplica un tema por su nombre.
+        """
+        self.list_themes = list_themes
+        self.apply_theme = apply_theme
+
+    def query(self, text):
+        query = normalize(text.strip())
+        yield [
+            Result(theme, "preferences-desktop-theme", partial(self.apply_theme, theme), key=theme)
+            for theme in self.list_themes()
+            if query in normalize(theme)
+        ]
+
+
+class HelpProvider(Provider):
+    """
+    Abre la ventana de ayuda al escribir exactamente el prefijo.
+    """
+    prefixes = ("help:",)
+
+    def __init__(self, show_help):
+        """
+        Args:
+            show_help (callable): Muestra la ventana de ayuda.
+        """
+        self.show_help = show_help
+
+    def query(self, text):
+        if not text:
+            self.show_help()
+        yield [Result("Ayuda", "help-browser", self.show_help)]
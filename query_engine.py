@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+
+from application_manager import ApplicationManager
+from command_loader import CommandLoader
+from providers import ApplicationProvider, CommandProvider, ConnectivityProvider, ProviderRegistry, RunProvider
+from query_session import QuerySession
+
+# Prefijo adicional del modo de comandos
+RUN_SHORT_PREFIX = ">"
+
+
+def call_now(function, *args):
+    """
+    Ejecuta una llamada en el hilo actual (dispatch de los usos sin bucle principal).
+    """
+    function(*args)
+
+
+class QueryEngine:
+    """
+    Motor de consultas del lanzador, sin dependencias de GTK.
+
+    Reúne el catálogo de aplicaciones, la sesión de búsqueda y el registro
+    de proveedores por prefijo. La ventana es una vista sobre el motor: le
+    pasa el texto escrito y pinta los lotes que recibe; la orden
+    `main.py query` usa el mismo motor sin pantalla.
+
+    Métodos:
+        __init__: Inicializa el motor y registra los proveedores.
+        query: Lanza una consulta y entrega sus lotes a una función.
+        search: Ejecuta una consulta de forma síncrona y devuelve todos sus resultados.
+        launch_command: Lanza una línea de comandos.
+        apply_changes: Aplica cambios de archivos .desktop y repite la consulta de aplicaciones.
+        shutdown: Detiene los hilos de los proveedores asíncronos.
+    """
+
+    def __init__(self, dispatch=call_now, command_loader=None, application_manager=None,
+                 connectivity_service=None, updates_service=None, limit=None):
+        """
+        Inicializa el motor y registra los proveedores de aplicaciones, comandos y conectividad.
+
+        Args:
+            dispatch (callable): Función que ejecuta una llamada en el hilo principal (GLib.idle_add en la ventana).
+            command_loader (CommandLoader): Comandos configurados, o None para leerlos del entorno.
+            application_manager (ApplicationManager): Catálogo de aplicaciones, o None para cargarlo.
+            connectivity_service (ConnectivityService): Estado de conectividad; sin él no hay comandos de conectividad.
+            updates_service (UpdatesService): Recuento de actualizaciones pendientes.
+            limit (int): Número máximo de aplicaciones y de ejecutables completados por consulta,
+                o None para los valores por defecto de la ventana.
+        """
+        limits = {} if limit is None else {'limit': limit}
+        self.command_loader = command_loader or CommandLoader()
+        self.application_manager = application_manager or ApplicationManager()
+        self.query_session = QuerySession(self.application_manager, **limits)
+        self.registry = ProviderRegistry(dispatch)
+
+        self.registry.register(ApplicationProvider(self.application_manager, self.query_session), default=True)
+        if self.command_loader.sys_command_prefix:
+            self.registry.register(CommandProvider(self.command_loader.sys_command_prefix, self.command_loader.get_system_commands,
+                                                   self.launch_command))
+        if self.command_loader.con_command_prefix and connectivity_service is not None and updates_service is not None:
+            self.registry.register(ConnectivityProvider(self.command_loader.con_command_prefix, self.command_loader,
+                                                        connectivity_service, updates_service, self.launch_command))
+        run_prefixes = [prefix for prefix in (self.command_loader.run_command_prefix, RUN_SHORT_PREFIX) if prefix]
+        self.registry.register(RunProvider(run_prefixes, self.application_manager.executable_index, self.launch_command, **limits))
+
+    def query(self, text, on_results):
+        """
+        Lanza una consulta y cancela la anterior.
+
+        Args:
+            text (str): Texto completo del campo de búsqueda.
+            on_results (callable): Función que recibe (lote de resultados, reemplazar) a través de dispatch.
+
+        Returns:
+            Provider: El proveedor que atiende la consulta, o None.
+        """
+        return self.registry.query(text, on_results)
+
+    def search(self, text):
+        """
+        Ejecuta una consulta de forma síncrona y devuelve todos sus resultados.
+
+        Args:
+            text (str): Texto completo de la consulta.
+
+        Returns:
+            tuple: (proveedor o None, lista de objetos Result en orden).
+        """
+        provider, provider_text = self.registry.provider_for(text)
+        if provider is None:
+            return None, []
+        return provider, [result for batch in provider.query(provider_text) for result in batch]
+
+    def launch_command(self, command_line):
+        """
+        Lanza una línea de comandos.
+
+        Args:
+            command_line (str): La línea de comandos.
+
+        Returns:
+            int: PID del proceso, o None si no se ha podido lanzar.
+        """
+        return self.application_manager.launch_command(command_line)
+
+    def apply_changes(self, paths):
+        """
+        Aplica un lote de cambios de archivos .desktop y repite la consulta si muestra aplicaciones.
+
+        Args:
+            paths (list): Rutas de los archivos .desktop cambiados.
+        """
+        self.application_manager.apply_changes(paths)
+        self.query_session.reset()
+        if isinstance(self.registry.active, ApplicationProvider):
+            self.registry.refresh()
+
+    def shutdown(self):
+        """
+        Cancela la consulta en curso y detiene los hilos de los proveedores asíncronos.
+        """
+        self.registry.shutdown()
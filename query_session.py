@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+
+from collections import OrderedDict
+
+from search_index import DEFAULT_LIMIT
+from text_normalize import normalize
+
+# Número de consultas recientes que se conservan
+CACHE_SIZE = 32
+# Longitud mínima de consulta a partir de la cual se guarda el conjunto completo de coincidencias
+NARROW_MIN_LENGTH = 3
+
+
+class QuerySession:
+    """
+    Sesión de búsqueda: resultado actual, refinado incremental y caché de consultas.
+
+    Cada consulta se calcula una sola vez; la activación de filas y la tecla
+    Enter leen la instantánea de resultados en lugar de recalcularla. Cuando
+    la consulta nueva extiende una anterior, sólo se examinan las
+    coincidencias de aquella. Las consultas recientes se guardan en una caché
+    LRU para que borrar caracteres sea inmediato. La caché se descarta sola
+    cuando cambia el índice (otro índice, claves o bonificaciones por uso,
+    p. ej. tras un lanzamiento o el recálculo periódico del uso).
+
+    Métodos:
+        __init__: Inicializa la sesión sobre un ApplicationManager.
+        update: Calcula (o recupera) los resultados de una consulta.
+        reset: Descarta la caché tras un cambio del catálogo.
+    """
+
+    def __init__(self, application_manager, limit=DEFAULT_LIMIT, cache_size=CACHE_SIZE):
+        """
+        Inicializa la sesión sobre un ApplicationManager.
+
+        Args:
+            application_manager (ApplicationManager): Catálogo e índice de búsqueda.
+            limit (int): Número máximo de resultados por consulta.
+            cache_size (int): Número de consultas recientes que se conservan.
+        """
+        self.application_manager = application_manager
+        self.limit = limit
+        self.cache_size = cache_size
+        # Consulta -> (identificadores coincidentes o None, identificadores ordenados)
+        self.cache = OrderedDict()
+        self.query = None
+        self.results = []
+        # Índice y versión del índice con los que se calculó la caché
+        self.search_index = None
+        self.index_version = None
+
+    def reset(self):
+        """
+        Descarta la caché y la instantánea tras un cambio del catálogo.
+        """
+        self.cache.clear()
+        self.query = None
+        self.results = []
+        self.search_index = None
+        self.index_version = None
+
+    def update(self, filter_text):
+        """
+        Calcula (o recupera de la caché) los resultados de una consulta.
+
+        Args:
+            filter_text (str): Texto de búsqueda.
+
+        Returns:
+            list: Instantánea de índices del catálogo resultantes, que queda en self.results.
+        """
+        # La consulta se normaliza una sola vez; las claves del catálogo ya lo están
+        query = normalize(filter_text)
+        if not query:
+            # La consulta vacía no usa el índice: no se construye hasta la primera búsqueda
+            if query != self.query:
+                self.query = query
+                self.results = list(self.application_manager.catalog.order)
+            return self.results
+
+        index = self.application_manager.get_search_index()
+        if index is not self.search_index or index.version != self.index_version:
+            self.reset()
+            self.search_index = index
+            self.index_version = index.version
+        elif query == self.query:
+            return self.results
+
+        entry = self.cache.get(query)
+        if entry is not None:
+            self.cache.move_to_end(query)
+        else:
+            entry = self._compute(index, query)
+            self.cache[query] = entry
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        self.query = query
+        self.results = entry[1]
+        return self.results
+
+    def _compute(self, index, query):
+        """
+        Calcula los resultados de una consulta, refinando una anterior si es posible.
+
+        Args:
+            index (SearchIndex): Índice de búsqueda actual.
+            query (str): Consulta normalizada.
+
+        Returns:
+            tuple: (identificadores coincidentes o None, identificadores ordenados).
+        """
+        parent = self._cached_prefix(query)
+        if parent is not None:
+            scored = index.matches(query, parent)
+        elif len(query) >= NARROW_MIN_LENGTH:
+            scored = index.matches(query)
+        else:
+            # Consultas muy cortas: búsqueda por niveles sin guardar todas las coincidencias
+            return None, index.search(query, self.limit)
+
+        return [match for _, match in scored], index.rank(scored, self.limit)
+
+    def _cached_prefix(self, query):
+        """
+        Busca en la caché la consulta más larga que es prefijo de ésta y tiene sus coincidencias completas.
+
+        Args:
+            query (str): Consulta normalizada.
+
+        Returns:
+            list: Identificadores coincidentes de esa consulta, o None.
+        """
+        for length in range(len(query) - 1, NARROW_MIN_LENGTH - 1, -1):
+            entry = self.cache.get(query[:length])
+            if entry is not None and entry[0] is not None:
+                return entry[0]
+        return None
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+
+import gi
+gi.require_version('Gtk', '4.0')
+from gi.repository import GObject, Gtk
+
+# Icono usado cuando una entrada no declara ninguno
+DEFAULT_ICON = "application-x-executable"
+
+
+class ResultItem(GObject.Object):
+    """
+    Elemento ligero del modelo de resultados: sólo guarda los datos de la
+    fila, no sus widgets.
+
+    Propiedades:
+        name (str): Texto que se muestra en la fila.
+        icon_name (str): Nombre o ruta del icono.
+    """
+    __gtype_name__ = "LychappResultItem"
+
+    name = GObject.Property(type=str, default="")
+    icon_name = GObject.Property(type=str, default=DEFAULT_ICON)
+
+    def __init__(self, result):
+        """
+        Inicializa el elemento.
+
+        Args:
+            result (Result): Resultado del proveedor que muestra la fila.
+        """
+        super().__init__(name=result.name, icon_name=result.icon or DEFAULT_ICON)
+        self.result = result
+
+
+def create_result_factory(icon_service):
+    """
+    Crea la factoría de filas de la lista de resultados.
+
+    Gtk.ListView sólo crea filas para los elementos visibles y las reutiliza
+    al desplazarse: "setup" construye los widgets de una fila una vez y
+    "bind"/"unbind" los enlazan con el elemento que muestran en cada momento.
+
+    Args:
+        icon_service (IconService): Caché de iconos de la que se toman los paintables.
+
+    Returns:
+        Gtk.SignalListItemFactory: La factoría de filas.
+    """
+    factory = Gtk.SignalListItemFactory()
+    factory.connect("setup", on_result_setup)
+    factory.connect("bind", on_result_bind, icon_service)
+    factory.connect("unbind", on_result_unbind)
+    return factory
+
+
+def on_result_setup(factory, list_item):
+    """
+    Construye los widgets de una fila reutilizable.
+
+    Args:
+        factory (Gtk.SignalListItemFactory): La factoría de filas.
+        list_item (Gtk.ListItem): La fila a construir.
+    """
+    hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+
+    # Icono con tamaño fijo
+    icon = Gtk.Image()
+    icon.set_pixel_size(32)
+    hbox.append(icon)
+
+    # Nombre con una separación de 10px
+    label = Gtk.Label()
+    label.set_xalign(0.0)
+    hbox.append(label)
+
+    hbox.name_binding = None
+    hbox.bound_item = None
+    list_item.set_child(hbox)
+
+
+def on_result_bind(factory, list_item, icon_service):
+    """
+    Enlaza una fila con el elemento que debe mostrar.
+
+    Args:
+        factory (Gtk.SignalListItemFactory): La factoría de filas.
+        list_item (Gtk.ListItem): La fila a enlazar.
+        icon_service (IconService): Caché de iconos.
+    """
+    item = list_item.get_item()
+    hbox = list_item.get_child()
+    icon = hbox.get_first_child()
+    label = icon.get_next_sibling()
+    hbox.bound_item = item
+
+    def on_icon_ready(paintable):
+        # La fila puede haberse reutilizado para otro elemento mientras se decodificaba
+        if hbox.bound_item is item:
+            icon.set_from_paintable(paintable)
+
+    paintable = icon_service.lookup(item.icon_name, callback=on_icon_ready)
+    if paintable is not None:
+        icon.set_from_paintable(paintable)
+    else:
+        icon.set_from_icon_name(DEFAULT_ICON)
+    # El nombre se enlaza para que los cambios de estado (Bluetooth, Wifi...) se reflejen en la fila
+    hbox.name_binding = item.bind_property("name", label, "label", GObject.BindingFlags.SYNC_CREATE)
+
+
+def on_result_unbind(factory, list_item):
+    """
+    Desenlaza una fila del elemento que mostraba.
+
+    Args:
+        factory (Gtk.SignalListItemFactory): La factoría de filas.
+        list_item (Gtk.ListItem): La fila a desenlazar.
+    """
+    hbox = list_item.get_child()
+    hbox.bound_item = None
+    if hbox.name_binding is not None:
+        hbox.name_binding.unbind()
+        hbox.name_binding = None
@@ -0,0 +1,404 @@
+#!/usr/bin/python3
+
+import bisect
+import heapq
+import math
+
+from text_normalize import normalize_name
+
+# Número máximo de resultados que devuelve una búsqueda por defecto
+DEFAULT_LIMIT = 100
+
+# Puntuaciones base de cada tipo de coincidencia
+SCORE_EXACT = 1000
+SCORE_PREFIX = 900
+SCORE_WORD_START = 700
+SCORE_ACRONYM = 600
+SCORE_SUBSTRING = 300
+
+# Bonificación máxima por uso: basta para adelantar a un nivel, no a dos
+MAX_USAGE_BOOST = 250
+# Puntuación de uso con la que se alcanza el 63 % de la bonificación máxima
+USAGE_SCALE = 5
+
+
+def usage_boost(usage_score):
+    """
+    Convierte una puntuación de uso (lanzamientos ponderados por antigüedad) en una bonificación acotada.
+
+    Args:
+        usage_score (float): Puntuación de uso de UsageStore.
+
+    Returns:
+        float: Bonificación entre 0 y MAX_USAGE_BOOST.
+    """
+    return MAX_USAGE_BOOST * (1 - math.exp(-usage_score / USAGE_SCALE))
+
+
+class SearchIndex:
+    """
+    Índice de búsqueda construido una sola vez sobre los nombres del catálogo.
+
+    Precalcula las claves normalizadas, los inicios de palabra, los acrónimos
+    ("vsc" para "Visual Studio Code") y un índice de bigramas y trigramas, de
+    modo que cada consulta sólo examina los candidatos que pueden coincidir.
+
+    Las coincidencias se recuperan por niveles (prefijo, inicio de palabra,
+    acrónimo y subcadena). Como cualquier coincidencia de un nivel puntúa más
+    que todas las de los niveles siguientes, la búsqueda se detiene en cuanto
+    un nivel completa los resultados pedidos. Las entradas con bonificación
+    por uso, que pueden adelantar a un nivel, se puntúan siempre.
+
+    Métodos:
+        __init__: Precalcula las claves y los índices.
+        matches: Devuelve todas las coincidencias con su puntuación.
+        search: Devuelve los mejores resultados ordenados por puntuación.
+        score: Puntúa una entrada para una consulta.
+        update: Sustituye o añade la clave de una entrada.
+        remove: Elimina una entrada del índice.
+        set_usage: Actualiza la bonificación por uso de una entrada.
+        reset_usage: Sustituye todas las bonificaciones por uso.
+    """
+
+    def __init__(self, names, normalized=None, usage=None):
+        """
+        Precalcula las claves y los índices.
+
+        Args:
+            names (list): Nombres de las entradas (None en los huecos); su posición es el identificador.
+            normalized (list): Tuplas (clave, inicios de palabra) ya calculadas
+                con text_normalize.normalize_name, o None para calcularlas aquí.
+            usage (dict): Puntuación de uso por identificador, o None.
+        """
+        if normalized is None:
+            normalized = [None if name is None else normalize_name(name) for name in names]
+
+        # Se incrementa con cada cambio de claves o bonificaciones; invalida los resultados guardados fuera
+        self.version = 0
+        # Identificador -> bonificación por uso (sólo las entradas usadas)
+        self.boosts = {}
+        self.reset_usage(usage or {})
+
+        count = len(normalized)
+        self.keys = [None] * count
+        self.word_starts = [None] * count
+        self.acronyms = [None] * count
+        self.ngrams = {}
+        self.acronym_prefixes = {}
+        # Claves y restos de clave desde cada inicio de palabra, ordenados para buscar prefijos con bisect
+        self.sorted_keys = []
+        self.sorted_word_suffixes = []
+
+        for index, entry in enumerate(normalized):
+            # Los huecos del catálogo (aplicaciones eliminadas) no tienen clave
+            if entry is not None:
+                self._add(index, entry[0], entry[1], list.append)
+
+        self.sorted_keys.sort()
+        self.sorted_word_suffixes.sort()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def tiers(self, query):
+        """
+        Genera los candidatos de cada nivel de coincidencia, de mejor a peor.
+
+        Args:
+            query (str): Consulta ya normalizada.
+
+        Yields:
+            iterable: Identificadores candidatos de cada nivel.
+        """
+        yield self._prefixed(self.sorted_keys, query)
+        yield self._prefixed(self.sorted_word_suffixes, query)
+        if len(query) > 1:
+            yield self.acronym_prefixes.get(query, ())
+        yield self.candidates(query)
+
+    def candidates(self, query):
+        """
+        Obtiene los identificadores que pueden contener la consulta como subcadena o acrónimo.
+
+        Args:
+            query (str): Consulta ya normalizada.
+
+        Returns:
+            iterable: Identificadores candidatos (puede contener falsos positivos).
+        """
+        if len(query) == 1:
+            return range(len(self.keys))
+
+        # La lista de apariciones más corta entre los n-gramas de la consulta
+        n = 2 if len(query) == 2 else 3
+        postings = None
+        for i in range(len(query) - n + 1):
+            gram_postings = self.ngrams.get(query[i:i + n])
+            if gram_postings is None:
+                postings = ()
+                break
+            if postings is None or len(gram_postings) < len(postings):
+                postings = gram_postings
+
+        acronym_postings = self.acronym_prefixes.get(query, ())
+        if not acronym_postings:
+            return postings
+        if not postings:
+            return acronym_postings
+        return set(postings).union(acronym_postings)
+
+    def score(self, index, query):
+        """
+        Puntúa una entrada para una consulta.
+
+        Args:
+            index (int): Identificador de la entrada.
+            query (str): Consulta ya normalizada.
+
+        Returns:
+            float: Puntuación, o None si la entrada no coincide.
+        """
+        key = self.keys[index]
+        if key is None:
+            return None
+        position = key.find(query)
+        if position == 0:
+            score = SCORE_EXACT if len(key) == len(query) else SCORE_PREFIX
+        elif position > 0 and any(key.startswith(query, start) for start in self.word_starts[index]):
+            score = SCORE_WORD_START
+        elif len(query) > 1 and self.acronyms[index].startswith(query):
+            score = SCORE_ACRONYM
+            position = 0
+        elif position > 0:
+            score = SCORE_SUBSTRING
+        else:
+            return None
+
+        # A igual tipo de coincidencia, antes las más tempranas y los nombres más cortos.
+        # Las penalizaciones están acotadas para que nunca crucen de un tipo a otro.
+        score -= min(position, 50) + min(len(key), 4900) / 100
+        if self.boosts:
+            score += self.boosts.get(index, 0)
+        return score
+
+    def update(self, index, normalized):
+        """
+        Sustituye en el índice la clave de una entrada, o la añade si el identificador es nuevo.
+
+        Args:
+            index (int): Identificador de la entrada.
+            normalized (tuple): (clave, inicios de palabra) de text_normalize.normalize_name.
+        """
+        if index >= len(self.keys):
+            grow = index + 1 - len(self.keys)
+            self.keys.extend([None] * grow)
+            self.word_starts.extend([None] * grow)
+            self.acronyms.extend([None] * grow)
+        self._remove(index)
+        self._add(index, normalized[0], normalized[1], bisect.insort)
+        self.version += 1
+
+    def remove(self, index):
+        """
+        Elimina una entrada del índice; su identificador queda libre.
+
+        Args:
+            index (int): Identificador de la entrada.
+        """
+        self._remove(index)
+        self.boosts.pop(index, None)
+        self.version += 1
+
+    def set_usage(self, index, usage_score):
+        """
+        Actualiza la bonificación por uso de una entrada.
+
+        Args:
+            index (int): Identificador de la entrada.
+            usage_score (float): Puntuación de uso de UsageStore.
+        """
+        boost = usage_boost(usage_score)
+        if boost >= 1:
+            self.boosts[index] = boost
+        else:
+            self.boosts.pop(index, None)
+        self.version += 1
+
+    def reset_usage(self, usage):
+        """
+        Sustituye todas las bonificaciones por uso (p. ej. para aplicar el decaimiento de las puntuaciones).
+
+        Args:
+            usage (dict): Puntuación de uso por identificador.
+        """
+        self.boosts = {}
+        for index, usage_score in usage.items():
+            self.set_usage(index, usage_score)
+        self.version += 1
+
+    def matches(self, query, candidates=None):
+        """
+        Devuelve todas las coincidencias con su puntuación.
+
+        Args:
+            query (str): Consulta ya normalizada.
+            candidates (iterable): Restringe la búsqueda a estos identificadores.
+
+        Returns:
+            list: Lista de tuplas (puntuación, identificador).
+        """
+        if candidates is None:
+            candidates = self.candidates(query)
+        score = self.score
+        results = []
+        for index in candidates:
+            value = score(index, query)
+            if value is not None:
+                results.append((value, index))
+        return results
+
+    def search(self, query, limit=DEFAULT_LIMIT, candidates=None):
+        """
+        Devuelve los mejores resultados ordenados por puntuación.
+
+        Usa un montículo acotado a limit elementos en lugar de ordenar todas
+        las coincidencias. Una consulta vacía devuelve todas las entradas en
+        el orden del catálogo.
+
+        Args:
+            query (str): Consulta ya normalizada.
+            limit (int): Número máximo de resultados, o None para no limitar.
+            candidates (iterable): Restringe la búsqueda a estos identificadores.
+
+        Returns:
+            list: Identificadores de las entradas, de mayor a menor puntuación.
+        """
+        if not query:
+            indexes = range(len(self.keys)) if candidates is None else sorted(candidates)
+            return [index for index in indexes if self.keys[index] is not None][:limit]
+
+        if candidates is not None:
+            results = self.matches(query, candidates)
+        else:
+            score = self.score
+            # Las entradas usadas pueden adelantar a un nivel: se puntúan todas antes de recorrer los niveles
+            results = self.matches(query, self.boosts) if self.boosts else []
+            seen = set(self.boosts)
+            # El corte sólo cuenta las entradas sin bonificación, que nunca superan a las de un nivel anterior
+            ranked = 0
+            for tier in self.tiers(query):
+                for index in tier:
+                    if index in seen:
+                        continue
+                    seen.add(index)
+                    value = score(index, query)
+                    if value is not None:
+                        results.append((value, index))
+                        ranked += 1
+                if limit is not None and ranked >= limit:
+                    break
+
+        return self.rank(results, limit)
+
+    @staticmethod
+    def rank(results, limit=DEFAULT_LIMIT):
+        """
+        Ordena coincidencias ya puntuadas y se queda con las mejores.
+
+        Args:
+            results (list): Lista de tuplas (puntuación, identificador).
+            limit (int): Número máximo de resultados, o None para no limitar.
+
+        Returns:
+            list: Identificadores de las entradas, de mayor a menor puntuación.
+        """
+        # A igual puntuación se conserva el orden del catálogo
+        ranking_key = lambda item: (item[0], -item[1])
+        if limit is None or limit >= len(results):
+            results = sorted(results, key=ranking_key, reverse=True)
+        else:
+            results = heapq.nlargest(limit, results, key=ranking_key)
+        return [index for _, index in results]
+
+    def _add(self, index, key, starts, add):
+        """
+        Indexa la clave de una entrada.
+
+        Args:
+            index (int): Identificador de la entrada.
+            key (str): Clave normalizada.
+            starts (tuple): Inicios de palabra en la clave.
+            add (callable): list.append al construir (se ordena al final) o bisect.insort al actualizar.
+        """
+        acronym = ''.join(key[start] for start in starts)
+        self.keys[index] = key
+        self.word_starts[index] = starts
+        self.acronyms[index] = acronym
+        add(self.sorted_keys, (key, index))
+        for start in starts:
+            if start > 0:
+                add(self.sorted_word_suffixes, (key[start:], index))
+        for gram in self._grams(key):
+            self.ngrams.setdefault(gram, []).append(index)
+        for length in range(2, len(acronym) + 1):
+            self.acronym_prefixes.setdefault(acronym[:length], []).append(index)
+
+    def _remove(self, index):
+        """
+        Quita del índice la clave de una entrada, si la tiene.
+        """
+        key = self.keys[index]
+        if key is None:
+            return
+        self._discard(self.sorted_keys, (key, index))
+        for start in self.word_starts[index]:
+            if start > 0:
+                self._discard(self.sorted_word_suffixes, (key[start:], index))
+        acronym = self.acronyms[index]
+        for gram in self._grams(key):
+            self._unpost(self.ngrams, gram, index)
+        for length in range(2, len(acronym) + 1):
+            self._unpost(self.acronym_prefixes, acronym[:length], index)
+        self.keys[index] = self.word_starts[index] = self.acronyms[index] = None
+
+    @staticmethod
+    def _grams(key):
+        """
+        Devuelve los bigramas y trigramas distintos de una clave.
+        """
+        return {key[i:i + n] for n in (2, 3) for i in range(len(key) - n + 1)}
+
+    @staticmethod
+    def _unpost(postings_by_key, posting_key, index):
+        """
+        Quita un identificador de una lista de apariciones y borra la lista si queda vacía.
+        """
+        postings = postings_by_key[posting_key]
+        postings.remove(index)
+        if not postings:
+            del postings_by_key[posting_key]
+
+    @staticmethod
+    def _discard(sorted_pairs, pair):
+        """
+        Elimina un elemento de una lista ordenada, si está.
+        """
+        position = bisect.bisect_left(sorted_pairs, pair)
+        if position < len(sorted_pairs) and sorted_pairs[position] == pair:
+            del sorted_pairs[position]
+
+    @staticmethod
+    def _prefixed(sorted_pairs, prefix):
+        """
+        Devuelve los identificadores cuyas cadenas empiezan por el prefijo.
+
+        Args:
+            sorted_pairs (list): Lista ordenada de tuplas (cadena, identificador).
+            prefix (str): Prefijo buscado.
+
+        Returns:
+            list: Identificadores encontrados.
+        """
+        start = bisect.bisect_left(sorted_pairs, (prefix,))
+        end = bisect.bisect_left(sorted_pairs, (prefix + '\U0010ffff',), start)
+        return [index for _, index in sorted_pairs[start:end]]
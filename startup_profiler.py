@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+
+import json
+import sys
+import time
+
+from tracing import Recorder
+
+
+class StartupProfiler(Recorder):
+    """
+    Registra el tiempo de cada fase del arranque hasta el primer fotograma.
+
+    Desactivado no mide nada: phase() devuelve un contexto vacío compartido.
+    La salida (output) es un fichero, o None / '-' para la salida estándar.
+
+    Métodos:
+        enable: Activa el registro.
+        phase: Contexto que mide la duración de una fase.
+        record: Registra una fase ya medida.
+        mark: Registra un instante con nombre.
+        report: Devuelve las mediciones como diccionario.
+        write: Escribe las mediciones en JSON.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el perfilador desactivado.
+        """
+        super().__init__()
+        self.phases = []
+        self.marks = {}
+
+    def phase(self, name):
+        """
+        Contexto que mide la duración de una fase.
+
+        Args:
+            name (str): Nombre de la fase.
+
+        Returns:
+            contextlib.AbstractContextManager: El contexto de medición.
+        """
+        return self.measure(name)
+
+    def record(self, name, start, end):
+        """
+        Registra una fase ya medida.
+
+        Args:
+            name (str): Nombre de la fase.
+            start (float): Inicio (time.perf_counter).
+            end (float): Fin (time.perf_counter).
+        """
+        if self.enabled:
+            self.phases.append((name, start, end))
+
+    def mark(self, name):
+        """
+        Registra un instante con nombre.
+
+        Args:
+            name (str): Nombre del instante.
+        """
+        if self.enabled:
+            self.marks[name] = time.perf_counter()
+
+    def report(self):
+        """
+        Devuelve las mediciones como diccionario, en milisegundos desde el origen.
+
+        Returns:
+            dict: Fases e instantes registrados, y el origen (time.perf_counter, que en Linux
+            es el reloj monotónico del sistema) para situarlos desde otro proceso.
+        """
+        to_ms = lambda instant: round((instant - self.origin) * 1000, 3)
+        return {
+            'origin_s': self.origin,
+            'phases': [
+                {'name': name, 'start_ms': to_ms(start), 'duration_ms': round((end - start) * 1000, 3)}
+                for name, start, end in self.phases
+            ],
+            'marks': {name: to_ms(instant) for name, instant in self.marks.items()},
+        }
+
+    def write(self):
+        """
+        Escribe las mediciones en JSON; se llama desde dump().
+        """
+        data = json.dumps(self.report(), indent=2)
+        if self.output in (None, '-'):
+            print(data, file=sys.stdout)
+            return
+        try:
+            with open(self.output, 'w', encoding='utf-8') as f:
+                f.write(data + '\n')
+        except OSError as e:
+            print(f"Error guardando el perfil de arranque: {e}")
+
+
+# Perfilador compartido por todos los módulos
+profiler = StartupProfiler()
@@ -0,0 +1,204 @@
+#!/usr/bin/python3
+
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Instantánea inmutable de los valores de la barra de estado
+StatusSnapshot = namedtuple('StatusSnapshot', ['battery', 'cpu', 'memory', 'updates'])
+
+# Valor mostrado mientras una sonda no ha devuelto ningún resultado
+UNKNOWN_VALUE = "N/D"
+
+# Segundos entre muestras de cada sonda
+PROBE_INTERVALS = {'battery': 30.0, 'cpu': 2.0, 'memory': 5.0, 'updates': 3600.0}
+# Intervalo de las sondas que no aparecen en PROBE_INTERVALS
+DEFAULT_INTERVAL = 5.0
+# Adelanto máximo (s) con el que una sonda se ejecuta para compartir el despertar de otra
+COALESCE_WINDOW = 1.0
+
+
+class StatusSampler:
+    """
+    Programa las sondas de la barra de estado en un hilo de trabajo.
+
+    Cada sonda tiene su propio intervalo. El hilo duerme hasta el próximo
+    vencimiento y, al despertar, ejecuta también las sondas que vencen
+    dentro de la ventana de agrupación, de modo que los temporizadores
+    comparten despertares. Mientras la ventana está oculta o sin foco el
+    muestreo se pausa por completo; al reanudarlo se refrescan todas las
+    sondas de inmediato. Una sonda también puede pedirse fuera de su
+    intervalo con request_sample() (p. ej. cuando su fuente de datos avisa
+    de un valor nuevo).
+
+    Cada sonda se ejecuta en su propio hilo del pool. Una sonda lenta o
+    colgada conserva su último valor y no se vuelve a lanzar hasta que
+    termina, sin retrasar a las demás. Las instantáneas se entregan al hilo
+    principal a través de la función dispatch (GLib.idle_add), de modo que
+    el bucle principal sólo aplica el texto de las etiquetas.
+
+    Métodos:
+        __init__: Inicializa el muestreador con sus sondas.
+        start: Arranca el hilo de muestreo.
+        stop: Detiene el hilo de muestreo.
+        pause: Suspende el muestreo.
+        resume: Reanuda el muestreo con un refresco inmediato.
+        request_sample: Pide ejecutar una sonda en el próximo despertar.
+        sample: Ejecuta una ronda de sondas y publica la instantánea.
+    """
+
+    def __init__(self, probes, on_snapshot, dispatch, intervals=None, probe_timeout=0.5, coalesce_window=COALESCE_WINDOW):
+        """
+        Inicializa el muestreador con sus sondas.
+
+        Args:
+            probes (dict): Sondas por nombre de campo de StatusSnapshot; cada una devuelve un str.
+            on_snapshot (callable): Función que recibe cada StatusSnapshot en el hilo principal.
+            dispatch (callable): Función que ejecuta una llamada en el hilo principal (GLib.idle_add).
+            intervals (dict): Segundos entre muestras por sonda, o None para usar PROBE_INTERVALS.
+            probe_timeout (float): Segundos que se espera a las sondas en cada ronda.
+            coalesce_window (float): Adelanto máximo con el que una sonda comparte el despertar de otra.
+        """
+        self.probes = probes
+        self.on_snapshot = on_snapshot
+        self.dispatch = dispatch
+        intervals = PROBE_INTERVALS if intervals is None else intervals
+        self.intervals = {name: intervals.get(name, DEFAULT_INTERVAL) for name in probes}
+        self.probe_timeout = probe_timeout
+        self.coalesce_window = coalesce_window
+
+        self.values = {field: UNKNOWN_VALUE for field in StatusSnapshot._fields}
+        self.in_flight = {}
+        self.last_snapshot = None
+        # Vencimiento de cada sonda (time.monotonic); 0 para ejecutarla en el próximo despertar
+        self.deadlines = {name: 0 for name in probes}
+        # Despertares del hilo que han ejecutado sondas
+        self.wakeups = 0
+        self.paused = False
+        self.refresh_requested = False
+        # Sondas pedidas con request_sample(), desde cualquier hilo
+        self.requested = set()
+        self.requested_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, len(probes)), thread_name_prefix="lychapp-probe")
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """
+        Arranca el hilo de muestreo. Si el muestreador está pausado, no muestrea hasta resume().
+        """
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name="lychapp-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Detiene el hilo de muestreo sin esperar a las sondas en curso.
+        """
+        self.stop_event.set()
+        self.wake_event.set()
+        self.thread = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def pause(self):
+        """
+        Suspende el muestreo; el hilo duerme sin despertares hasta resume().
+        """
+        self.paused = True
+
+    def resume(self):
+        """
+        Reanuda el muestreo y refresca todas las sondas de inmediato.
+        """
+        if not self.paused:
+            return
+        self.paused = False
+        self.refresh_requested = True
+        self.wake_event.set()
+
+    def request_sample(self, name):
+        """
+        Pide ejecutar una sonda en el próximo despertar, sin esperar a su intervalo.
+
+        Se puede llamar desde cualquier hilo. Si el muestreo está pausado, la
+        petición se descarta: al reanudarlo se refrescan todas las sondas.
+
+        Args:
+            name (str): Nombre de la sonda.
+        """
+        if self.paused or name not in self.probes:
+            return
+        with self.requested_lock:
+            self.requested.add(name)
+        self.wake_event.set()
+
+    def run(self):
+        """
+        Bucle del hilo de muestreo.
+        """
+        while not self.stop_event.is_set():
+            if self.paused:
+                self.wake_event.wait()
+                self.wake_event.clear()
+                continue
+
+            if self.refresh_requested:
+                self.refresh_requested = False
+                self.deadlines = dict.fromkeys(self.deadlines, 0)
+            with self.requested_lock:
+                requested, self.requested = self.requested, set()
+            for name in requested:
+                self.deadlines[name] = 0
+
+            now = time.monotonic()
+            due = [name for name, deadline in self.deadlines.items() if deadline <= now + self.coalesce_window]
+            if due:
+                self.wakeups += 1
+                self.sample(due)
+                now = time.monotonic()
+                for name in due:
+                    self.deadlines[name] = now + self.intervals[name]
+
+            timeout = max(0, min(self.deadlines.values(), default=now) - time.monotonic())
+            self.wake_event.wait(timeout)
+            self.wake_event.clear()
+
+    def sample(self, names=None):
+        """
+        Ejecuta una ronda de sondas y publica la instantánea si ha cambiado.
+
+        Args:
+            names (list): Sondas que se ejecutan, o None para todas.
+
+        Returns:
+            StatusSnapshot: La instantánea resultante.
+        """
+        for name in self.probes if names is None else names:
+            if name not in self.in_flight:
+                try:
+                    self.in_flight[name] = self.executor.submit(self.probes[name])
+                except RuntimeError:
+                    # El pool se ha cerrado durante stop()
+                    return self.last_snapshot
+
+        wait(list(self.in_flight.values()), timeout=self.probe_timeout)
+
+        for name, future in list(self.in_flight.items()):
+            if not future.done():
+                continue
+            del self.in_flight[name]
+            try:
+                self.values[name] = future.result()
+            except Exception as e:
+                print(f"Error en la sonda de estado '{name}': {e}")
+                self.values[name] = UNKNOWN_VALUE
+
+        snapshot = StatusSnapshot(**self.values)
+        if snapshot != self.last_snapshot and not self.stop_event.is_set():
+            self.last_snapshot = snapshot
+            self.dispatch(self.on_snapshot, snapshot)
+        return snapshot
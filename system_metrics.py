@@ -0,0 +1,213 @@
+#!/usr/bin/python3
+
+import os
+import threading
+from collections import namedtuple
+
+# Utilización de la CPU en el último intervalo (porcentajes, o None sin intervalo previo)
+CpuLoad = namedtuple('CpuLoad', ['total', 'per_cpu'])
+# Memoria en KiB y porcentaje en uso
+MemoryStatus = namedtuple('MemoryStatus', ['total_kb', 'available_kb', 'used_percent'])
+# Capacidad media de las baterías (porcentaje) y estado ("Charging", "Discharging"...)
+BatteryStatus = namedtuple('BatteryStatus', ['capacity', 'status'])
+# Instantánea completa de las métricas
+MetricsSnapshot = namedtuple('MetricsSnapshot', ['cpu', 'memory', 'battery'])
+
+# Tamaño de lectura de los ficheros de /proc y /sys
+READ_SIZE = 65536
+
+
+class SystemMetrics:
+    """
+    Lee las métricas del sistema directamente de /proc y /sys, sin lanzar procesos.
+
+    Los ficheros se abren una sola vez y se vuelven a leer con os.pread desde
+    el principio en cada muestra. La carga de la CPU se calcula con la
+    diferencia entre dos lecturas de /proc/stat, es decir, la utilización del
+    último intervalo y no la media desde el arranque.
+
+    Todas las rutas cuelgan de root, de modo que se puede probar contra un
+    directorio con un procfs/sysfs falso.
+
+    Métodos:
+        __init__: Localiza las baterías y toma la primera muestra de CPU.
+        cpu_load: Devuelve la utilización de la CPU desde la muestra anterior.
+        memory_status: Devuelve el estado de la memoria.
+        battery_status: Devuelve el estado de las baterías.
+        snapshot: Devuelve todas las métricas.
+        close: Cierra los ficheros abiertos.
+    """
+
+    def __init__(self, root='/'):
+        """
+        Localiza las baterías y toma la primera muestra de CPU.
+
+        Args:
+            root (str): Directorio raíz donde se encuentran proc y sys.
+        """
+        self.root = root
+        self.fds = {}
+        self.fds_lock = threading.Lock()
+        self.previous_cpu = {}
+        self.battery_dirs = self._find_batteries()
+
+        try:
+            self.cpu_load()
+        except OSError:
+            pass
+
+    def cpu_load(self):
+        """
+        Devuelve la utilización de la CPU desde la muestra anterior.
+
+        Returns:
+            CpuLoad: Utilización total y por núcleo en porcentaje. Los valores
+            son None si no hay una muestra anterior con la que comparar.
+        """
+        text = self._read(os.path.join('proc', 'stat'))
+        total_load = None
+        per_cpu = []
+        for line in text.splitlines():
+            if not line.startswith('cpu'):
+                break
+            fields = line.split()
+            name = fields[0]
+            values = [int(value) for value in fields[1:9]]
+            # idle + iowait; guest y guest_nice ya están incluidos en user y nice
+            idle = values[3] + (values[4] if len(values) > 4 else 0)
+            total = sum(values)
+
+            load = None
+            previous = self.previous_cpu.get(name)
+            if previous is not None:
+                delta_total = total - previous[0]
+                delta_idle = idle - previous[1]
+                if delta_total > 0:
+                    load = 100 * (delta_total - delta_idle) / delta_total
+            self.previous_cpu[name] = (total, idle)
+
+            if name == 'cpu':
+                total_load = load
+            else:
+                per_cpu.append(load)
+
+        return CpuLoad(total_load, tuple(per_cpu))
+
+    def memory_status(self):
+        """
+        Devuelve el estado de la memoria.
+
+        Returns:
+            MemoryStatus: Memoria total, disponible y porcentaje en uso, o None si no se puede leer.
+        """
+        values = {}
+        for line in self._read(os.path.join('proc', 'meminfo')).splitlines():
+            key, _, rest = line.partition(':')
+            fields = rest.split()
+            if fields:
+                values[key] = int(fields[0])
+
+        total = values.get('MemTotal')
+        if not total:
+            return None
+        available = values.get('MemAvailable')
+        if available is None:
+            # Núcleos anteriores a 3.14 no exponen MemAvailable
+            available = values.get('MemFree', 0) + values.get('Buffers', 0) + values.get('Cached', 0)
+        return MemoryStatus(total, available, 100 * (total - available) / total)
+
+    def battery_status(self):
+        """
+        Devuelve el estado de las baterías.
+
+        Returns:
+            BatteryStatus: Capacidad media y estado de la primera batería, o None si no hay baterías.
+        """
+        capacities = []
+        status = None
+        for battery_dir in self.battery_dirs:
+            try:
+                capacities.append(int(self._read(os.path.join(battery_dir, 'capacity')).strip()))
+                if status is None:
+                    status = self._read(os.path.join(battery_dir, 'status')).strip()
+            except (OSError, ValueError):
+                continue
+
+        if not capacities:
+            return None
+        return BatteryStatus(sum(capacities) / len(capacities), status)
+
+    def snapshot(self):
+        """
+        Devuelve todas las métricas.
+
+        Returns:
+            MetricsSnapshot: Carga de la CPU, memoria y batería.
+        """
+        return MetricsSnapshot(self.cpu_load(), self.memory_status(), self.battery_status())
+
+    def close(self):
+        """
+        Cierra los ficheros abiertos.
+        """
+        with self.fds_lock:
+            for fd in self.fds.values():
+                os.close(fd)
+            self.fds = {}
+
+    def _read(self, relative_path):
+        """
+        Lee completo un fichero de /proc o /sys, reutilizando su descriptor.
+
+        Args:
+            relative_path (str): Ruta relativa a root.
+
+        Returns:
+            str: Contenido del fichero.
+        """
+        with self.fds_lock:
+            fd = self.fds.get(relative_path)
+            if fd is None:
+                fd = os.open(os.path.join(self.root, relative_path), os.O_RDONLY | os.O_CLOEXEC)
+                self.fds[relative_path] = fd
+
+        try:
+            chunks = []
+            offset = 0
+            while True:
+                chunk = os.pread(fd, READ_SIZE, offset)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                offset += len(chunk)
+        except OSError:
+            # Descartar el descriptor (p. ej. batería retirada) para reabrirlo la próxima vez
+            with self.fds_lock:
+                if self.fds.get(relative_path) == fd:
+                    del self.fds[relative_path]
+                    os.close(fd)
+            raise
+        return b''.join(chunks).decode('utf-8', 'replace')
+
+    def _find_batteries(self):
+        """
+        Localiza los dispositivos de /sys/class/power_supply de tipo batería.
+
+        Returns:
+            list: Rutas relativas a root de los directorios de las baterías.
+        """
+        power_supply = os.path.join('sys', 'class', 'power_supply')
+        try:
+            names = sorted(os.listdir(os.path.join(self.root, power_supply)))
+        except OSError:
+            return []
+
+        batteries = []
+        for name in names:
+            try:
+                with open(os.path.join(self.root, power_supply, name, 'type')) as f:
+                    if f.read().strip() == 'Battery':
+                        batteries.append(os.path.join(power_supply, name))
+            except OSError:
+                continue
+        return batteries
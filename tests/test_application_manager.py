@@ -0,0 +1,159 @@
+import os
+import stat
+
+import pytest
+
+from application_manager import USAGE_REFRESH_INTERVAL, ApplicationManager
+from catalog_cache import CatalogCache
+from path_index import ExecutableIndex
+from usage_store import UsageStore
+
+
+def write_entry(directory, name, extra=""):
+    """
+    Escribe un archivo .desktop mínimo en directory.
+    """
+    path = os.path.join(directory, f"{name}.desktop")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"[Desktop Entry]\nType=Application\nName={name}\nExec={name}\n{extra}")
+    return path
+
+
+@pytest.fixture
+def xdg(tmp_path, monkeypatch):
+    """
+    Árbol XDG temporal con un directorio de aplicaciones y un PATH vacío.
+    """
+    applications = tmp_path / "share" / "applications"
+    applications.mkdir(parents=True)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path / "share"))
+    monkeypatch.setenv('XDG_DATA_DIRS', str(tmp_path / "none"))
+    monkeypatch.setenv('PATH', str(bin_dir))
+    monkeypatch.delenv('XDG_CURRENT_DESKTOP', raising=False)
+    return applications, bin_dir
+
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    """
+    Cuenta las veces que se lista PATH.
+    """
+    calls = []
+    original = ExecutableIndex.refresh
+
+    def refresh(self, max_age=0):
+        calls.append(max_age)
+        return original(self, max_age)
+
+    monkeypatch.setattr(ExecutableIndex, 'refresh', refresh)
+    return calls
+
+
+def make_manager(tmp_path):
+    cache = CatalogCache(str(tmp_path / "cache" / "catalog.json"))
+    usage = UsageStore(str(tmp_path / "state" / "usage.log"))
+    manager = ApplicationManager(cache, usage)
+    cache.flush()
+    return manager
+
+
+def test_path_is_not_listed_without_try_exec(tmp_path, xdg, refreshes):
+    applications, _ = xdg
+    write_entry(applications, "editor")
+    write_entry(applications, "terminal")
+
+    manager = make_manager(tmp_path)
+
+    assert len(manager.catalog) == 2
+    assert refreshes == []
+
+
+def test_try_exec_lists_path_once_per_load(tmp_path, xdg, refreshes):
+    applications, bin_dir = xdg
+    tool = bin_dir / "tool"
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(tool.stat().st_mode | stat.S_IXUSR)
+    write_entry(applications, "installed", "TryExec=tool\n")
+    write_entry(applications, "missing", "TryExec=not-installed\n")
+    write_entry(applications, "plain")
+
+    manager = make_manager(tmp_path)
+
+    names = sorted(name for name in manager.catalog.names if name is not None)
+    assert names == ["installed", "plain"]
+    assert len(refreshes) == 1
+
+
+def test_absolute_try_exec_does_not_list_path(tmp_path, xdg, refreshes):
+    applications, _ = xdg
+    write_entry(applications, "absolute", "TryExec=/bin/sh\n")
+
+    manager = make_manager(tmp_path)
+
+    assert len(manager.catalog) == 1
+    assert refreshes == []
+
+
+def test_changes_recheck_path(tmp_path, xdg, refreshes):
+    applications, bin_dir = xdg
+    manager = make_manager(tmp_path)
+    assert len(manager.catalog) == 0
+
+    # Se instala el ejecutable junto con su archivo .desktop
+    tool = bin_dir / "tool"
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(tool.stat().st_mode | stat.S_IXUSR)
+    path = write_entry(applications, "installed", "TryExec=tool\n")
+    manager.apply_changes([path])
+    manager.catalog_cache.flush()
+
+    assert len(manager.catalog) == 1
+    assert len(refreshes) == 1
+
+
+def test_launch_refreshes_every_usage_boost(tmp_path, xdg):
+    applications, _ = xdg
+    write_entry(applications, "editor")
+    write_entry(applications, "terminal")
+    manager = make_manager(tmp_path)
+    index = manager.get_search_index()
+    assert index.boosts == {}
+
+    # Lanzamientos registrados directamente en el historial, que el índice aún no refleja
+    for _ in range(3):
+        manager.usage_store.record("editor.desktop")
+    manager.record_launch(manager.catalog.index_of("terminal.desktop"))
+
+    assert set(index.boosts) == {manager.catalog.index_of("editor.desktop"), manager.catalog.index_of("terminal.desktop")}
+    assert index.boosts[manager.catalog.index_of("editor.desktop")] > index.boosts[manager.catalog.index_of("terminal.desktop")]
+
+
+def test_usage_boosts_are_refreshed_periodically(tmp_path, xdg):
+    applications, _ = xdg
+    write_entry(applications, "editor")
+    manager = make_manager(tmp_path)
+    index = manager.get_search_index()
+    manager.usage_store.record("editor.desktop")
+
+    assert manager.get_search_index().boosts == {}
+
+    manager.usage_refreshed_at -= USAGE_REFRESH_INTERVAL
+    assert manager.get_search_index() is index
+    assert list(index.boosts) == [manager.catalog.index_of("editor.desktop")]
+
+
+def test_empty_name_is_listed_without_crashing(tmp_path, xdg):
+    applications, _ = xdg
+    with open(applications / "unnamed.desktop", 'w', encoding='utf-8') as f:
+        f.write("[Desktop Entry]\nType=Application\nName=\nExec=unnamed\n")
+    write_entry(applications, "editor")
+
+    manager = make_manager(tmp_path)
+    # Segunda carga, desde la caché
+    reloaded = make_manager(tmp_path)
+
+    for current in (manager, reloaded):
+        assert [row[0] for row in current.filter_applications("")] == ["", "editor"]
+        assert [row[0] for row in current.filter_applications("edi")] == ["editor"]
@@ -0,0 +1,160 @@
+import os
+
+import pytest
+
+pytest.importorskip('gi')
+from gi.repository import Gio
+
+from application_watcher import MAX_BATCH_DELAY_MS, QUIET_PERIOD_MS, ApplicationWatcher
+
+CREATED = Gio.FileMonitorEvent.CREATED
+
+
+class Timer:
+    """
+    Sustituye a GLib.timeout_add y a time.monotonic: el reloj sólo avanza a mano
+    y las llamadas programadas se ejecutan al avanzarlo.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sources = {}
+
+    def clock(self):
+        return self.now
+
+    def timeout_add(self, interval_ms, function):
+        source = len(self.sources) + 1
+        self.sources[source] = [interval_ms, function, self.now + interval_ms / 1000]
+        return source
+
+    def advance(self, ms):
+        """
+        Avanza el reloj y ejecuta las llamadas vencidas; las que devuelven False se retiran.
+        """
+        end = self.now + ms / 1000
+        while True:
+            due = [(deadline, source) for source, (_, _, deadline) in self.sources.items() if deadline <= end]
+            if not due:
+                break
+            deadline, source = min(due)
+            self.now = deadline
+            interval_ms, function, _ = self.sources[source]
+            if function():
+                self.sources[source][2] = self.now + interval_ms / 1000
+            else:
+                del self.sources[source]
+        self.now = end
+
+
+@pytest.fixture
+def timer():
+    return Timer()
+
+
+@pytest.fixture
+def applications(tmp_path):
+    directory = tmp_path / "applications"
+    directory.mkdir()
+    return str(directory)
+
+
+@pytest.fixture
+def watcher(applications, timer):
+    batches = []
+    watcher = ApplicationWatcher([applications], batches.append, timeout_add=timer.timeout_add, clock=timer.clock)
+    watcher.batches = batches
+    yield watcher
+    watcher.cancel()
+
+
+def notify(watcher, path, event_type=CREATED, other_path=None):
+    other_file = Gio.File.new_for_path(other_path) if other_path else None
+    watcher.on_monitor_changed(None, Gio.File.new_for_path(path), other_file, event_type)
+
+
+def test_burst_is_delivered_once_after_the_quiet_period(watcher, applications, timer):
+    paths = [os.path.join(applications, f"app-{i}.desktop") for i in range(50)]
+    for path in paths:
+        notify(watcher, path)
+        timer.advance(QUIET_PERIOD_MS / 10)
+    assert watcher.batches == []
+
+    # La comprobación se repite cada QUIET_PERIOD_MS: el lote sale entre uno y dos periodos después del último evento
+    timer.advance(QUIET_PERIOD_MS * 2)
+
+    assert watcher.batches == [sorted(paths)]
+    assert timer.sources == {}
+
+
+def test_continuous_events_are_delivered_after_the_maximum_delay(watcher, applications, timer):
+    elapsed = 0
+    while not watcher.batches:
+        notify(watcher, os.path.join(applications, f"app-{elapsed}.desktop"))
+        timer.advance(QUIET_PERIOD_MS / 2)
+        elapsed += QUIET_PERIOD_MS / 2
+
+    assert MAX_BATCH_DELAY_MS <= elapsed < MAX_BATCH_DELAY_MS + QUIET_PERIOD_MS
+    assert len(watcher.batches) == 1
+
+
+def test_repeated_paths_are_delivered_once(watcher, applications, timer):
+    path = os.path.join(applications, "app.desktop")
+    notify(watcher, path)
+    notify(watcher, path, Gio.FileMonitorEvent.CHANGES_DONE_HINT)
+
+    timer.advance(QUIET_PERIOD_MS)
+
+    assert watcher.batches == [[path]]
+
+
+def test_other_files_are_ignored(watcher, applications, timer):
+    notify(watcher, os.path.join(applications, "mimeinfo.cache"))
+    notify(watcher, os.path.join(applications, "app.desktop"), Gio.FileMonitorEvent.ATTRIBUTE_CHANGED)
+
+    timer.advance(MAX_BATCH_DELAY_MS)
+
+    assert watcher.batches == []
+    assert timer.sources == {}
+
+
+def test_renamed_entry_reports_both_paths(watcher, applications, timer):
+    old, new = os.path.join(applications, "old.desktop"), os.path.join(applications, "new.desktop")
+    notify(watcher, old, Gio.FileMonitorEvent.RENAMED, new)
+
+    timer.advance(QUIET_PERIOD_MS)
+
+    assert watcher.batches == [[new, old]]
+
+
+def test_created_subdirectory_is_watched_and_scanned(watcher, applications, timer):
+    subdirectory = os.path.join(applications, "kde")
+    nested = os.path.join(subdirectory, "extra")
+    os.makedirs(nested)
+    paths = []
+    for directory in (subdirectory, nested):
+        path = os.path.join(directory, "app.desktop")
+        open(path, 'w').close()
+        paths.append(path)
+
+    notify(watcher, subdirectory)
+    timer.advance(QUIET_PERIOD_MS)
+
+    assert set(watcher.monitors) == {applications, subdirectory, nested}
+    assert watcher.batches == [sorted(paths)]
+
+
+def test_deleted_subdirectory_is_no_longer_watched(watcher, applications, timer):
+    subdirectory = os.path.join(applications, "kde")
+    os.mkdir(subdirectory)
+    notify(watcher, subdirectory)
+    assert subdirectory in watcher.monitors
+
+    os.rmdir(subdirectory)
+    notify(watcher, subdirectory, Gio.FileMonitorEvent.DELETED)
+    assert set(watcher.monitors) == {applications}
+
+    # Al volver a crearlo se vigila de nuevo
+    os.mkdir(subdirectory)
+    notify(watcher, subdirectory)
+    assert subdirectory in watcher.monitors
@@ -0,0 +1,190 @@
+import json
+import os
+
+import pytest
+
+from catalog_cache import CACHE_VERSION, CatalogCache
+from desktop_entry import parse_desktop_entries
+
+
+class Parser:
+    """
+    Analizador real que cuenta los ficheros que analiza.
+    """
+
+    def __init__(self, locales=()):
+        self.locales = locales
+        self.parsed = []
+
+    def __call__(self, paths):
+        self.parsed.extend(paths)
+        return [values for values, _ in parse_desktop_entries(paths, self.locales)]
+
+
+def write_entry(directory, file_name, name, extra=""):
+    path = os.path.join(directory, file_name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"[Desktop Entry]\nType=Application\nName={name}\nExec={file_name}\n{extra}")
+    return path
+
+
+@pytest.fixture
+def applications(tmp_path):
+    directory = tmp_path / "applications"
+    directory.mkdir()
+    return str(directory)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache" / "catalog.json")
+
+
+def load(cache_path, applications, locales=()):
+    """
+    Carga los registros con una caché nueva sobre el mismo fichero, como un arranque.
+    """
+    parser = Parser(locales)
+    cache = CatalogCache(cache_path)
+    records = cache.load([applications], parser, locales)
+    cache.flush()
+    return {os.path.basename(path): record['Name'] for path, record in records}, parser.parsed
+
+
+def test_names_follow_the_locale_of_the_cache(cache_path, applications):
+    write_entry(applications, "settings.desktop", "System Settings", "Name[es]=Configuración del sistema\n")
+
+    names, _ = load(cache_path, applications, ('es_ES', 'es'))
+    assert names == {"settings.desktop": "Configuración del sistema"}
+
+    names, parsed = load(cache_path, applications, ())
+    assert names == {"settings.desktop": "System Settings"}
+    assert len(parsed) == 1
+
+    names, parsed = load(cache_path, applications, ())
+    assert names == {"settings.desktop": "System Settings"}
+    assert parsed == []
+
+
+def test_warm_start_parses_nothing(cache_path, applications):
+    write_entry(applications, "firefox.desktop", "Firefox")
+    write_entry(applications, "gimp.desktop", "GIMP")
+
+    names, parsed = load(cache_path, applications)
+    assert names == {"firefox.desktop": "Firefox", "gimp.desktop": "GIMP"}
+    assert len(parsed) == 2
+
+    names, parsed = load(cache_path, applications)
+    assert names == {"firefox.desktop": "Firefox", "gimp.desktop": "GIMP"}
+    assert parsed == []
+
+
+def test_file_edited_in_place_is_parsed_again(cache_path, applications):
+    path = write_entry(applications, "editor.desktop", "Editor A")
+    write_entry(applications, "other.desktop", "Other")
+    load(cache_path, applications)
+    directory_stat = os.stat(applications)
+    file_stat = os.stat(path)
+
+    # Mismo tamaño y mtime del directorio intacto: sólo cambia el mtime del fichero
+    write_entry(applications, "editor.desktop", "Editor B")
+    os.utime(path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000_000))
+    os.utime(applications, ns=(directory_stat.st_atime_ns, directory_stat.st_mtime_ns))
+
+    names, parsed = load(cache_path, applications)
+    assert names == {"editor.desktop": "Editor B", "other.desktop": "Other"}
+    assert parsed == [path]
+
+
+def test_file_resized_with_the_same_mtime_is_parsed_again(cache_path, applications):
+    path = write_entry(applications, "editor.desktop", "Editor")
+    load(cache_path, applications)
+    directory_stat = os.stat(applications)
+    file_stat = os.stat(path)
+
+    write_entry(applications, "editor.desktop", "Editor de textos")
+    os.utime(path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+    os.utime(applications, ns=(directory_stat.st_atime_ns, directory_stat.st_mtime_ns))
+
+    names, parsed = load(cache_path, applications)
+    assert names == {"editor.desktop": "Editor de textos"}
+    assert parsed == [path]
+
+
+def test_added_and_removed_files(cache_path, applications):
+    write_entry(applications, "firefox.desktop", "Firefox")
+    gimp = write_entry(applications, "gimp.desktop", "GIMP")
+    load(cache_path, applications)
+
+    os.remove(gimp)
+    names, parsed = load(cache_path, applications)
+    assert names == {"firefox.desktop": "Firefox"}
+    assert parsed == []
+
+    inkscape = write_entry(applications, "inkscape.desktop", "Inkscape")
+    names, parsed = load(cache_path, applications)
+    assert names == {"firefox.desktop": "Firefox", "inkscape.desktop": "Inkscape"}
+    assert parsed == [inkscape]
+
+
+def test_new_subdirectory_is_scanned(cache_path, applications):
+    write_entry(applications, "firefox.desktop", "Firefox")
+    load(cache_path, applications)
+
+    subdirectory = os.path.join(applications, "kde")
+    os.mkdir(subdirectory)
+    path = write_entry(subdirectory, "dolphin.desktop", "Dolphin")
+
+    names, parsed = load(cache_path, applications)
+    assert names == {"firefox.desktop": "Firefox", "dolphin.desktop": "Dolphin"}
+    assert parsed == [path]
+
+
+def test_invalid_files_are_cached_too(cache_path, applications):
+    path = os.path.join(applications, "broken.desktop")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("esto no es un fichero .desktop\n")
+
+    names, parsed = load(cache_path, applications)
+    assert names == {}
+    assert parsed == [path]
+
+    names, parsed = load(cache_path, applications)
+    assert parsed == []
+
+
+def test_cache_of_another_version_is_discarded(cache_path, applications):
+    write_entry(applications, "firefox.desktop", "Firefox")
+    load(cache_path, applications)
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data['version'] = CACHE_VERSION - 1
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    names, parsed = load(cache_path, applications)
+    assert names == {"firefox.desktop": "Firefox"}
+    assert len(parsed) == 1
+
+    _, parsed = load(cache_path, applications)
+    assert parsed == []
+
+
+@pytest.mark.parametrize('content', [
+    "{no es json",
+    "[]",
+    '{"version": %d, "locales": [], "directories": {"/x": {"mtime": "1", "files": {}, "subdirs": []}}}' % CACHE_VERSION,
+    '{"version": %d, "locales": []}' % CACHE_VERSION,
+])
+def test_corrupt_cache_is_discarded(cache_path, applications, content):
+    write_entry(applications, "firefox.desktop", "Firefox")
+    load(cache_path, applications)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    names, parsed = load(cache_path, applications)
+    assert names == {"firefox.desktop": "Firefox"}
+    assert len(parsed) == 1
+
+    _, parsed = load(cache_path, applications)
+    assert parsed == []
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip('dotenv')
+
+from command_loader import DEFAULT_UPDATES_TTL, CommandLoader
+
+
+@pytest.fixture(autouse=True)
+def clean_environment(tmp_path, monkeypatch):
+    # Sin .env en el directorio actual: sólo cuentan las variables de la prueba
+    monkeypatch.chdir(tmp_path)
+    for name in ('UPDATES_TTL', 'UPDATES_BACKEND', 'SYS_COMMAND', 'SYS_SHUTDOWN_CMD'):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, DEFAULT_UPDATES_TTL),
+    ("", DEFAULT_UPDATES_TTL),
+    ("  ", DEFAULT_UPDATES_TTL),
+    ("una hora", DEFAULT_UPDATES_TTL),
+    ("-5", DEFAULT_UPDATES_TTL),
+    ("600", 600),
+    (" 0 ", 0),
+])
+def test_updates_ttl_falls_back_to_the_default(monkeypatch, value, expected):
+    if value is not None:
+        monkeypatch.setenv('UPDATES_TTL', value)
+
+    assert CommandLoader().updates_ttl == expected
+
+
+def test_commands_are_read_from_the_environment(monkeypatch):
+    monkeypatch.setenv('SYS_COMMAND', 'sys:')
+    monkeypatch.setenv('SYS_SHUTDOWN_CMD', 'shutdown -h now')
+    monkeypatch.setenv('UPDATES_BACKEND', 'apt')
+
+    loader = CommandLoader()
+
+    assert loader.sys_command_prefix == 'sys:'
+    assert loader.get_system_commands()[0] == ("Apagar", 'shutdown -h now', "system-shutdown")
+    assert loader.updates_backend == 'apt'
+    assert loader.run_command_prefix == 'run:'
@@ -0,0 +1,118 @@
+import pytest
+
+pytest.importorskip('gi')
+from gi.repository import GLib
+
+from connectivity_service import (BLUEZ_NAME, NM_NAME, UNKNOWN, ConnectivityService, ConnectivityState,
+                                  is_audio_event, sink_description)
+
+SINKS = """Sink #52
+\tState: SUSPENDED
+\tName: alsa_output.pci-0000_00_1f.3.analog-stereo
+\tDescription: Built-in Audio Analog Stereo
+\tDriver: PipeWire
+
+Sink #60
+\tState: RUNNING
+\tName: bluez_output.00_1B_66_AA_BB_CC.1
+\tDescription: WH-1000XM4
+\tDriver: PipeWire
+"""
+
+
+class Recorder:
+    """
+    Sustituye a GLib.idle_add: guarda las llamadas en lugar de ejecutarlas en el bucle principal.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, function, *args):
+        self.calls.append((function.__name__, args))
+
+
+@pytest.fixture
+def service():
+    service = ConnectivityService(dispatch=Recorder())
+    yield service
+    service.stop()
+
+
+@pytest.mark.parametrize('line, expected', [
+    ("Event 'change' on sink #53\n", True),
+    ("Event 'new' on sink #60\n", True),
+    ("Event 'remove' on sink #60\n", True),
+    ("Event 'change' on server #-1\n", True),
+    ("Event 'new' on sink-input #112\n", False),
+    ("Event 'change' on source #52\n", False),
+    ("Event 'change' on client #9\n", False),
+    ("", False),
+])
+def test_is_audio_event(line, expected):
+    assert is_audio_event(line) is expected
+
+
+def test_sink_description_finds_the_default_sink():
+    assert sink_description('bluez_output.00_1B_66_AA_BB_CC.1', SINKS) == 'WH-1000XM4'
+    assert sink_description('alsa_output.pci-0000_00_1f.3.analog-stereo', SINKS) == 'Built-in Audio Analog Stereo'
+    assert sink_description('alsa_output.usb-headset', SINKS) is None
+
+
+def test_monitor_audio_schedules_one_refresh_per_relevant_event(service):
+    service.monitor_audio([
+        "Event 'new' on sink-input #112\n",
+        "Event 'change' on sink #60\n",
+        "Event 'change' on source #52\n",
+        "Event 'change' on server #-1\n",
+    ])
+
+    assert service.dispatch.calls == [('schedule_refresh', ('audio',)), ('schedule_refresh', ('audio',))]
+
+
+@pytest.mark.parametrize('member, parameters, source, expected', [
+    ('PropertiesChanged', None, 'wifi', ['wifi']),
+    ('InterfacesRemoved', None, 'bluetooth', ['bluetooth']),
+    ('NameOwnerChanged', (BLUEZ_NAME, ':1.4', ''), None, ['bluetooth']),
+    ('NameOwnerChanged', (NM_NAME, '', ':1.9'), None, ['wifi']),
+    ('NameOwnerChanged', ('org.freedesktop.Notifications', '', ':1.12'), None, []),
+])
+def test_dbus_signals_schedule_the_affected_source(service, member, parameters, source, expected):
+    scheduled = []
+    service.schedule_refresh = lambda *sources: scheduled.extend(sources)
+    variant = GLib.Variant('(sss)', parameters) if parameters is not None else None
+
+    service.on_dbus_signal(None, ':1.1', '/', 'org.freedesktop.DBus', member, variant, source)
+
+    assert scheduled == expected
+
+
+def test_signals_are_coalesced_into_one_refresh(service):
+    service.refresh_bluetooth = lambda: 'Auriculares'
+    service.refresh_wifi = lambda: 'casa'
+    service.refresh_audio = lambda: pytest.fail("audio no ha cambiado")
+
+    service.schedule_refresh('wifi')
+    source = service.flush_source
+    service.schedule_refresh('bluetooth')
+    service.schedule_refresh('wifi')
+    assert service.flush_source == source
+
+    GLib.source_remove(source)
+    service.refresh_sources(service.pending)
+
+    assert service.dispatch.calls == [('publish', ({'bluetooth': 'Auriculares', 'wifi': 'casa'},))]
+
+
+def test_publish_notifies_listeners_only_when_the_state_changes(service):
+    states = []
+    service.add_listener(states.append)
+
+    service.publish({'wifi': 'casa'})
+    service.publish({'wifi': 'casa'})
+    service.publish({'bluetooth': 'Auriculares'})
+
+    assert states == [
+        ConnectivityState(UNKNOWN, 'casa', UNKNOWN),
+        ConnectivityState('Auriculares', 'casa', UNKNOWN),
+    ]
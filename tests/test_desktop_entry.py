@@ -0,0 +1,171 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from desktop_entry import PARALLEL_THRESHOLD, parse_desktop_entries, parse_desktop_entry, preferred_locales, unescape
+
+
+def write(tmp_path, content, name="app.desktop"):
+    path = tmp_path / name
+    path.write_bytes(content.encode('utf-8') if isinstance(content, str) else content)
+    return str(path)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ("Mi\\sEditor", "Mi Editor"),
+    ("línea\\nsiguiente", "línea\nsiguiente"),
+    ("a\\tb", "a\tb"),
+    ("C:\\\\ruta", "C:\\ruta"),
+    ("uno\\;dos;tres;", "uno\\;dos;tres;"),
+    ("sin escapes", "sin escapes"),
+    ("final\\", "final\\"),
+])
+def test_unescape(value, expected):
+    assert unescape(value) == expected
+
+
+def test_escapes_are_resolved_in_values(tmp_path):
+    path = write(tmp_path, "[Desktop Entry]\nName=Mi\\sEditor\\tde\\\\texto\nExec=editor\n")
+
+    values, error = parse_desktop_entry(path)
+
+    assert error is None
+    assert values["Name"] == "Mi Editor\tde\\texto"
+
+
+@pytest.mark.parametrize('environ, expected', [
+    ({'LANG': 'sr_RS.UTF-8@latin'}, ('sr_RS@latin', 'sr_RS', 'sr@latin', 'sr')),
+    ({'LANG': 'es_ES.UTF-8'}, ('es_ES', 'es')),
+    ({'LANG': 'de@euro'}, ('de@euro', 'de')),
+    ({'LANG': 'es_ES.UTF-8', 'LC_MESSAGES': 'fr_FR.UTF-8'}, ('fr_FR', 'fr')),
+    ({'LANG': 'es_ES.UTF-8', 'LC_ALL': 'C.UTF-8'}, ()),
+    ({}, ()),
+])
+def test_preferred_locales(environ, expected):
+    assert preferred_locales(environ) == expected
+
+
+NAMES = (
+    "[Desktop Entry]\n"
+    "Name=Settings\n"
+    "Name[sr]=Podešavanja (sr)\n"
+    "Name[sr@latin]=Podešavanja (sr@latin)\n"
+    "Name[sr_RS]=Podešavanja (sr_RS)\n"
+    "Name[sr_RS@latin]=Podešavanja (sr_RS@latin)\n"
+    "Name[fr]=Paramètres\n"
+    "Exec=settings\n"
+)
+
+
+@pytest.mark.parametrize('lang, expected', [
+    ('sr_RS.UTF-8@latin', "Podešavanja (sr_RS@latin)"),
+    ('sr_RS.UTF-8', "Podešavanja (sr_RS)"),
+    ('sr_ME.UTF-8@latin', "Podešavanja (sr@latin)"),
+    ('sr_ME.UTF-8', "Podešavanja (sr)"),
+    ('de_DE.UTF-8', "Settings"),
+    ('C', "Settings"),
+])
+def test_localized_key_fallback_order(tmp_path, lang, expected):
+    path = write(tmp_path, NAMES)
+
+    values, _ = parse_desktop_entry(path, preferred_locales({'LANG': lang}))
+
+    assert values["Name"] == expected
+
+
+def test_localized_value_before_the_unlocalized_key(tmp_path):
+    path = write(tmp_path, "[Desktop Entry]\nName[es]=Editor de texto\nName=Text Editor\nExec=editor\n")
+
+    values, _ = parse_desktop_entry(path, ('es_ES', 'es'))
+
+    assert values["Name"] == "Editor de texto"
+
+
+def test_parsing_stops_at_the_next_group(tmp_path):
+    path = write(tmp_path, (
+        "[Desktop Entry]\nName=Navegador\nExec=browser %u\n"
+        "[Desktop Action new-window]\nName=Nueva ventana\nExec=browser --new-window\n"
+        "esto no es una línea válida\n"
+    ))
+
+    values, error = parse_desktop_entry(path, keys=("Name", "Exec", "Icon"))
+
+    assert error is None
+    assert values == {"Name": "Navegador", "Exec": "browser %u"}
+
+
+def test_comments_blank_lines_and_spacing(tmp_path):
+    path = write(tmp_path, (
+        "# Comentario antes del grupo\n\n"
+        "[Desktop Entry]\n"
+        "  # Comentario sangrado\n"
+        "\n"
+        "Name = Reproductor\n"
+        "Exec=player\n"
+        "Icon=  player-icon\n"
+    ))
+
+    values, error = parse_desktop_entry(path)
+
+    assert error is None
+    assert values == {"Name": "Reproductor", "Exec": "player", "Icon": "player-icon"}
+
+
+@pytest.mark.parametrize('content', [
+    "Name=Sin grupo\n[Desktop Entry]\nExec=app\n",
+    "[Otro grupo]\nName=App\n",
+    "[Desktop Entry]\nName=App\nesto no es una clave\n",
+    "# sólo un comentario\n",
+    "",
+])
+def test_malformed_files_report_an_error(tmp_path, content):
+    values, error = parse_desktop_entry(write(tmp_path, content))
+
+    assert values is None
+    assert error
+
+
+def test_non_utf8_file_reports_the_line(tmp_path):
+    path = write(tmp_path, b"[Desktop Entry]\nName=Caf\xe9\nExec=cafe\n")
+
+    values, error = parse_desktop_entry(path)
+
+    assert values is None
+    assert "línea 2" in error
+
+
+def test_missing_file_reports_an_error(tmp_path):
+    values, error = parse_desktop_entry(str(tmp_path / "no-existe.desktop"))
+
+    assert values is None
+    assert error
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """
+    Pool de hilos que cuenta cuántas veces se crea.
+    """
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingExecutor.created += 1
+        super().__init__(*args, **kwargs)
+
+
+@pytest.mark.parametrize('count, uses_pool', [(PARALLEL_THRESHOLD - 1, False), (PARALLEL_THRESHOLD + 50, True)])
+def test_many_files_are_parsed_in_a_pool_in_order(tmp_path, count, uses_pool):
+    paths = []
+    for i in range(count):
+        content = b"[Desktop Entry]\nName=\xff\n" if i % 97 == 0 else f"[Desktop Entry]\nName=App {i}\nExec=app-{i}\n"
+        paths.append(write(tmp_path, content, f"app-{i}.desktop"))
+    CountingExecutor.created = 0
+
+    results = parse_desktop_entries(paths, executor_class=CountingExecutor, workers=4)
+
+    assert CountingExecutor.created == (1 if uses_pool else 0)
+    assert len(results) == count
+    for i, (values, error) in enumerate(results):
+        if i % 97 == 0:
+            assert values is None and error
+        else:
+            assert values["Name"] == f"App {i}"
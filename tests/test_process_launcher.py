@@ -0,0 +1,88 @@
+import sys
+import time
+
+import pytest
+
+from process_launcher import ProcessLauncher, expand_field_codes, parse_exec
+
+
+def test_latency_stats_without_launches():
+    assert ProcessLauncher().latency_stats() == {'count': 0, 'last_ms': None, 'p50_ms': None, 'max_ms': None}
+
+
+def test_latency_stats_after_launches():
+    launcher = ProcessLauncher()
+    for _ in range(3):
+        assert launcher.launch([sys.executable, "-c", "pass"]) is not None
+
+    stats = launcher.latency_stats()
+
+    assert stats['count'] == 3
+    assert 0 < stats['p50_ms'] <= stats['max_ms']
+    assert stats['last_ms'] <= stats['max_ms']
+
+
+def test_failed_launch_is_not_sampled():
+    launcher = ProcessLauncher()
+
+    assert launcher.launch(["/nonexistent/program"]) is None
+    assert launcher.latency_stats()['count'] == 0
+
+
+def test_children_are_reaped():
+    launcher = ProcessLauncher()
+    launcher.launch([sys.executable, "-c", "pass"])
+
+    deadline = time.monotonic() + 10
+    while launcher.running() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert launcher.running() == 0
+
+
+@pytest.mark.parametrize('exec_line, expected', [
+    ('firefox %u', ('firefox', '%u')),
+    ('  gimp\t--new-instance  ', ('gimp', '--new-instance')),
+    ('"/opt/My App/bin/app" --flag', ('/opt/My App/bin/app', '--flag')),
+    ('sh -c "echo \\"hola\\""', ('sh', '-c', 'echo "hola"')),
+    ('sh -c "echo \\`date\\` \\$HOME \\\\"', ('sh', '-c', 'echo `date` $HOME \\')),
+    ('app "" --empty', ('app', '', '--empty')),
+    ('app pre"fijo con"post', ('app', 'prefijo conpost')),
+])
+def test_parse_exec_quoting(exec_line, expected):
+    assert parse_exec(exec_line) == expected
+
+
+@pytest.mark.parametrize('exec_line', ['app "sin cerrar', '', '   \t'])
+def test_parse_exec_rejects_invalid_lines(exec_line):
+    with pytest.raises(ValueError):
+        parse_exec(exec_line)
+
+
+@pytest.mark.parametrize('template, files, expected', [
+    (('app', '%f'), ['/tmp/a'], ['app', '/tmp/a']),
+    (('app', '%f'), ['/tmp/a', '/tmp/b'], ['app', '/tmp/a']),
+    (('app', '%f'), [], ['app']),
+    (('app', '%u'), ['https://x'], ['app', 'https://x']),
+    (('app', '%F'), ['/tmp/a', '/tmp/b'], ['app', '/tmp/a', '/tmp/b']),
+    (('app', '%U'), [], ['app']),
+    (('app', '--file=%f'), ['/tmp/a'], ['app', '--file=/tmp/a']),
+])
+def test_expand_file_codes(template, files, expected):
+    assert expand_field_codes(template, files=files) == expected
+
+
+def test_expand_icon_code():
+    assert expand_field_codes(('app', '%i'), icon='app-icon') == ['app', '--icon', 'app-icon']
+    assert expand_field_codes(('app', '%i')) == ['app']
+
+
+def test_expand_name_desktop_file_and_percent():
+    template = ('app', '--title=%c', '%k', '100%%')
+
+    assert expand_field_codes(template, name="Editor", desktop_file="/usr/share/applications/app.desktop") == [
+        'app', '--title=Editor', '/usr/share/applications/app.desktop', '100%']
+
+
+@pytest.mark.parametrize('code', ['%d', '%D', '%n', '%N', '%v', '%m', '%x'])
+def test_deprecated_and_unknown_codes_are_dropped(code):
+    assert expand_field_codes(('app', code, f'--opt{code}')) == ['app', '--opt']
@@ -0,0 +1,81 @@
+import io
+import sys
+from collections import namedtuple
+
+import pytest
+
+from process_launcher import ProcessLauncher
+from providers import CommandProvider, ConnectivityProvider, command_argv
+
+State = namedtuple('State', ['bluetooth', 'wifi', 'audio'])
+
+
+class FakeCommandLoader:
+    """
+    Comandos de conectividad como los de .env, con algunos sin configurar.
+    """
+    con_update_cmd = None
+
+    def get_connectivity_commands(self):
+        return [
+            ("Bluetooth", None, "preferences-system-bluetooth"),
+            ("Wifi", "nm-connection-editor", "network-wireless"),
+            ("Audio", "", "audio-card"),
+        ]
+
+
+class FakeConnectivityService:
+    state = State("on", "casa", "Altavoces")
+
+
+class FakeUpdatesService:
+    def __init__(self, count):
+        self.count = count
+
+    def get_count(self):
+        return self.count
+
+
+class ClosedStdin(io.StringIO):
+    """
+    Entrada estándar que falla si alguien la lee.
+    """
+
+    def read(self, *args):
+        raise AssertionError("se ha leído la entrada estándar")
+
+    readline = read
+
+
+@pytest.fixture(autouse=True)
+def closed_stdin(monkeypatch):
+    monkeypatch.setattr(sys, 'stdin', ClosedStdin())
+
+
+def names(provider, text=""):
+    return [result.name for batch in provider.query(text) for result in batch]
+
+
+def test_command_provider_skips_unset_commands():
+    commands = [("Apagar", None, "system-shutdown"), ("Reiniciar", "", "system-reboot"), ("Bloquear sesión", "loginctl lock-session", "system-lock-screen")]
+    provider = CommandProvider("sys:", lambda: commands, lambda command: None)
+
+    assert names(provider) == ["Bloquear sesión"]
+
+
+def test_connectivity_provider_skips_unset_commands():
+    provider = ConnectivityProvider("con:", FakeCommandLoader(), FakeConnectivityService(), FakeUpdatesService(0), lambda command: None)
+
+    assert names(provider) == ["Wifi (casa)"]
+
+
+def test_connectivity_provider_skips_unset_update_command():
+    provider = ConnectivityProvider("con:", FakeCommandLoader(), FakeConnectivityService(), FakeUpdatesService(3), lambda command: None)
+
+    assert names(provider) == ["Wifi (casa)"]
+
+
+@pytest.mark.parametrize('command_line', [None, "", "   "])
+def test_empty_command_lines_are_rejected(command_line):
+    assert ProcessLauncher().launch_command(command_line) is None
+    assert command_argv(command_line) is None
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('dotenv')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def many_applications(tmp_path, monkeypatch):
+    """
+    Árbol XDG con más aplicaciones que el límite por defecto de la ventana.
+    """
+    applications = tmp_path / "share" / "applications"
+    applications.mkdir(parents=True)
+    for i in range(150):
+        (applications / f"app-{i}.desktop").write_text(f"[Desktop Entry]\nType=Application\nName=Aplicación {i}\nExec=app-{i}\n")
+    environ = dict(os.environ, XDG_DATA_HOME=str(tmp_path / "share"), XDG_DATA_DIRS=str(tmp_path / "none"),
+                   XDG_CACHE_HOME=str(tmp_path / "cache"), XDG_STATE_HOME=str(tmp_path / "state"))
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    return environ
+
+
+def query(environ, *args):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "query", *args], cwd=str(environ['XDG_DATA_HOME']),
+                          env=environ, capture_output=True, text=True)
+
+
+def test_limit_above_the_window_default(many_applications):
+    result = query(many_applications, "aplicacion", "--limit", "120")
+
+    assert result.returncode == 0
+    assert len(result.stdout.splitlines()) == 120
+
+
+def test_limit_below_the_window_default(many_applications):
+    result = query(many_applications, "aplicacion", "--limit", "3")
+
+    assert len(result.stdout.splitlines()) == 3
+
+
+def test_default_limit_matches_the_window(many_applications):
+    from search_index import DEFAULT_LIMIT
+
+    result = query(many_applications, "aplicacion")
+
+    assert len(result.stdout.splitlines()) == DEFAULT_LIMIT
+
+
+@pytest.mark.parametrize('limit', ["0", "-5"])
+def test_non_positive_limit_is_rejected(many_applications, limit):
+    result = query(many_applications, "aplicacion", "--limit", limit)
+
+    assert result.returncode == 2
+    assert "--limit" in result.stderr
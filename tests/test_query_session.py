@@ -0,0 +1,156 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from providers import ApplicationProvider
+from query_session import CACHE_SIZE, NARROW_MIN_LENGTH, QuerySession
+from search_index import SearchIndex
+from text_normalize import normalize
+
+WORDS = ["code", "term", "fire", "office", "media", "player", "studio", "viewer", "system", "monitor", "text", "edit"]
+
+
+class FakeManager:
+    """
+    Catálogo mínimo para la sesión: índice de búsqueda y orden alfabético.
+    """
+
+    def __init__(self, names, usage=None):
+        self.names = names
+        self.search_index = SearchIndex(names, usage=usage)
+        self.catalog = SimpleNamespace(order=sorted(range(len(names)), key=lambda i: names[i].lower()), names=names,
+                                       icons=[None] * len(names), desktop_ids=[f"{i}.desktop" for i in range(len(names))])
+        self.index_builds = 0
+        self.launched = []
+
+    def get_search_index(self):
+        self.index_builds += 1
+        return self.search_index
+
+    def launch(self, index):
+        self.launched.append(index)
+        self.search_index.set_usage(index, 50)
+        return 1234
+
+
+def cold(manager, text, limit):
+    """
+    Resultados de una consulta sin caché ni refinado.
+    """
+    return manager.search_index.search(normalize(text), limit)
+
+
+@pytest.fixture
+def manager():
+    rng = random.Random(3)
+    names = [" ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(1, 3))) + f" {i}" for i in range(400)]
+    return FakeManager(names, usage={rng.randrange(400): rng.uniform(0, 20) for _ in range(25)})
+
+
+def test_narrowed_queries_equal_cold_queries(manager):
+    session = QuerySession(manager, limit=20)
+    # Se escribe, se borra y se vuelve a escribir, como en la ventana
+    for text in ("t", "te", "ter", "term", "term ", "term m", "term mo", "term m", "term", "ter", "te", "tex", "text",
+                 "text e", "cod", "code", "codes", "co", "c", "sys", "syst", "system 1", "system 12"):
+        assert session.update(text) == cold(manager, text, 20), text
+
+
+def test_narrowing_uses_the_cached_prefix(manager, monkeypatch):
+    session = QuerySession(manager, limit=20)
+    session.update("ter")
+    candidates = []
+    original = manager.search_index.matches
+
+    def matches(query, parent=None):
+        candidates.append(parent)
+        return original(query, parent)
+
+    monkeypatch.setattr(manager.search_index, 'matches', matches)
+    session.update("term")
+
+    assert candidates and candidates[0] is not None
+    assert len(candidates[0]) < len(manager.names)
+
+
+def test_short_queries_are_not_used_to_narrow(manager):
+    session = QuerySession(manager, limit=5)
+    session.update("term"[:NARROW_MIN_LENGTH - 1])
+    session.update("term"[:NARROW_MIN_LENGTH])
+
+    short, narrowable = session.cache.values()
+    assert short[0] is None
+    assert narrowable[0] is not None
+
+
+def test_empty_query_lists_the_catalog_without_building_the_index(manager):
+    session = QuerySession(manager)
+
+    assert session.update("") == manager.catalog.order
+    assert manager.index_builds == 0
+
+
+def test_cache_is_bounded_lru(manager):
+    session = QuerySession(manager, limit=5)
+    queries = [f"{word} {i}" for word in WORDS for i in range(3)][:CACHE_SIZE + 1]
+
+    for query in queries:
+        session.update(query)
+
+    assert len(session.cache) == CACHE_SIZE
+    assert normalize(queries[0]) not in session.cache
+    assert list(session.cache)[-1] == normalize(queries[-1])
+
+
+def test_repeated_query_reuses_the_snapshot(manager):
+    session = QuerySession(manager)
+
+    first = session.update("edit")
+    assert session.update("Edit") is first
+
+
+def test_usage_change_invalidates_cached_queries():
+    manager = FakeManager(["Terminator", "GNOME Terminal", "Xterm"])
+    session = QuerySession(manager)
+    assert session.update("term") == [0, 1, 2]
+    session.update("termi")
+
+    manager.search_index.set_usage(1, 50)
+
+    assert session.update("termi") == [1, 0]
+    assert session.update("term") == [1, 0, 2]
+
+
+def test_usage_reset_invalidates_cached_queries():
+    manager = FakeManager(["Terminator", "GNOME Terminal"], usage={1: 50})
+    session = QuerySession(manager)
+    assert session.update("term") == [1, 0]
+
+    manager.search_index.reset_usage({})
+
+    assert session.update("term") == [0, 1]
+
+
+def test_new_index_invalidates_cached_queries():
+    manager = FakeManager(["Firefox", "Firewall"])
+    session = QuerySession(manager)
+    assert session.update("fire") == [0, 1]
+
+    manager.search_index = SearchIndex(["Firewall", "Campfire"])
+
+    assert session.update("fire") == [0, 1]
+    assert session.update("camp") == [1]
+
+
+def test_launch_resets_the_session():
+    manager = FakeManager(["Terminator", "GNOME Terminal"])
+    session = QuerySession(manager)
+    provider = ApplicationProvider(manager, session)
+    results = [result for batch in provider.query("term") for result in batch]
+    assert [result.name for result in results] == ["Terminator", "GNOME Terminal"]
+
+    results[1].action()
+
+    assert manager.launched == [1]
+    assert session.cache == {}
+    assert [result.name for batch in provider.query("term") for result in batch] == ["GNOME Terminal", "Terminator"]
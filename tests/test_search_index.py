@@ -0,0 +1,138 @@
+import random
+
+import pytest
+
+from search_index import MAX_USAGE_BOOST, SearchIndex, usage_boost
+from text_normalize import normalize, normalize_name
+
+
+def search(index, names, text, limit=10):
+    return [names[i] for i in index.search(normalize(text), limit)]
+
+
+def brute_force(index, text, limit):
+    """
+    Puntúa todas las entradas, sin índices ni cortes por nivel.
+    """
+    query = normalize(text)
+    return index.rank(index.matches(query, range(len(index.keys))), limit)
+
+
+def test_acronym_finds_visual_studio_code():
+    names = ["Devscripts Helper", "Visual Studio Code", "Vim", "Screenshot"]
+    index = SearchIndex(names)
+
+    assert search(index, names, "vsc") == ["Visual Studio Code", "Devscripts Helper"]
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Exacta, prefijo, inicio de palabra y subcadena, en ese orden
+    ("fire", ["Firefox", "Mozilla Firewall", "Campfire"]),
+    ("gimp", ["GIMP", "GIMP Console"]),
+    ("code", ["Code::Blocks", "Visual Studio Code", "Xcodebuild"]),
+])
+def test_tiers_rank_prefix_before_word_start_before_substring(text, expected):
+    names = ["Campfire", "Xcodebuild", "Visual Studio Code", "Mozilla Firewall", "Firefox", "GIMP Console", "GIMP",
+             "Code::Blocks"]
+    index = SearchIndex(names)
+
+    assert search(index, names, text) == expected
+
+
+def test_diacritics_and_case_are_ignored():
+    names = ["Configuración del sistema", "Calculadora"]
+    index = SearchIndex(names)
+
+    assert search(index, names, "CONFIGURACION") == ["Configuración del sistema"]
+    assert search(index, names, "sistéma") == ["Configuración del sistema"]
+
+
+def test_equal_scores_keep_catalog_order():
+    names = ["Editor B", "Editor A", "Editor C"]
+    index = SearchIndex(names)
+
+    assert search(index, names, "editor") == names
+
+
+def test_usage_boost_overtakes_one_tier_but_not_two():
+    names = ["Terminator", "GNOME Terminal", "Xterm"]
+    index = SearchIndex(names)
+    assert search(index, names, "term") == ["Terminator", "GNOME Terminal", "Xterm"]
+
+    index.set_usage(1, 50)
+    index.set_usage(2, 50)
+
+    # Inicio de palabra con uso adelanta al prefijo; la subcadena con uso no adelanta al prefijo
+    assert search(index, names, "term") == ["GNOME Terminal", "Terminator", "Xterm"]
+
+
+def test_usage_boost_is_bounded():
+    assert usage_boost(0) == 0
+    assert 0 < usage_boost(1) < usage_boost(10) < MAX_USAGE_BOOST
+    assert usage_boost(1e9) == pytest.approx(MAX_USAGE_BOOST)
+
+
+def test_small_usage_is_ignored_and_reset_replaces_boosts():
+    index = SearchIndex(["Firefox", "Files"], usage={0: 0.001, 1: 10})
+    assert list(index.boosts) == [1]
+
+    index.reset_usage({0: 10})
+    assert list(index.boosts) == [0]
+
+
+def test_bounded_search_matches_a_full_sort():
+    rng = random.Random(7)
+    words = ["code", "term", "fire", "office", "media", "player", "studio", "viewer", "system", "monitor", "text"]
+    names = [" ".join(rng.choice(words).capitalize() for _ in range(rng.randint(1, 3))) + f" {i}" for i in range(500)]
+    index = SearchIndex(names, usage={rng.randrange(500): rng.uniform(0, 20) for _ in range(30)})
+
+    for text in ("c", "co", "cod", "te", "term", "st", "mp", "tv", "ofi", "med pl", "9"):
+        for limit in (1, 5, 20, None):
+            assert index.search(normalize(text), limit) == brute_force(index, text, limit), (text, limit)
+
+
+def test_update_replaces_the_key():
+    names = ["Firefox", "Chromium"]
+    index = SearchIndex(names)
+
+    names[0] = "LibreWolf"
+    index.update(0, normalize_name(names[0]))
+
+    assert search(index, names, "fire") == []
+    assert search(index, names, "wolf") == ["LibreWolf"]
+    assert search(index, names, "lw") == ["LibreWolf"]
+
+
+def test_update_adds_new_entries():
+    names = ["Firefox"]
+    index = SearchIndex(names)
+
+    names.append("Firewall")
+    index.update(1, normalize_name("Firewall"))
+
+    assert search(index, names, "fire") == ["Firefox", "Firewall"]
+    assert index.search("", None) == [0, 1]
+
+
+def test_removed_entry_never_comes_back():
+    names = ["Firefox", "Firewall", "Campfire"]
+    index = SearchIndex(names, usage={0: 20})
+
+    index.remove(0)
+    # Otros cambios del índice no deben resucitar la entrada
+    index.update(1, normalize_name("Firewall Config"))
+    index.update(3, normalize_name("Fireplace"))
+    names[1:] = ["Firewall Config", "Campfire", "Fireplace"]
+
+    assert 0 not in index.search("", None)
+    for text in ("f", "fi", "fire", "firefox", "ff"):
+        assert 0 not in index.search(normalize(text), None), text
+        assert 0 not in [i for _, i in index.matches(normalize(text))], text
+    assert 0 not in index.boosts
+
+
+def test_holes_are_skipped():
+    index = SearchIndex(["Firefox", None, "Files"])
+
+    assert index.search("", None) == [0, 2]
+    assert index.search("fi", None) == [2, 0]
@@ -0,0 +1,152 @@
+import threading
+import time
+
+import pytest
+
+from status_sampler import StatusSampler, UNKNOWN_VALUE
+
+
+class FakeProbe:
+    """
+    Sonda que cuenta sus llamadas y devuelve el valor indicado.
+    """
+
+    def __init__(self, value="1"):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+class Recorder:
+    """
+    Sustituto de GLib.idle_add: ejecuta la llamada en el acto y guarda las instantáneas.
+    """
+
+    def __init__(self):
+        self.snapshots = []
+        self.changed = threading.Event()
+
+    def dispatch(self, function, *args):
+        function(*args)
+
+    def on_snapshot(self, snapshot):
+        self.snapshots.append(snapshot)
+        self.changed.set()
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "la condición no se ha cumplido a tiempo"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def probes():
+    return {'battery': FakeProbe("80%"), 'cpu': FakeProbe("5%"), 'memory': FakeProbe("40%"), 'updates': FakeProbe("0")}
+
+
+@pytest.fixture
+def make_sampler(probes):
+    samplers = []
+
+    def make(intervals, coalesce_window=0.0, paused=False):
+        recorder = Recorder()
+        sampler = StatusSampler(probes, recorder.on_snapshot, recorder.dispatch, intervals=intervals,
+                                coalesce_window=coalesce_window)
+        if paused:
+            sampler.pause()
+        sampler.start()
+        samplers.append(sampler)
+        return sampler, recorder
+
+    yield make
+    for sampler in samplers:
+        sampler.stop()
+
+
+def test_first_wakeup_samples_every_probe(make_sampler, probes):
+    sampler, recorder = make_sampler({name: 3600 for name in probes})
+
+    wait_until(lambda: recorder.snapshots)
+
+    assert sampler.wakeups == 1
+    assert recorder.snapshots[0] == ("80%", "5%", "40%", "0")
+    assert all(probe.calls == 1 for probe in probes.values())
+
+
+def test_probes_run_at_their_own_interval(make_sampler, probes):
+    sampler, _ = make_sampler({'battery': 3600, 'cpu': 0.02, 'memory': 3600, 'updates': 3600})
+
+    wait_until(lambda: probes['cpu'].calls >= 5)
+
+    assert sampler.wakeups >= 5
+    assert probes['battery'].calls == probes['memory'].calls == probes['updates'].calls == 1
+
+
+def test_close_deadlines_share_a_wakeup(make_sampler, probes):
+    sampler, _ = make_sampler({'battery': 3600, 'cpu': 0.1, 'memory': 0.12, 'updates': 3600}, coalesce_window=0.05)
+
+    wait_until(lambda: probes['cpu'].calls >= 4)
+
+    # cpu y memory vencen con 20 ms de diferencia: cada despertar ejecuta las dos
+    assert abs(probes['cpu'].calls - probes['memory'].calls) <= 1
+    assert sampler.wakeups <= probes['cpu'].calls + 1
+
+
+def test_paused_sampler_does_not_wake_up(make_sampler, probes):
+    sampler, recorder = make_sampler({name: 0.01 for name in probes}, paused=True)
+
+    time.sleep(0.1)
+    sampler.request_sample('updates')
+    time.sleep(0.05)
+
+    assert sampler.wakeups == 0
+    assert recorder.snapshots == []
+    assert all(probe.calls == 0 for probe in probes.values())
+
+
+def test_pause_stops_wakeups_and_resume_refreshes_everything(make_sampler, probes):
+    sampler, recorder = make_sampler({'battery': 3600, 'cpu': 0.01, 'memory': 3600, 'updates': 3600})
+    wait_until(lambda: sampler.wakeups >= 3)
+
+    sampler.pause()
+    time.sleep(0.05)
+    paused_wakeups = sampler.wakeups
+    time.sleep(0.1)
+    assert sampler.wakeups == paused_wakeups
+
+    calls = {name: probe.calls for name, probe in probes.items()}
+    sampler.resume()
+    wait_until(lambda: all(probe.calls > calls[name] for name, probe in probes.items()))
+    assert sampler.wakeups > paused_wakeups
+
+
+def test_requested_probe_runs_before_its_interval(make_sampler, probes):
+    sampler, recorder = make_sampler({name: 3600 for name in probes})
+    wait_until(lambda: recorder.snapshots)
+
+    probes['updates'].value = "12"
+    recorder.changed.clear()
+    sampler.request_sample('updates')
+
+    assert recorder.changed.wait(5)
+    assert recorder.snapshots[-1].updates == "12"
+    assert sampler.wakeups == 2
+    assert probes['updates'].calls == 2
+    assert probes['cpu'].calls == probes['battery'].calls == probes['memory'].calls == 1
+
+
+def test_failing_probe_shows_unknown_value(make_sampler, probes):
+    def broken():
+        raise OSError("sin acceso")
+    probes['battery'] = broken
+    sampler, recorder = make_sampler({name: 3600 for name in probes})
+
+    wait_until(lambda: recorder.snapshots)
+
+    assert recorder.snapshots[0].battery == UNKNOWN_VALUE
+    assert recorder.snapshots[0].cpu == "5%"
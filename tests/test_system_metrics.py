@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from system_metrics import BatteryStatus, SystemMetrics
+
+MEMINFO = """MemTotal:       16000000 kB
+MemFree:         2000000 kB
+MemAvailable:    4000000 kB
+Buffers:          500000 kB
+Cached:          3000000 kB
+"""
+
+
+def write(root, relative_path, text):
+    """
+    Escribe un fichero del procfs/sysfs falso, sobrescribiéndolo en su sitio como hace el núcleo.
+    """
+    path = os.path.join(root, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def stat_line(name, user, idle, iowait=0):
+    return f"{name} {user} 0 0 {idle} {iowait} 0 0 0 0 0\n"
+
+
+def add_supply(root, name, supply_type, capacity=None, status=None):
+    supply = os.path.join('sys', 'class', 'power_supply', name)
+    write(root, os.path.join(supply, 'type'), f"{supply_type}\n")
+    if capacity is not None:
+        write(root, os.path.join(supply, 'capacity'), f"{capacity}\n")
+    if status is not None:
+        write(root, os.path.join(supply, 'status'), f"{status}\n")
+
+
+@pytest.fixture
+def root(tmp_path):
+    write(tmp_path, 'proc/stat', stat_line('cpu', 100, 900) + stat_line('cpu0', 50, 450) + stat_line('cpu1', 50, 450)
+          + "intr 12345\n")
+    write(tmp_path, 'proc/meminfo', MEMINFO)
+    return str(tmp_path)
+
+
+def test_cpu_load_is_the_delta_since_the_previous_sample(root):
+    metrics = SystemMetrics(root)
+    # cpu0 pasa 30 de 100 ticks ocupada y cpu1 10 de 100 (con 10 de iowait, que cuenta como ociosa)
+    write(root, 'proc/stat', stat_line('cpu', 140, 1050, 10) + stat_line('cpu0', 80, 520) + stat_line('cpu1', 60, 530, 10)
+          + "intr 12400\n")
+
+    load = metrics.cpu_load()
+
+    assert load.total == pytest.approx(20.0)
+    assert load.per_cpu == pytest.approx((30.0, 10.0))
+    metrics.close()
+
+
+def test_cpu_load_without_elapsed_ticks_is_unknown(root):
+    metrics = SystemMetrics(root)
+
+    load = metrics.cpu_load()
+
+    assert load.total is None
+    assert load.per_cpu == (None, None)
+    metrics.close()
+
+
+def test_memory_status_uses_mem_available(root):
+    memory = SystemMetrics(root).memory_status()
+
+    assert memory.total_kb == 16000000
+    assert memory.available_kb == 4000000
+    assert memory.used_percent == pytest.approx(75.0)
+
+
+def test_memory_status_without_mem_available_adds_free_buffers_and_cache(root):
+    write(root, 'proc/meminfo', "\n".join(line for line in MEMINFO.splitlines() if not line.startswith('MemAvailable')))
+
+    memory = SystemMetrics(root).memory_status()
+
+    assert memory.available_kb == 2000000 + 500000 + 3000000
+    assert memory.used_percent == pytest.approx(65.625)
+
+
+def test_battery_status_averages_batteries_and_ignores_other_supplies(root):
+    add_supply(root, 'AC', 'Mains')
+    add_supply(root, 'BAT0', 'Battery', 80, 'Discharging')
+    add_supply(root, 'BAT1', 'Battery', 60, 'Charging')
+
+    assert SystemMetrics(root).battery_status() == BatteryStatus(70.0, 'Discharging')
+
+
+def test_battery_status_is_none_without_batteries(root):
+    add_supply(root, 'AC', 'Mains')
+
+    metrics = SystemMetrics(root)
+
+    assert metrics.battery_dirs == []
+    assert metrics.battery_status() is None
+    assert metrics.snapshot().battery is None
+
+
+def test_battery_status_skips_unreadable_batteries(root):
+    # BAT0 sin fichero capacity y BAT1 con un valor no numérico: sólo cuenta BAT2
+    add_supply(root, 'BAT0', 'Battery', status='Unknown')
+    add_supply(root, 'BAT1', 'Battery', 'n/a', 'Charging')
+    add_supply(root, 'BAT2', 'Battery', 90, 'Full')
+
+    metrics = SystemMetrics(root)
+
+    assert metrics.battery_status() == BatteryStatus(90.0, 'Full')
+    metrics.close()
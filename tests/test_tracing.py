@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+
+import pytest
+
+from startup_profiler import StartupProfiler
+from tracing import Recorder, Tracer
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("filter"):
+        pass
+    tracer.count("rows_built", 3)
+
+    assert list(tracer.events) == []
+    assert tracer.counters == {}
+
+
+def test_dump_writes_summaries(tmp_path, capsys):
+    output = tmp_path / "traza.json"
+    tracer = Tracer()
+    tracer.enable(str(output))
+    with tracer.span("filter"):
+        pass
+    stats = {'count': 2, 'last_ms': 1.5, 'p50_ms': 1.5, 'max_ms': 2.0}
+
+    tracer.dump({'launch_latency': stats})
+    tracer.dump({'launch_latency': stats})
+
+    trace = json.loads(output.read_text())
+    assert trace['otherData'] == {'launch_latency': stats}
+    assert [event['name'] for event in trace['traceEvents'] if event['ph'] == 'X'] == ["filter"]
+    assert capsys.readouterr().out.count("launch_latency: count 2, last_ms 1.5, p50_ms 1.5, max_ms 2.0") == 1
+
+
+def test_counters_from_several_threads():
+    tracer = Tracer()
+    tracer.enable()
+
+    def work():
+        for _ in range(1000):
+            tracer.count("results_returned", 2)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tracer.counters["results_returned"] == 16000
+    values = [value for phase, name, _, value, _, _ in tracer.events if phase == 'C']
+    assert sorted(values) == values
+
+
+def test_startup_profiler_shares_the_recorder_behaviour(tmp_path):
+    output = tmp_path / "arranque.json"
+    profiler = StartupProfiler()
+    assert profiler.phase("config") is Tracer().span("filter")
+
+    profiler.enable(str(output), origin=time.perf_counter())
+    with profiler.phase("config"):
+        pass
+    profiler.mark("first_frame")
+    profiler.dump()
+    profiler.mark("after_dump")
+    profiler.dump()
+
+    report = json.loads(output.read_text())
+    assert [phase['name'] for phase in report['phases']] == ["config"]
+    assert list(report['marks']) == ["first_frame"]
+
+
+def test_recorder_requires_record_and_write():
+    class Incomplete(Recorder):
+        def record(self, name, start, end, *args):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_write_replaces_the_trace_while_running(tmp_path):
+    output = tmp_path / "traza.json"
+    tracer = Tracer()
+    tracer.enable(str(output))
+    with tracer.span("filter"):
+        pass
+    tracer.write()
+    with tracer.span("show_results"):
+        pass
+    tracer.write()
+
+    trace = json.loads(output.read_text())
+    assert [event['name'] for event in trace['traceEvents'] if event['ph'] == 'X'] == ["filter", "show_results"]
@@ -0,0 +1,187 @@
+import os
+import stat
+import threading
+
+import pytest
+
+from updates_service import (RETRY_DELAY, AptBackend, CheckupdatesBackend, DnfBackend, PacmanBackend, UpdatesBackend,
+                             UpdatesService, get_backend)
+
+
+class FakeClock:
+    """
+    Reloj controlado por la prueba.
+    """
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBackend(UpdatesBackend):
+    """
+    Backend que devuelve los recuentos indicados o lanza sus errores, en orden.
+    """
+    name = 'fake'
+    command = ('fake-updates',)
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def count(self):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def fake_executable(directory, name, output, exit_code=0):
+    """
+    Crea en directory un ejecutable que escribe output y sale con exit_code.
+
+    Sólo usa órdenes internas del shell, porque PATH apunta únicamente a directory.
+    """
+    path = os.path.join(directory, name)
+    output_path = f"{path}.out"
+    with open(output_path, 'w') as f:
+        f.write(output)
+    with open(path, 'w') as f:
+        f.write(f"#!/bin/sh\nwhile IFS= read -r line; do echo \"$line\"; done < '{output_path}'\nexit {exit_code}\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+def wait_for_refresh(service):
+    """
+    Espera al refresco en curso, si lo hay, sin lanzar otro.
+    """
+    done = service.in_flight
+    if done is not None:
+        assert done.wait(5)
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / 'updates.json')
+
+
+def test_count_is_cached_until_the_ttl_expires(state_path):
+    clock = FakeClock()
+    backend = FakeBackend(3, 5)
+    service = UpdatesService(backend, ttl=60, state_path=state_path, clock=clock)
+
+    assert service.refresh(wait=True, timeout=5) == 3
+    clock.now += 59
+    assert not service.is_stale()
+    assert service.get_count() == 3
+    assert backend.calls == 1
+
+    clock.now += 1
+    assert service.is_stale()
+    # La lectura no bloquea: devuelve el valor anterior y refresca en segundo plano
+    assert service.get_count() == 3
+    wait_for_refresh(service)
+    assert service.count == 5
+    assert backend.calls == 2
+
+
+def test_failing_backend_keeps_the_last_count_and_retries_later(state_path):
+    clock = FakeClock()
+    backend = FakeBackend(4, RuntimeError("sin red"), 6)
+    service = UpdatesService(backend, ttl=3600, state_path=state_path, clock=clock)
+    service.refresh(wait=True, timeout=5)
+
+    clock.now += 3600
+    assert service.refresh(wait=True, timeout=5) == 4
+    assert service.next_check == clock.now + RETRY_DELAY
+
+    clock.now += RETRY_DELAY
+    assert service.refresh(wait=True, timeout=5) == 6
+
+
+def test_listeners_only_receive_successful_refreshes(state_path):
+    received = []
+    service = UpdatesService(FakeBackend(RuntimeError("fallo"), 2), state_path=state_path, clock=FakeClock())
+    service.add_listener(received.append)
+
+    service.refresh(wait=True, timeout=5)
+    service.refresh(wait=True, timeout=5)
+
+    assert received == [2]
+
+
+def test_concurrent_refreshes_share_one_query(state_path):
+    release = threading.Event()
+
+    class SlowBackend(FakeBackend):
+        def count(self):
+            release.wait(5)
+            return super().count()
+
+    backend = SlowBackend(7)
+    service = UpdatesService(backend, state_path=state_path, clock=FakeClock())
+    service.refresh()
+    service.refresh()
+    release.set()
+
+    assert service.refresh(wait=True, timeout=5) == 7
+    assert backend.calls == 1
+
+
+def test_last_count_is_restored_for_the_same_backend(state_path):
+    clock = FakeClock()
+    UpdatesService(FakeBackend(9), ttl=60, state_path=state_path, clock=clock).refresh(wait=True, timeout=5)
+
+    restored = UpdatesService(FakeBackend(), ttl=60, state_path=state_path, clock=clock)
+    assert restored.count == 9
+    assert not restored.is_stale()
+
+    other = UpdatesService(AptBackend(), ttl=60, state_path=state_path, clock=clock)
+    assert other.count == 0
+
+
+def test_without_backend_nothing_is_queried(state_path):
+    service = UpdatesService(None, state_path=state_path)
+
+    assert not service.is_stale()
+    assert service.get_count() == 0
+
+
+def test_backend_is_detected_from_path(tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', str(tmp_path))
+    assert get_backend() is None
+
+    fake_executable(tmp_path, 'pacman', "")
+    assert isinstance(get_backend(), PacmanBackend)
+
+    fake_executable(tmp_path, 'checkupdates', "")
+    assert isinstance(get_backend(), CheckupdatesBackend)
+    assert isinstance(get_backend('dnf'), DnfBackend)
+    assert get_backend('zypper') is None
+
+
+@pytest.mark.parametrize('backend, output, exit_code, expected', [
+    (CheckupdatesBackend(), "linux 6.1-1 -> 6.2-1\nfirefox 120-1 -> 121-1\n", 0, 2),
+    (CheckupdatesBackend(), "", 2, 0),
+    (PacmanBackend(), "", 1, 0),
+    (AptBackend(), "Listing...\nvim/stable 2:9.0 amd64 [upgradable from: 2:8.2]\n", 0, 1),
+    (DnfBackend(), "\nkernel.x86_64 6.2-1 updates\nvim.x86_64 9.0-1 updates\nObsoleting Packages\nold.x86_64 1-1 updates\n", 100, 2),
+])
+def test_backends_parse_the_output_of_fake_executables(tmp_path, monkeypatch, backend, output, exit_code, expected):
+    monkeypatch.setenv('PATH', str(tmp_path))
+    fake_executable(tmp_path, backend.command[0], output, exit_code)
+
+    assert backend.available()
+    assert backend.count() == expected
+
+
+def test_backend_error_exit_code_raises(tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', str(tmp_path))
+    fake_executable(tmp_path, 'checkupdates', "", 1)
+
+    with pytest.raises(RuntimeError):
+        CheckupdatesBackend().count()
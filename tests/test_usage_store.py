@@ -0,0 +1,92 @@
+import multiprocessing
+
+import pytest
+
+from usage_store import HALF_LIFE, LOG_HEADER, UsageStore
+
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "state" / "usage.log")
+
+
+def test_score_halves_after_half_life(log_path):
+    store = UsageStore(log_path)
+    store.record("firefox.desktop", NOW)
+
+    assert store.score("firefox.desktop", NOW) == pytest.approx(1)
+    assert store.score("firefox.desktop", NOW + HALF_LIFE) == pytest.approx(0.5)
+    assert store.score("unknown.desktop", NOW) == 0
+
+
+def test_launches_survive_reload(log_path):
+    store = UsageStore(log_path)
+    for offset in range(3):
+        store.record("firefox.desktop", NOW + offset)
+
+    reloaded = UsageStore(log_path)
+    reloaded.load()
+
+    assert reloaded.score("firefox.desktop", NOW + 2) == pytest.approx(store.score("firefox.desktop", NOW + 2))
+
+
+def test_compaction_rewrites_one_line_per_entry(log_path):
+    store = UsageStore(log_path, compact_threshold=4)
+    for offset in range(10):
+        store.record(f"app-{offset % 2}.desktop", NOW + offset)
+
+    with open(log_path) as f:
+        lines = f.read().splitlines()
+
+    assert lines[0].startswith(LOG_HEADER)
+    assert len(lines) <= 1 + 2 + 4
+    reloaded = UsageStore(log_path)
+    reloaded.load()
+    assert sum(reloaded.scores(NOW + 9).values()) == pytest.approx(sum(store.scores(NOW + 9).values()))
+
+
+def test_compaction_keeps_launches_of_other_processes(log_path):
+    daemon = UsageStore(log_path)
+    daemon.record("firefox.desktop", NOW)
+    other = UsageStore(log_path)
+    other.load()
+
+    # Otro proceso añade lanzamientos que el demonio no ha leído
+    other.record("gimp.desktop", NOW + 1)
+    other.record("gimp.desktop", NOW + 2)
+    daemon.record("firefox.desktop", NOW + 3)
+    daemon.compact(NOW + 4)
+
+    reloaded = UsageStore(log_path)
+    reloaded.load()
+    scores = reloaded.scores(NOW + 4)
+    assert scores["gimp.desktop"] > 1.9
+    assert scores["firefox.desktop"] > 1.9
+    assert daemon.score("gimp.desktop", NOW + 4) > 1.9
+
+
+def record_many(path, desktop_id, count):
+    store = UsageStore(path, compact_threshold=7)
+    store.load()
+    for offset in range(count):
+        store.record(desktop_id, NOW + offset)
+
+
+def test_concurrent_writers_lose_no_launches(log_path):
+    UsageStore(log_path).compact(NOW)
+    context = multiprocessing.get_context('fork')
+    writers = [context.Process(target=record_many, args=(log_path, f"app-{i}.desktop", 40)) for i in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join(30)
+        assert writer.exitcode == 0
+
+    reloaded = UsageStore(log_path)
+    reloaded.load()
+    scores = reloaded.scores(NOW + 39)
+    for i in range(4):
+        # 40 lanzamientos en 40 segundos: apenas decaen
+        assert scores[f"app-{i}.desktop"] == pytest.approx(40, rel=1e-3)
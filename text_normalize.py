@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+
+import locale
+import re
+import unicodedata
+
+# Separa palabras por caracteres no alfanuméricos y por cambios camelCase
+WORD_RE = re.compile(r'[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])|[^\W_]+')
+
+# Indica si ya se ha intentado activar la ordenación del locale del usuario
+_collation_ready = False
+# Indica si el locale activo ordena mejor que la comparación por código (no es C/POSIX)
+_use_strxfrm = False
+
+
+def strip_diacritics(text):
+    """
+    Elimina los diacríticos descomponiendo el texto en NFKD.
+
+    Args:
+        text (str): Texto original.
+
+    Returns:
+        str: Texto sin marcas combinantes ("Configuración" -> "Configuracion").
+    """
+    if text.isascii():
+        return text
+    return ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+
+
+def normalize(text):
+    """
+    Normaliza un texto para compararlo: sin diacríticos y con casefold.
+
+    Args:
+        text (str): Texto original (nombre o consulta).
+
+    Returns:
+        str: Texto normalizado.
+    """
+    if text.isascii():
+        return text.lower()
+    return strip_diacritics(text).casefold()
+
+
+def normalize_name(name):
+    """
+    Normaliza un nombre y calcula dónde empieza cada palabra en la clave resultante.
+
+    Las palabras se separan antes del casefold, para respetar los cambios
+    camelCase, y después de quitar los diacríticos, para que una letra
+    acentuada no parta una palabra en dos.
+
+    Args:
+        name (str): Nombre original.
+
+    Returns:
+        tuple: (clave normalizada, tupla de posiciones de inicio de palabra en la clave).
+    """
+    stripped = strip_diacritics(name)
+    if stripped.isascii() and len(stripped.lower()) == len(stripped):
+        return stripped.lower(), tuple(match.start() for match in WORD_RE.finditer(stripped))
+
+    # Casefold puede cambiar la longitud ("ß" -> "ss"): se normaliza por tramos
+    parts = []
+    starts = []
+    length = 0
+    last = 0
+    for match in WORD_RE.finditer(stripped):
+        separator = stripped[last:match.start()].casefold()
+        word = match.group().casefold()
+        parts.append(separator)
+        length += len(separator)
+        starts.append(length)
+        parts.append(word)
+        length += len(word)
+        last = match.end()
+    parts.append(stripped[last:].casefold())
+    return ''.join(parts), tuple(starts)
+
+
+def collation_key(text):
+    """
+    Calcula la clave de ordenación de un texto según el locale del usuario.
+
+    Args:
+        text (str): Texto original.
+
+    Returns:
+        tuple: Clave comparable. Con el locale C se ordena por la forma
+        normalizada, que al menos no separa mayúsculas de minúsculas.
+    """
+    global _collation_ready, _use_strxfrm
+    if not _collation_ready:
+        _collation_ready = True
+        try:
+            locale.setlocale(locale.LC_COLLATE, '')
+            # Con C/POSIX (o C.UTF-8) strxfrm ordena por código y pone las mayúsculas delante
+            _use_strxfrm = locale.strxfrm('a') < locale.strxfrm('B')
+        except (locale.Error, OSError, ValueError) as e:
+            print(f"Ordenación del locale no disponible: {e}")
+
+    if _use_strxfrm:
+        try:
+            return locale.strxfrm(text), text
+        except (OSError, ValueError):
+            pass
+    return normalize(text), text
@@ -0,0 +1,296 @@
+#!/usr/bin/python3
+
+import configparser
+import os
+
+import gi
+gi.require_version('Gtk', '4.0')
+from gi.repository import Gdk, Gio, GLib, Gtk
+
+# Tema base: se carga siempre, por debajo del tema elegido
+BASE_THEME = "style"
+# Capas de estilo y su prioridad; cada una tiene un único CssProvider cuyo contenido se sustituye
+LAYERS = (
+    ('base', Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION),
+    ('theme', Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 1),
+)
+# Sección y clave del tema elegido en config.ini
+CONFIG_SECTION = 'Settings'
+CONFIG_KEY = 'theme'
+# Eventos tras los que el archivo vigilado tiene contenido nuevo (escritura directa o guardado por renombrado)
+RELOAD_EVENTS = (
+    Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+    Gio.FileMonitorEvent.CREATED,
+    Gio.FileMonitorEvent.MOVED_IN,
+    Gio.FileMonitorEvent.RENAMED,
+)
+
+
+def install_dir():
+    """
+    Devuelve el directorio de instalación del lanzador (el de este módulo).
+    """
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def config_dir(environ=None):
+    """
+    Devuelve el directorio de configuración del usuario según la especificación XDG Base Directory.
+
+    Args:
+        environ (dict): Variables de entorno, o None para os.environ.
+
+    Returns:
+        str: $XDG_CONFIG_HOME/lychapp (o ~/.config/lychapp).
+    """
+    environ = os.environ if environ is None else environ
+    config_home = environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    return os.path.join(config_home, 'lychapp')
+
+
+class ThemeManager:
+    """
+    Aplica los temas CSS con un único CssProvider por capa.
+
+    La capa base (style.css) y la del tema elegido se añaden a la pantalla
+    una sola vez; cambiar de tema sustituye el contenido del proveedor de
+    la capa en lugar de apilar proveedores nuevos. Los temas se buscan en
+    el directorio de configuración del usuario y después en el de
+    instalación, nunca en el directorio actual. El contenido de cada
+    archivo se cachea por mtime y una capa no se vuelve a analizar si su
+    contenido no ha cambiado. Opcionalmente vigila los archivos activos y
+    los recarga al guardarlos.
+
+    Métodos:
+        __init__: Crea los proveedores de cada capa.
+        theme_dirs: Devuelve los directorios de temas por orden de preferencia.
+        list_themes: Devuelve los nombres de los temas disponibles.
+        resolve: Devuelve la ruta del archivo de un tema.
+        apply: Aplica un tema sobre la capa base.
+        select: Aplica un tema y lo guarda como elegido.
+        apply_saved: Aplica el tema guardado.
+        saved_theme: Devuelve el nombre del tema guardado.
+        save: Guarda el tema elegido.
+    """
+
+    def __init__(self, display=None, watch=False, environ=None):
+        """
+        Crea los proveedores de cada capa y los añade a la pantalla.
+
+        Args:
+            display (Gdk.Display): Pantalla a la que se aplican los estilos, o None para la predeterminada.
+            watch (bool): Si es True, recarga los archivos activos cuando cambian en disco.
+            environ (dict): Variables de entorno, o None para os.environ.
+        """
+        self.config_dir = config_dir(environ)
+        self.config_path = os.path.join(self.config_dir, 'config.ini')
+        self.watch = watch
+        self.active = None
+        # Ruta -> (mtime_ns, tamaño, contenido)
+        self.cache = {}
+        # Capa -> (ruta, contenido cargado en su proveedor)
+        self.loaded = {}
+        # Capa -> (ruta vigilada, Gio.FileMonitor)
+        self.monitors = {}
+
+        display = display or Gdk.Display.get_default()
+        self.providers = {}
+        for layer, priority in LAYERS:
+            provider = Gtk.CssProvider()
+            provider.connect("parsing-error", self.on_parsing_error, layer)
+            Gtk.StyleContext.add_provider_for_display(display, provider, priority)
+            self.providers[layer] = provider
+
+    def theme_dirs(self):
+        """
+        Devuelve los directorios de temas por orden de preferencia: usuario e instalación.
+        """
+        return [os.path.join(self.config_dir, 'themes'), os.path.join(install_dir(), 'themes')]
+
+    def list_themes(self):
+        """
+        Devuelve los nombres de los temas disponibles en todos los directorios.
+
+        Returns:
+            list: Nombres de los archivos .css sin la extensión, ordenados.
+        """
+        themes = set()
+        for directory in self.theme_dirs():
+            try:
+                themes.update(name[:-4] for name in os.listdir(directory) if name.endswith('.css'))
+            except OSError:
+                continue
+        return sorted(themes)
+
+    def resolve(self, theme_name):
+        """
+        Devuelve la ruta del archivo de un tema; el del usuario tiene preferencia.
+
+        Args:
+            theme_name (str): Nombre del tema sin la extensión.
+
+        Returns:
+            str: Ruta del archivo .css, o None si no existe.
+        """
+        if not theme_name or os.sep in theme_name:
+            return None
+        for directory in self.theme_dirs():
+            path = os.path.join(directory, f"{theme_name}.css")
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def apply(self, theme_name):
+        """
+        Aplica un tema sobre la capa base.
+
+        Args:
+            theme_name (str): Nombre del tema sin la extensión.
+
+        Returns:
+            bool: True si el tema existe y se ha aplicado.
+        """
+        path = self.resolve(theme_name)
+        if path is None:
+            print(f"Tema '{theme_name}' no encontrado")
+            return False
+
+        base_path = self.resolve(BASE_THEME)
+        if base_path is not None:
+            self._load_layer('base', base_path)
+        # El tema base no necesita una segunda capa
+        self._load_layer('theme', None if theme_name == BASE_THEME else path)
+        self.active = theme_name
+        print(f"Tema '{theme_name}' aplicado")
+        return True
+
+    def select(self, theme_name):
+        """
+        Aplica un tema y lo guarda como elegido.
+
+        Args:
+            theme_name (str): Nombre del tema sin la extensión.
+        """
+        if self.apply(theme_name):
+            self.save(theme_name)
+
+    def apply_saved(self):
+        """
+        Aplica el tema guardado, o el tema base si no hay ninguno o ya no existe.
+        """
+        theme_name = self.saved_theme()
+        if theme_name is None or self.resolve(theme_name) is None or not self.apply(theme_name):
+            self.apply(BASE_THEME)
+
+    def saved_theme(self):
+        """
+        Devuelve el nombre del tema guardado.
+
+        Se lee la configuración del usuario y, si no existe, la de instalación.
+
+        Returns:
+            str: Nombre del tema, o None.
+        """
+        config = configparser.ConfigParser()
+        try:
+            config.read([os.path.join(install_dir(), 'themes', 'config.ini'), self.config_path], encoding='utf-8')
+        except configparser.Error as e:
+            print(f"Error leyendo la configuración de temas: {e}")
+            return None
+        return config.get(CONFIG_SECTION, CONFIG_KEY, fallback=None)
+
+    def save(self, theme_name):
+        """
+        Guarda el tema elegido en la configuración del usuario.
+
+        Args:
+            theme_name (str): Nombre del tema.
+        """
+        config = configparser.ConfigParser()
+        try:
+            config.read(self.config_path, encoding='utf-8')
+        except configparser.Error:
+            config = configparser.ConfigParser()
+        if not config.has_section(CONFIG_SECTION):
+            config.add_section(CONFIG_SECTION)
+        config.set(CONFIG_SECTION, CONFIG_KEY, theme_name)
+        try:
+            os.makedirs(self.config_dir, exist_ok=True)
+            with open(self.config_path, 'w', encoding='utf-8') as f:
+                config.write(f)
+        except OSError as e:
+            print(f"Error guardando el tema elegido: {e}")
+
+    def on_parsing_error(self, provider, section, error, layer):
+        """
+        Muestra los errores de sintaxis de un tema con su posición.
+        """
+        path, _ = self.loaded.get(layer, (None, None))
+        location = section.to_string() if section is not None else ""
+        print(f"Error en el tema {path or layer} {location}: {error.message}")
+
+    def on_file_changed(self, monitor, file, other_file, event_type, layer):
+        """
+        Recarga una capa cuando su archivo cambia en disco (sólo con watch activado).
+        """
+        if event_type not in RELOAD_EVENTS:
+            return
+        path, _ = self.loaded.get(layer, (None, None))
+        if path is not None:
+            self._load_layer(layer, path)
+
+    def _read(self, path):
+        """
+        Devuelve el contenido de un archivo de tema, leyéndolo sólo si ha cambiado su mtime o su tamaño.
+
+        Returns:
+            bytes: Contenido del archivo, o None si no se puede leer.
+        """
+        try:
+            stat = os.stat(path)
+            cached = self.cache.get(path)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error leyendo el tema {path}: {e}")
+            return None
+        self.cache[path] = (stat.st_mtime_ns, stat.st_size, data)
+        return data
+
+    def _load_layer(self, layer, path):
+        """
+        Sustituye el contenido del proveedor de una capa por el de un archivo (o lo vacía si path es None).
+
+        El proveedor sólo vuelve a analizar el CSS si el contenido es distinto del cargado.
+        """
+        data = b"" if path is None else self._read(path)
+        if data is None:
+            # Archivo ilegible (p. ej. a mitad de un guardado): se conserva el contenido anterior
+            return
+        if self.loaded.get(layer) != (path, data):
+            self.loaded[layer] = (path, data)
+            self.providers[layer].load_from_data(data)
+        if self.watch:
+            self._watch(layer, path)
+
+    def _watch(self, layer, path):
+        """
+        Vigila el archivo cargado en una capa, sustituyendo el monitor anterior si ha cambiado.
+        """
+        watched = self.monitors.get(layer)
+        if watched is not None:
+            if watched[0] == path:
+                return
+            watched[1].cancel()
+            del self.monitors[layer]
+        if path is None:
+            return
+        try:
+            monitor = Gio.File.new_for_path(path).monitor_file(Gio.FileMonitorFlags.WATCH_MOVES, None)
+        except GLib.Error as e:
+            print(f"Error vigilando el tema {path}: {e.message}")
+            return
+        monitor.connect("changed", self.on_file_changed, layer)
+        self.monitors[layer] = (path, monitor)
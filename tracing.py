@@ -0,0 +1,298 @@
+#!/usr/bin/python3
+
+import abc
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Eventos que conserva el anillo; los más antiguos se descartan
+RING_CAPACITY = 65536
+# Límites superiores (ms) de los intervalos del histograma de latencia pulsación-fotograma
+HISTOGRAM_BOUNDS_MS = (4, 8, 16, 33, 50, 100, 250)
+# Anchura máxima de las barras del histograma
+HISTOGRAM_WIDTH = 40
+
+
+class Recorder(abc.ABC):
+    """
+    Base de los registros de medición que se activan desde la línea de órdenes (Tracer, StartupProfiler).
+
+    Desactivado no mide nada: measure() devuelve un contexto vacío
+    compartido. Las subclases guardan cada tramo medido en record() y
+    escriben sus mediciones en write(), que dump() llama una sola vez al
+    salir (write() se puede llamar además en cualquier momento).
+
+    Métodos:
+        enable: Activa el registro.
+        measure: Contexto que mide un tramo.
+        record: Registra un tramo ya medido.
+        write: Escribe las mediciones.
+        dump: Escribe las mediciones una sola vez.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el registro desactivado.
+        """
+        self.enabled = False
+        self.output = None
+        self.origin = time.perf_counter()
+        self.dumped = False
+
+    def enable(self, output=None, origin=None):
+        """
+        Activa el registro.
+
+        Args:
+            output (str): Fichero donde escribir las mediciones, o None.
+            origin (float): Instante de referencia (time.perf_counter) del inicio del proceso.
+        """
+        self.enabled = True
+        self.output = output
+        if origin is not None:
+            self.origin = origin
+
+    def measure(self, name, *args):
+        """
+        Contexto que mide un tramo y lo entrega a record().
+
+        Args:
+            name (str): Nombre del tramo.
+            *args: Datos adicionales para record().
+
+        Returns:
+            contextlib.AbstractContextManager: El contexto de medición.
+        """
+        if not self.enabled:
+            return NULL_CONTEXT
+        return self._measure(name, args)
+
+    @contextlib.contextmanager
+    def _measure(self, name, args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter(), *args)
+
+    @abc.abstractmethod
+    def record(self, name, start, end, *args):
+        """
+        Registra un tramo ya medido.
+
+        Args:
+            name (str): Nombre del tramo.
+            start (float): Inicio (time.perf_counter).
+            end (float): Fin (time.perf_counter).
+        """
+
+    @abc.abstractmethod
+    def write(self, *args):
+        """
+        Escribe las mediciones registradas hasta el momento.
+        """
+
+    def dump(self, *args):
+        """
+        Escribe las mediciones una sola vez, si el registro está activado.
+        """
+        if not self.enabled or self.dumped:
+            return
+        self.dumped = True
+        self.write(*args)
+
+
+class Tracer(Recorder):
+    """
+    Registra tramos y contadores de la ruta de entrada en un anillo en memoria.
+
+    Desactivado no registra nada: span() devuelve un contexto vacío
+    compartido y el resto de métodos vuelven en la primera comprobación.
+    Activado, cada evento es una tupla añadida a un deque acotado (seguro
+    entre hilos; los contadores se actualizan con un cerrojo porque los
+    incrementan los hilos del registro de proveedores), y al salir se
+    exporta en el formato JSON de Chrome (chrome://tracing, Perfetto).
+
+    La latencia de una pulsación va desde la primera pulsación pendiente
+    hasta el siguiente fotograma pintado; se acumula para el histograma.
+
+    Métodos:
+        enable: Activa el registro.
+        span: Contexto que mide un tramo.
+        record: Registra un tramo ya medido.
+        count: Incrementa un contador.
+        keystroke: Marca el inicio de una pulsación.
+        frame_painted: Cierra la pulsación pendiente al pintarse un fotograma.
+        chrome_trace: Devuelve los eventos en formato de Chrome.
+        histogram: Devuelve el resumen de latencias pulsación-fotograma.
+        write: Escribe la traza y muestra el histograma y los resúmenes adicionales.
+    """
+
+    def __init__(self, capacity=RING_CAPACITY):
+        """
+        Inicializa el registro desactivado.
+
+        Args:
+            capacity (int): Eventos que conserva el anillo.
+        """
+        super().__init__()
+        # (fase, nombre, inicio, fin o valor, hilo, argumentos)
+        self.events = deque(maxlen=capacity)
+        self.counters = {}
+        self.counters_lock = threading.Lock()
+        self.thread_names = {}
+        self.keystroke_start = None
+        self.latencies = deque(maxlen=capacity)
+
+    def span(self, name, args=None):
+        """
+        Contexto que mide un tramo.
+
+        Args:
+            name (str): Nombre del tramo.
+            args (dict): Datos que se adjuntan al tramo, o None.
+
+        Returns:
+            contextlib.AbstractContextManager: El contexto de medición.
+        """
+        return self.measure(name, args)
+
+    def record(self, name, start, end, args=None):
+        """
+        Registra un tramo ya medido.
+
+        Args:
+            name (str): Nombre del tramo.
+            start (float): Inicio (time.perf_counter).
+            end (float): Fin (time.perf_counter).
+            args (dict): Datos que se adjuntan al tramo, o None.
+        """
+        if self.enabled:
+            self.events.append(('X', name, start, end, self._thread(), args))
+
+    def count(self, name, delta=1):
+        """
+        Incrementa un contador acumulado.
+
+        Args:
+            name (str): Nombre del contador.
+            delta (int): Incremento.
+        """
+        if not self.enabled:
+            return
+        tid = self._thread()
+        with self.counters_lock:
+            value = self.counters[name] = self.counters.get(name, 0) + delta
+            self.events.append(('C', name, time.perf_counter(), value, tid, None))
+
+    def keystroke(self):
+        """
+        Marca el inicio de una pulsación. Si ya hay una pendiente, se conserva la más antigua.
+        """
+        if self.enabled and self.keystroke_start is None:
+            self.keystroke_start = time.perf_counter()
+
+    def frame_painted(self, *args):
+        """
+        Cierra la pulsación pendiente al pintarse un fotograma (manejador de after-paint).
+        """
+        start = self.keystroke_start
+        if start is None:
+            return
+        self.keystroke_start = None
+        end = time.perf_counter()
+        self.record("keystroke_to_paint", start, end)
+        self.latencies.append((end - start) * 1000)
+
+    def chrome_trace(self, other_data=None):
+        """
+        Devuelve los eventos en el formato JSON de Chrome, en microsegundos desde el origen.
+
+        Args:
+            other_data (dict): Resúmenes que se guardan en el campo otherData de la traza, o None.
+
+        Returns:
+            dict: Traza con la lista traceEvents.
+        """
+        pid = os.getpid()
+        to_us = lambda instant: round((instant - self.origin) * 1e6, 1)
+        trace_events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in self.thread_names.items()
+        ]
+        for phase, name, start, value, tid, args in list(self.events):
+            event = {'name': name, 'ph': phase, 'ts': to_us(start), 'pid': pid, 'tid': tid}
+            if phase == 'X':
+                event['dur'] = round((value - start) * 1e6, 1)
+                if args:
+                    event['args'] = args
+            else:
+                event['args'] = {name: value}
+            trace_events.append(event)
+        trace = {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+        if other_data:
+            trace['otherData'] = other_data
+        return trace
+
+    def histogram(self):
+        """
+        Devuelve el resumen de latencias pulsación-fotograma.
+
+        Returns:
+            str: Percentiles e histograma por intervalos, o un aviso si no hay muestras.
+        """
+        samples = sorted(self.latencies)
+        if not samples:
+            return "Latencia pulsación-fotograma: sin muestras"
+
+        percentile = lambda fraction: samples[min(len(samples) - 1, int(fraction * len(samples)))]
+        lines = [
+            f"Latencia pulsación-fotograma ({len(samples)} pulsaciones): "
+            f"p50 {percentile(0.5):.1f} ms, p95 {percentile(0.95):.1f} ms, p99 {percentile(0.99):.1f} ms, "
+            f"máx {samples[-1]:.1f} ms"
+        ]
+        buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for sample in samples:
+            buckets[next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if sample < bound), len(HISTOGRAM_BOUNDS_MS))] += 1
+        largest = max(buckets)
+        labels = [f"< {bound} ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">= {HISTOGRAM_BOUNDS_MS[-1]} ms"]
+        for label, bucket in zip(labels, buckets):
+            lines.append(f"  {label:>10} {bucket:6d} {'#' * round(HISTOGRAM_WIDTH * bucket / largest)}")
+        return "\n".join(lines)
+
+    def write(self, other_data=None):
+        """
+        Escribe la traza (si se indicó un fichero, sustituyendo la anterior) y muestra el histograma.
+
+        Args:
+            other_data (dict): Resúmenes con nombre (p. ej. la latencia de lanzamiento)
+                que se guardan en la traza y se muestran tras el histograma, o None.
+        """
+        if self.output:
+            try:
+                with open(self.output, 'w', encoding='utf-8') as f:
+                    json.dump(self.chrome_trace(other_data), f, separators=(',', ':'))
+                print(f"Traza guardada en {self.output} ({len(self.events)} eventos)")
+            except OSError as e:
+                print(f"Error guardando la traza: {e}")
+        print(self.histogram())
+        for name, summary in (other_data or {}).items():
+            print(f"{name}: " + ", ".join(f"{key} {value}" for key, value in summary.items()))
+
+    def _thread(self):
+        """
+        Devuelve el identificador del hilo actual y recuerda su nombre para la traza.
+        """
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        return tid
+
+
+NULL_CONTEXT = contextlib.nullcontext()
+
+# Registro compartido por todos los módulos
+tracer = Tracer()
@@ -0,0 +1,318 @@
+#!/usr/bin/python3
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+# Segundos que un recuento de actualizaciones se considera vigente
+DEFAULT_TTL = 3600
+# Segundos hasta el siguiente intento tras una consulta fallida
+RETRY_DELAY = 300
+# Segundos máximos que puede tardar una consulta al gestor de paquetes
+COMMAND_TIMEOUT = 120
+
+
+def default_state_path():
+    """
+    Devuelve la ruta por defecto donde se guarda el último recuento conocido.
+
+    Returns:
+        str: Ruta bajo $XDG_CACHE_HOME/lychapp (o ~/.cache/lychapp).
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(cache_home, 'lychapp', 'updates.json')
+
+
+class UpdatesBackend:
+    """
+    Backend base de consulta de actualizaciones pendientes.
+
+    Cada backend declara el comando que ejecuta y cómo interpretar su salida.
+    Los ejecutables se buscan en PATH en cada consulta, de modo que se pueden
+    sustituir por ejecutables falsos en las pruebas.
+
+    Métodos:
+        available: Indica si el ejecutable del backend está en PATH.
+        count: Devuelve el número de actualizaciones pendientes.
+        parse: Cuenta los paquetes en la salida del comando.
+    """
+    name = None
+    command = ()
+    # Códigos de salida que indican una consulta correcta
+    success_codes = (0,)
+
+    def available(self):
+        """
+        Indica si el ejecutable del backend está en PATH.
+
+        Returns:
+            bool: True si el backend se puede usar.
+        """
+        return shutil.which(self.command[0]) is not None
+
+    def count(self):
+        """
+        Devuelve el número de actualizaciones pendientes.
+
+        Returns:
+            int: Número de paquetes pendientes.
+
+        Raises:
+            RuntimeError: Si el comando falla.
+        """
+        result = subprocess.run(list(self.command), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, timeout=COMMAND_TIMEOUT)
+        if result.returncode not in self.success_codes:
+            raise RuntimeError(f"{self.command[0]} terminó con código {result.returncode}: {result.stderr.strip()}")
+        return self.parse(result.stdout)
+
+    def parse(self, output):
+        """
+        Cuenta los paquetes en la salida del comando: una línea por paquete.
+
+        Args:
+            output (str): Salida estándar del comando.
+
+        Returns:
+            int: Número de paquetes.
+        """
+        return sum(1 for line in output.splitlines() if line.strip())
+
+
+class CheckupdatesBackend(UpdatesBackend):
+    """
+    Arch Linux con pacman-contrib: consulta una copia de las bases de datos sin bloquear pacman.
+    """
+    name = 'checkupdates'
+    command = ('checkupdates',)
+    # checkupdates sale con 2 cuando no hay actualizaciones
+    success_codes = (0, 2)
+
+
+class PacmanBackend(UpdatesBackend):
+    """
+    Arch Linux sin pacman-contrib: usa las bases de datos locales de pacman.
+    """
+    name = 'pacman'
+    command = ('pacman', '-Qu')
+    # pacman -Qu sale con 1 cuando no hay actualizaciones
+    success_codes = (0, 1)
+
+
+class AptBackend(UpdatesBackend):
+    """
+    Debian/Ubuntu.
+    """
+    name = 'apt'
+    command = ('apt', 'list', '--upgradable')
+
+    def parse(self, output):
+        return sum(1 for line in output.splitlines() if '[upgradable' in line)
+
+
+class DnfBackend(UpdatesBackend):
+    """
+    Fedora.
+    """
+    name = 'dnf'
+    command = ('dnf', 'check-update', '-q')
+    # dnf check-update sale con 100 cuando hay actualizaciones
+    success_codes = (0, 100)
+
+    def parse(self, output):
+        count = 0
+        for line in output.splitlines():
+            if line.startswith('Obsoleting'):
+                break
+            if len(line.split()) == 3:
+                count += 1
+        return count
+
+
+# Backends disponibles, en orden de preferencia para la detección automática
+BACKENDS = {backend.name: backend for backend in (CheckupdatesBackend, PacmanBackend, AptBackend, DnfBackend)}
+
+
+def get_backend(name=None):
+    """
+    Devuelve el backend con el nombre indicado, o el primero disponible en el sistema.
+
+    Args:
+        name (str): Nombre del backend, o None para detectarlo.
+
+    Returns:
+        UpdatesBackend: El backend, o None si no hay ninguno disponible.
+    """
+    if name:
+        backend_class = BACKENDS.get(name)
+        if backend_class is None:
+            print(f"Backend de actualizaciones desconocido: {name}")
+            return None
+        return backend_class()
+
+    for backend_class in BACKENDS.values():
+        backend = backend_class()
+        if backend.available():
+            return backend
+    return None
+
+
+class UpdatesService:
+    """
+    Recuento de actualizaciones pendientes con caché, refresco en segundo plano y persistencia.
+
+    Las lecturas nunca bloquean: devuelven el último valor conocido y, si ha
+    caducado, lanzan un refresco en un hilo. Sólo hay un refresco en curso a
+    la vez y las llamadas concurrentes lo comparten. El último recuento se
+    guarda en disco para mostrarlo al instante en el siguiente arranque.
+
+    Métodos:
+        __init__: Inicializa el servicio y carga el último recuento guardado.
+        get_count: Devuelve el recuento actual sin bloquear.
+        is_stale: Indica si el recuento ha caducado.
+        refresh: Lanza (o comparte) un refresco y opcionalmente espera a que termine.
+        add_listener: Registra una función que se llama tras cada refresco.
+    """
+
+    def __init__(self, backend=None, ttl=DEFAULT_TTL, state_path=None, clock=time.time):
+        """
+        Inicializa el servicio y carga el último recuento guardado.
+
+        Args:
+            backend (UpdatesBackend): Backend a usar, o None si no hay gestor de paquetes.
+            ttl (int): Segundos que un recuento se considera vigente.
+            state_path (str): Ruta del fichero de estado. Si es None se usa la ruta por defecto.
+            clock (callable): Función que devuelve la hora actual en segundos.
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.state_path = state_path or default_state_path()
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.in_flight = None
+        self.listeners = []
+
+        self.count = 0
+        self.next_check = 0
+        self._load_state()
+
+    def get_count(self):
+        """
+        Devuelve el recuento actual sin bloquear, lanzando un refresco si ha caducado.
+
+        Returns:
+            int: Número de paquetes pendientes conocido.
+        """
+        if self.is_stale():
+            self.refresh()
+        return self.count
+
+    def is_stale(self):
+        """
+        Indica si el recuento ha caducado.
+
+        Returns:
+            bool: True si hay que volver a consultar al gestor de paquetes.
+        """
+        return self.backend is not None and self.clock() >= self.next_check
+
+    def refresh(self, wait=False, timeout=None):
+        """
+        Lanza un refresco, o se une al que ya esté en curso.
+
+        Args:
+            wait (bool): Si es True, espera a que el refresco termine.
+            timeout (float): Segundos máximos de espera.
+
+        Returns:
+            int: Número de paquetes pendientes conocido tras la espera.
+        """
+        if self.backend is None:
+            return self.count
+
+        with self.lock:
+            done = self.in_flight
+            if done is None:
+                done = self.in_flight = threading.Event()
+                threading.Thread(target=self._run_refresh, args=(done,), name="lychapp-updates", daemon=True).start()
+
+        if wait:
+            done.wait(timeout)
+        return self.count
+
+    def add_listener(self, listener):
+        """
+        Registra una función que se llama con el recuento tras cada refresco correcto.
+
+        La función se ejecuta en el hilo del refresco.
+
+        Args:
+            listener (callable): Función que recibe el número de paquetes.
+        """
+        self.listeners.append(listener)
+
+    def _run_refresh(self, done):
+        """
+        Consulta al backend y actualiza el recuento.
+
+        Args:
+            done (threading.Event): Evento que se activa al terminar.
+        """
+        try:
+            count = self.backend.count()
+        except Exception as e:
+            print(f"Error obteniendo las actualizaciones pendientes: {e}")
+            count = None
+
+        with self.lock:
+            now = self.clock()
+            if count is None:
+                self.next_check = now + min(RETRY_DELAY, self.ttl)
+            else:
+                self.count = count
+                self.next_check = now + self.ttl
+                self._save_state(now)
+            self.in_flight = None
+        done.set()
+
+        if count is not None:
+            for listener in self.listeners:
+                listener(count)
+
+    def _load_state(self):
+        """
+        Carga el último recuento guardado si corresponde al mismo backend.
+        """
+        if self.backend is None:
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('backend') != self.backend.name:
+                return
+            self.count = int(state['count'])
+            self.next_check = float(state['checked_at']) + self.ttl
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Estado de actualizaciones descartado: {e}")
+
+    def _save_state(self, checked_at):
+        """
+        Guarda el recuento actual de forma atómica.
+
+        Args:
+            checked_at (float): Hora de la consulta.
+        """
+        state = {'backend': self.backend.name, 'count': self.count, 'checked_at': checked_at}
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Error guardando el estado de actualizaciones: {e}")
@@ -0,0 +1,261 @@
+#!/usr/bin/python3
+
+import contextlib
+import fcntl
+import math
+import os
+import time
+
+# Cabecera del registro de uso y versión del formato
+LOG_HEADER = "lychapp-usage"
+LOG_VERSION = "1"
+# Semivida de la puntuación de uso (segundos): un lanzamiento de hace 14 días vale la mitad que uno de hoy
+HALF_LIFE = 14 * 24 * 3600
+# Lanzamientos registrados desde la última compactación a partir de los cuales se compacta el registro
+COMPACT_THRESHOLD = 500
+# Puntuación (en lanzamientos actuales) por debajo de la cual una entrada se olvida al compactar
+MIN_SCORE = 0.01
+# Exponente máximo de las puntuaciones acumuladas antes de cambiar la referencia temporal
+MAX_EXPONENT = 500
+
+
+def default_usage_path():
+    """
+    Devuelve la ruta por defecto del registro de uso.
+
+    Returns:
+        str: Ruta bajo $XDG_STATE_HOME/lychapp (o ~/.local/state/lychapp).
+    """
+    state_home = os.environ.get('XDG_STATE_HOME') or os.path.expanduser('~/.local/state')
+    return os.path.join(state_home, 'lychapp', 'usage.log')
+
+
+class UsageStore:
+    """
+    Historial de lanzamientos con una puntuación de uso que decae con el tiempo.
+
+    Cada lanzamiento se añade como una línea al final de un registro. La
+    puntuación de una entrada es la suma de exp(-λ·(ahora - t)) sobre sus
+    lanzamientos; en memoria se guarda como Σ exp(λ·(t - t0)) respecto a
+    una referencia t0 fija, de modo que registrar un lanzamiento es una suma
+    y la puntuación actual es una multiplicación. Cuando el registro acumula
+    COMPACT_THRESHOLD lanzamientos se reescribe con una línea por entrada y
+    una referencia nueva, así que su tamaño no crece con los años de uso.
+
+    Varios procesos pueden compartir el registro (el demonio y "main.py
+    query --launch"): cada escritura se hace con un bloqueo exclusivo sobre
+    un fichero .lock estable, y la compactación parte de lo que hay en disco,
+    de modo que no se pierden los lanzamientos añadidos por otro proceso.
+
+    Formato del registro (campos separados por tabuladores):
+        lychapp-usage  1  <t0>
+        s  <suma respecto a t0>  <id>     (tras una compactación)
+        l  <marca de tiempo>  <id>        (un lanzamiento)
+
+    Métodos:
+        __init__: Inicializa el historial con la ruta del registro.
+        load: Lee el registro de disco.
+        record: Registra un lanzamiento.
+        score: Devuelve la puntuación actual de una entrada.
+        scores: Devuelve las puntuaciones actuales de todas las entradas.
+        compact: Reescribe el registro con una línea por entrada.
+    """
+
+    def __init__(self, path=None, half_life=HALF_LIFE, compact_threshold=COMPACT_THRESHOLD):
+        """
+        Inicializa el historial con la ruta del registro.
+
+        Args:
+            path (str): Ruta del registro. Si es None se usa la ruta por defecto.
+            half_life (float): Semivida de la puntuación en segundos.
+            compact_threshold (int): Lanzamientos tras los que se compacta el registro.
+        """
+        self.path = path or default_usage_path()
+        self.decay = math.log(2) / half_life
+        self.compact_threshold = compact_threshold
+        self.reference = time.time()
+        # Identificador de escritorio -> Σ exp(λ·(t - reference))
+        self.totals = {}
+        self.pending_events = 0
+        self.header_written = False
+
+    def load(self):
+        """
+        Lee el registro de disco. Las líneas mal formadas se ignoran.
+        """
+        state = self._read()
+        if state is not None:
+            self.reference, self.totals, self.pending_events = state
+            self.header_written = True
+
+    def _read(self):
+        """
+        Lee y acumula el registro de disco.
+
+        Returns:
+            tuple: (referencia, sumas por identificador, lanzamientos sin compactar), o None si
+            el registro no existe o no es válido.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error leyendo el historial de uso: {e}")
+            return None
+
+        header = lines[0].split('\t') if lines else ()
+        if len(header) != 3 or header[0] != LOG_HEADER or header[1] != LOG_VERSION:
+            print(f"Historial de uso con formato desconocido, se ignora: {self.path}")
+            return None
+        try:
+            reference = float(header[2])
+        except ValueError:
+            return None
+
+        totals = {}
+        pending_events = 0
+        decay = self.decay
+        for line in lines[1:]:
+            fields = line.split('\t', 2)
+            if len(fields) != 3:
+                continue
+            kind, value, desktop_id = fields
+            try:
+                value = float(value)
+            except ValueError:
+                continue
+            if kind == 's':
+                totals[desktop_id] = totals.get(desktop_id, 0) + value
+            elif kind == 'l':
+                totals[desktop_id] = totals.get(desktop_id, 0) + math.exp(decay * (value - reference))
+                pending_events += 1
+        return reference, totals, pending_events
+
+    def record(self, desktop_id, timestamp=None):
+        """
+        Registra un lanzamiento en memoria y al final del registro.
+
+        Args:
+            desktop_id (str): Identificador de escritorio de la aplicación.
+            timestamp (float): Momento del lanzamiento, o None para ahora.
+
+        Returns:
+            float: Puntuación actual de la entrada.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._locked():
+            if (not self.header_written or self.pending_events >= self.compact_threshold
+                    or self.decay * (timestamp - self.reference) > MAX_EXPONENT):
+                # Sin registro válido en disco, demasiados lanzamientos desde la última compactación
+                # o décadas sin compactar (las sumas desbordarían)
+                self._compact(timestamp)
+            if self.header_written:
+                self._append(f"l\t{timestamp:.3f}\t{desktop_id}\n")
+
+        self.totals[desktop_id] = self.totals.get(desktop_id, 0) + math.exp(self.decay * (timestamp - self.reference))
+        self.pending_events += 1
+        return self.score(desktop_id, timestamp)
+
+    def score(self, desktop_id, now=None):
+        """
+        Devuelve la puntuación actual de una entrada.
+
+        Args:
+            desktop_id (str): Identificador de escritorio de la aplicación.
+            now (float): Momento de referencia, o None para ahora.
+
+        Returns:
+            float: Lanzamientos ponderados por antigüedad (un lanzamiento de ahora vale 1).
+        """
+        total = self.totals.get(desktop_id)
+        if not total:
+            return 0.0
+        now = time.time() if now is None else now
+        return total * math.exp(-self.decay * (now - self.reference))
+
+    def scores(self, now=None):
+        """
+        Devuelve las puntuaciones actuales de todas las entradas.
+
+        Args:
+            now (float): Momento de referencia, o None para ahora.
+
+        Returns:
+            dict: Identificador de escritorio -> puntuación.
+        """
+        now = time.time() if now is None else now
+        factor = math.exp(-self.decay * (now - self.reference))
+        return {desktop_id: total * factor for desktop_id, total in self.totals.items()}
+
+    def compact(self, now=None):
+        """
+        Reescribe el registro, de forma atómica, con una línea por entrada respecto a una referencia nueva.
+
+        Las entradas cuya puntuación ha caído por debajo de MIN_SCORE se olvidan.
+        Parte del registro de disco, que incluye los lanzamientos de otros procesos.
+
+        Args:
+            now (float): Nueva referencia temporal, o None para ahora.
+        """
+        with self._locked():
+            self._compact(now)
+
+    def _compact(self, now=None):
+        """
+        Compacta el registro; se llama con el bloqueo tomado.
+
+        Args:
+            now (float): Nueva referencia temporal, o None para ahora.
+        """
+        now = time.time() if now is None else now
+        state = self._read()
+        if state is not None:
+            # Todo lanzamiento registrado está en disco; éste puede tener además los de otros procesos
+            self.reference, self.totals, _ = state
+        self.totals = {desktop_id: score for desktop_id, score in self.scores(now).items() if score >= MIN_SCORE}
+        self.reference = now
+        self.pending_events = 0
+
+        lines = [f"{LOG_HEADER}\t{LOG_VERSION}\t{now:.3f}\n"]
+        lines.extend(f"s\t{total!r}\t{desktop_id}\n" for desktop_id, total in self.totals.items())
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            os.replace(tmp_path, self.path)
+            self.header_written = True
+        except OSError as e:
+            print(f"Error guardando el historial de uso: {e}")
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        Contexto con el bloqueo exclusivo del registro entre procesos.
+
+        El bloqueo se toma sobre un fichero aparte porque la compactación
+        sustituye el registro por otro inodo. Si no se puede crear, se sigue
+        sin bloqueo.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            lock_file = open(f"{self.path}.lock", 'a')
+        except OSError as e:
+            print(f"Error bloqueando el historial de uso: {e}")
+            yield
+            return
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _append(self, line):
+        """
+        Añade una línea al final del registro; se llama con el bloqueo tomado.
+        """
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            print(f"Error guardando el historial de uso: {e}")
@@ -1,5 +1,7 @@
 import gi
-from gi.repository import Gtk, Gdk, GLib
+from gi.repository import Gtk, Gdk, GLib, Gio
+
+from result_list import ResultItem, create_result_factory
 
 gi.require_version('Gtk', '4.0')
 
@@ -16,6 +18,7 @@ class WindowManager:
             app_launcher (AppLauncher): La instancia principal de la aplicación.
         """
         self.app_launcher = app_launcher
+        self.help_window = None
 
     def create_main_window(self):
         """
@@ -40,6 +43,7 @@ class WindowManager:
         # Crear un box vertical
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
         self.app_launcher.set_child(vbox)
+        self.vbox = vbox
 
         # Crear un Entry para filtrar
         filter_entry = Gtk.Entry()
@@ -61,16 +65,27 @@ class WindowManager:
         scrolled_window.set_min_content_height(384)  # Tamaño mínimo del ScrolledWindow ajustado
         vbox.append(scrolled_window)
 
-        # Crear un ListBox y agregarlo al ScrolledWindow
-        listbox = Gtk.ListBox()
-        listbox.connect("row-activated", self.app_launcher.on_row_activated)
-        scrolled_window.set_child(listbox)
+        # Crear un ListView respaldado por un modelo y agregarlo al ScrolledWindow.
+        # Sólo se crean widgets para las filas visibles, y se reutilizan al desplazarse.
+        result_store = Gio.ListStore(item_type=ResultItem)
+        selection = Gtk.SingleSelection(model=result_store)
+        list_view = Gtk.ListView(model=selection, factory=create_result_factory(self.app_launcher.icon_service))
+        list_view.set_single_click_activate(True)
+        list_view.connect("activate", self.app_launcher.on_row_activated)
+        scrolled_window.set_child(list_view)
+
+        self.app_launcher.result_store = result_store
+        self.app_launcher.list_view = list_view
 
-        self.app_launcher.listbox = listbox
+        # Cargar las aplicaciones en el ListView
+        self.app_launcher.engine.query("", self.app_launcher.show_results)
 
-        # Cargar las aplicaciones en el ListBox
-        self.app_launcher.load_applications(self.app_launcher.application_manager.all_applications)
+    def create_status_bar(self):
+        """
+        Crea la barra de estado al pie de la ventana principal.
 
+        Se llama tras el primer fotograma para no retrasar la aparición del campo de texto.
+        """
         # Crear etiquetas para el estado de la batería, la carga de la CPU, la memoria y actualizaciones pendientes
         battery_image = Gtk.Image.new_from_icon_name("battery")
         battery_image.set_pixel_size(20)
@@ -139,19 +154,25 @@ class WindowManager:
         status_box.append(at_label)
 
         # Añadir el box de estado al contenedor principal
-        vbox.append(status_box)
-
-        # Iniciar el temporizador para actualizar las etiquetas de estado
-        GLib.timeout_add_seconds(1, self.app_launcher.update_status_labels)
-
-        # Aplicar el estilo CSS
-        self.app_launcher.apply_css()
+        self.vbox.append(status_box)
 
     def show_help_window(self):
         """
         Muestra una ventana con los comandos y atajos de teclado disponibles.
         """
+        if self.help_window is None:
+            self.build_help_window()
+        self.help_window.present()
+
+    def build_help_window(self):
+        """
+        Construye la ventana de ayuda oculta para reutilizarla en cada consulta.
+        """
+        if self.help_window is not None:
+            return
+
         help_window = Gtk.Window(title="Ayuda")
+        help_window.set_hide_on_close(True)
         help_window.set_default_size(400, 300)
         help_window.set_transient_for(self.app_launcher)
         help_window.set_modal(True)
@@ -173,6 +194,9 @@ class WindowManager:
 
         commands = self.app_launcher.command_loader.get_system_commands() + self.app_launcher.command_loader.get_connectivity_commands()
         commands_markup = "\n".join([f"<tt>{cmd[0]}</tt>" for cmd in commands])
+        run_prefix = self.app_launcher.command_loader.run_command_prefix
+        if run_prefix:
+            commands_markup += f"\n<tt>{GLib.markup_escape_text(run_prefix)}</tt> o <tt>&gt;</tt> Ejecutar un comando de terminal"
         commands_markup += "\n<tt>help:</tt> Mostrar esta ventana de ayuda"
         commands_label = Gtk.Label()
         commands_label.set_markup(commands_markup)
@@ -195,7 +219,7 @@ class WindowManager:
         click_controller.connect("pressed", self.on_help_window_clicked, help_window)
         help_window.add_controller(click_controller)
 
-        help_window.show()
+        self.help_window = help_window
 
     def on_help_window_clicked(self, controller, n_press, x, y, help_window):
         """